@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Static asset build: fingerprint, precompress and rewrite the frontend.
+
+Every file under public/, admin/ and shared/ is copied into the build
+directory. Non-HTML files also get a content-hashed name
+(style.css -> style.1a2b3c4d5e6f.css), HTML files have their references to
+those files rewritten to the hashed names, and text files get .gz (and .br
+when the brotli package is installed) siblings. Byte-identical files are
+stored and processed once, and JPEG/PNG images get resized and WebP
+variants (image_variants.py, when Pillow is installed). manifest.json maps
+each URL path to its built file, encodings, variants and caching mode.
+
+Usage: python asset_build.py [--force] [--workers N]
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import sys
+import time
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip variants are produced
+    brotli = None
+
+from image_variants import RESIZABLE_TYPES, Image, render_all
+
+# Frontend directories that are served, by URL prefix
+ASSET_ROOTS = ('public', 'admin', 'shared')
+
+# Content types worth compressing (images are already compressed)
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 2
+
+# Optional encoders in use; a build made without one is redone once it is installed
+BUILD_FEATURES = f'brotli={brotli is not None},images={Image is not None}'
+
+# src="..." / href="..." attributes in HTML
+HTML_REF_PATTERN = re.compile(r'''(\b(?:src|href)\s*=\s*)(["'])([^"'<>]+)\2''', re.IGNORECASE)
+
+
+def iter_source_files(frontend_dir):
+    """Yield (url_path, absolute_path) for every servable frontend file"""
+    for root in ASSET_ROOTS:
+        base = os.path.join(frontend_dir, root)
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+            for filename in sorted(filenames):
+                if filename.startswith('.'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                relative = os.path.relpath(path, base).replace(os.sep, '/')
+                yield f'/{root}/{relative}', path
+
+
+def source_signature(frontend_dir):
+    """Hash of every source file's path, size and mtime; changes whenever a file does"""
+    digest = hashlib.blake2b(BUILD_FEATURES.encode('utf-8'), digest_size=16)
+    for url_path, path in iter_source_files(frontend_dir):
+        stat = os.stat(path)
+        digest.update(f'{url_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def content_type_for(path):
+    content_type, _ = mimetypes.guess_type(path)
+    return content_type or 'application/octet-stream'
+
+
+def fingerprint(url_path, digest):
+    """/shared/css/style.css -> /shared/css/style.<digest>.css"""
+    directory, filename = url_path.rsplit('/', 1)
+    stem, dot, extension = filename.rpartition('.')
+    if not dot or not stem:
+        return f'{directory}/{filename}.{digest}'
+    return f'{directory}/{stem}.{digest}.{extension}'
+
+
+def resolve_reference(page_url, reference):
+    """URL path a src/href in ``page_url`` points to, or None for external/dynamic links"""
+    target = reference.split('#', 1)[0].split('?', 1)[0]
+    if not target or re.match(r'^[a-z][a-z0-9+.-]*:', target, re.IGNORECASE) or target.startswith('//') or '${' in target:
+        return None
+    if target.startswith('/'):
+        return target
+    parts = page_url.rsplit('/', 1)[0].split('/')
+    for segment in target.split('/'):
+        if segment == '..':
+            if len(parts) > 1:
+                parts.pop()
+        elif segment not in ('', '.'):
+            parts.append(segment)
+    return '/'.join(parts)
+
+
+def rewrite_html(html, page_url, hashed_urls):
+    """Point every reference to a fingerprinted file at its hashed URL"""
+    def replace(match):
+        prefix, quote, reference = match.groups()
+        hashed = hashed_urls.get(resolve_reference(page_url, reference))
+        if hashed is None:
+            return match.group(0)
+        suffix = reference[len(reference.split('#', 1)[0].split('?', 1)[0]):]
+        return f'{prefix}{quote}{hashed}{suffix}{quote}'
+    return HTML_REF_PATTERN.sub(replace, html)
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _compress(data, content_type, path):
+    """Write .gz/.br siblings of ``path`` when they are smaller; return {encoding: path}"""
+    encodings = {}
+    if not content_type.startswith(COMPRESSIBLE_TYPES) or len(data) < 256:
+        return encodings
+    variants = [('gzip', '.gz', lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.insert(0, ('br', '.br', lambda d: brotli.compress(d, quality=11)))
+    for encoding, suffix, compress in variants:
+        compressed = compress(data)
+        if len(compressed) < len(data):
+            _write(path + suffix, compressed)
+            encodings[encoding] = path + suffix
+    return encodings
+
+
+def build_assets(frontend_dir, build_dir, signature=None, workers=None):
+    """Build every frontend file into ``build_dir`` and write its manifest.
+
+    Output goes to a fresh ``build_dir/<signature>/`` directory and the
+    manifest is swapped in atomically, so a server reading the previous
+    build is never handed a half-written one. Image variants are rendered
+    by up to ``workers`` processes (default: one per CPU).
+    """
+    signature = signature or source_signature(frontend_dir)
+    output_dir = os.path.join(build_dir, signature)
+    shutil.rmtree(output_dir, ignore_errors=True)
+
+    sources = list(iter_source_files(frontend_dir))
+    files = {}
+    hashed_urls = {}
+
+    # Fingerprint everything except HTML, whose URLs must stay stable.
+    # Identical files share one built copy (and one set of variants).
+    unique = {}
+    assets = []
+    image_jobs = []
+    for url_path, path in sources:
+        if url_path.endswith('.html'):
+            continue
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.blake2b(data, digest_size=6).hexdigest()
+        assets.append((url_path, fingerprint(url_path, digest), digest))
+        if digest in unique:
+            continue
+        built = os.path.join(output_dir, fingerprint(url_path, digest).lstrip('/'))
+        _write(built, data)
+        content_type = content_type_for(path)
+        unique[digest] = {
+            'path': os.path.relpath(built, build_dir),
+            'content_type': content_type,
+            'etag': digest,
+            'size': len(data),
+            'encodings': {
+                encoding: os.path.relpath(variant, build_dir)
+                for encoding, variant in _compress(data, content_type, built).items()
+            }
+        }
+        if content_type in RESIZABLE_TYPES:
+            image_jobs.append((digest, built, content_type))
+
+    for digest, rendered in render_all(image_jobs, workers).items():
+        unique[digest]['width'] = rendered['width']
+        unique[digest]['variants'] = [
+            dict(variant, path=os.path.relpath(variant['path'], build_dir))
+            for variant in rendered['variants']
+        ]
+
+    for url_path, hashed_url, digest in assets:
+        files[url_path] = dict(unique[digest], immutable=False, hashed_url=hashed_url)
+        files[hashed_url] = dict(unique[digest], immutable=True)
+        hashed_urls[url_path] = hashed_url
+
+    # HTML keeps its name; its references now point at the hashed files
+    for url_path, path in sources:
+        if not url_path.endswith('.html'):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        data = rewrite_html(html, url_path, hashed_urls).encode('utf-8')
+        built = os.path.join(output_dir, url_path.lstrip('/'))
+        _write(built, data)
+        content_type = content_type_for(path)
+        files[url_path] = {
+            'path': os.path.relpath(built, build_dir),
+            'content_type': content_type,
+            'etag': hashlib.blake2b(data, digest_size=6).hexdigest(),
+            'size': len(data),
+            'immutable': False,
+            'encodings': {
+                encoding: os.path.relpath(variant, build_dir)
+                for encoding, variant in _compress(data, content_type, built).items()
+            }
+        }
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'signature': signature,
+        'built_at': time.time(),
+        'files': files
+    }
+    manifest_path = os.path.join(build_dir, MANIFEST_NAME)
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+    # Drop builds of older sources
+    for name in os.listdir(build_dir):
+        if name != signature and os.path.isdir(os.path.join(build_dir, name)):
+            shutil.rmtree(os.path.join(build_dir, name), ignore_errors=True)
+    return manifest
+
+
+def load_manifest(build_dir):
+    try:
+        with open(os.path.join(build_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+
+def ensure_built(frontend_dir, build_dir, force=False, workers=None):
+    """Return a manifest for the current sources, building only if they changed"""
+    signature = source_signature(frontend_dir)
+    manifest = None if force else load_manifest(build_dir)
+    if manifest is None or manifest.get('signature') != signature:
+        os.makedirs(build_dir, exist_ok=True)
+        manifest = build_assets(frontend_dir, build_dir, signature, workers)
+    return manifest
+
+
+if __name__ == '__main__':
+    from config import Config
+
+    workers = int(sys.argv[sys.argv.index('--workers') + 1]) if '--workers' in sys.argv else None
+    started = time.perf_counter()
+    manifest = ensure_built(Config.FRONTEND_DIR, Config.STATIC_BUILD_DIR, force='--force' in sys.argv, workers=workers)
+    files = manifest['files']
+    originals = [entry for entry in files.values() if not entry['immutable']]
+    hashed = len(files) - len(originals)
+    compressed = sum(1 for entry in originals if entry['encodings'])
+    stored = len({entry['path'] for entry in originals})
+    variants = {entry['path']: len(entry.get('variants', ())) for entry in originals}
+    print(f"✅ Built {len(originals)} files ({hashed} fingerprinted, {compressed} precompressed"
+          f"{', brotli' if brotli is not None else ', gzip only'}) in {time.perf_counter() - started:.2f}s")
+    print(f"🗂️  {stored} stored after deduplication, {sum(variants.values())} image variants"
+          f"{'' if Image is not None else ' (Pillow not installed)'}")
+    print(f"📁 {Config.STATIC_BUILD_DIR}")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/admin/feedback/stats with eight queries vs one $facet aggregation
+Seeds a scratch database with 10k / 100k / 1M feedback documents and times both.
+
+Usage: python bench_feedback_stats.py [sizes...]   e.g. python bench_feedback_stats.py 10000 100000
+"""
+
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING, DESCENDING, MongoClient
+
+from config import Config
+from feedback_stats import compute_feedback_stats
+
+BENCH_DATABASE = 'edunova_bench_feedback_stats'
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+RUNS = 7
+INSERT_BATCH = 10_000
+
+def seed(collection, size):
+    """Fill the collection with size random feedback documents"""
+    collection.drop()
+    collection.create_index([("status", ASCENDING), ("created_at", DESCENDING)])
+    collection.create_index([("created_at", DESCENDING)])
+    now = datetime.utcnow()
+    statuses = ['pending', 'reviewed', 'resolved', 'archived']
+    types = ['general', 'course', 'teacher', 'facility', 'suggestion']
+    batch = []
+    for i in range(size):
+        batch.append({
+            'name': f'User {i}',
+            'email': f'user{i}@example.com',
+            'message': 'Benchmark feedback message',
+            'rating': random.randint(1, 5),
+            'feedback_type': random.choice(types),
+            'status': random.choice(statuses),
+            'created_at': now - timedelta(minutes=random.randint(0, 60 * 24 * 365))
+        })
+        if len(batch) >= INSERT_BATCH:
+            collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+
+def stats_eight_queries(collection):
+    """The previous implementation: eight sequential round trips"""
+    total = collection.count_documents({})
+    counts = {s: collection.count_documents({'status': s}) for s in ['pending', 'reviewed', 'resolved', 'archived']}
+    types = list(collection.aggregate([
+        {'$group': {'_id': '$feedback_type', 'count': {'$sum': 1}}},
+        {'$sort': {'count': -1}}
+    ]))
+    avg = list(collection.aggregate([{'$group': {'_id': None, 'avg_rating': {'$avg': '$rating'}}}]))
+    recent = collection.count_documents({'created_at': {'$gte': datetime.utcnow() - timedelta(days=7)}})
+    return total, counts, types, avg, recent
+
+def median_ms(func, collection):
+    func(collection)  # warm up caches
+    samples = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        func(collection)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def run_benchmark(sizes):
+    client = MongoClient(Config.MONGODB_URI)
+    collection = client[BENCH_DATABASE].feedback
+
+    print(f"📊 Feedback stats latency (median of {RUNS} runs)")
+    print("=" * 60)
+    print(f"{'documents':>12} {'8 queries (ms)':>16} {'$facet (ms)':>14} {'speedup':>9}")
+    try:
+        for size in sizes:
+            seed(collection, size)
+            before = median_ms(stats_eight_queries, collection)
+            after = median_ms(compute_feedback_stats, collection)
+            print(f"{size:>12,} {before:>16.1f} {after:>14.1f} {before / after:>8.1f}x")
+    finally:
+        client.drop_database(BENCH_DATABASE)
+        client.close()
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    run_benchmark(sizes)
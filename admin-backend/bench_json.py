@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: JSON encoding of a 1,000-student page
+Compares the old per-handler conversion loop + stdlib jsonify with EduNovaJSONProvider.
+No database is needed. Exits with status 1 if the stdlib fallback is slower than before
+(median of interleaved rounds, within TOLERANCE).
+"""
+
+import statistics
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import json_provider
+from json_provider import EduNovaJSONProvider
+
+PAGE_SIZE = 1000
+REPEAT = 20
+ROUNDS = 15
+# Allowed slowdown of the fallback, for timer noise
+TOLERANCE = 0.05
+
+def make_page():
+    """Build a page of students shaped like the documents in MongoDB"""
+    now = datetime.utcnow()
+    admin_id = str(ObjectId())
+    return [{
+        '_id': ObjectId(),
+        'full_name': f'Student {i}',
+        'email': f'student{i}@example.com',
+        'student_id': f'STU{i:06d}',
+        'course': 'Computer Science',
+        'phone': '+94 77 123 4567',
+        'address': f'{i} Main Street, Colombo',
+        'date_of_birth': '2005-01-01',
+        'enrollment_date': now.isoformat(),
+        'status': 'active',
+        'created_at': now - timedelta(minutes=i),
+        'created_by': admin_id,
+        'updated_at': now,
+        'updated_by': admin_id
+    } for i in range(PAGE_SIZE)]
+
+def old_path(app, students):
+    """What handlers did before: convert every document in place, then the stdlib provider"""
+    for student in students:
+        student['_id'] = str(student['_id'])
+        student['created_at'] = student['created_at'].isoformat()
+        student['updated_at'] = student['updated_at'].isoformat()
+    with app.app_context():
+        return app.json.response({'students': students, 'total': PAGE_SIZE}).get_data()
+
+def new_path(app, students):
+    """Return raw documents and let the provider encode BSON types"""
+    with app.app_context():
+        return app.json.response({'students': students, 'total': PAGE_SIZE}).get_data()
+
+def best_ms(path, app, page):
+    """Best time of ``path``, each call given fresh copies of ``page`` as pymongo would"""
+    fresh = []
+
+    def setup():
+        fresh[:] = [[dict(doc) for doc in page]]
+
+    times = timeit.repeat(lambda: path(app, fresh[0]), setup=setup, repeat=REPEAT, number=1)
+    return min(times) * 1000
+
+def run_benchmark():
+    page = make_page()
+
+    old_app = Flask('bench_old')
+    old_app.json = DefaultJSONProvider(old_app)
+    new_app = Flask('bench_new')
+    new_app.json = EduNovaJSONProvider(new_app)
+
+    print(f"📊 Encoding a page of {PAGE_SIZE} students (median of {ROUNDS} rounds, best of {REPEAT})")
+    print("=" * 60)
+
+    # Before and the fallback alternate, so a noisy neighbour slows both alike
+    befores, fallbacks = [], []
+    orjson_module = json_provider.orjson
+    for _ in range(ROUNDS):
+        befores.append(best_ms(old_path, old_app, page))
+        json_provider.orjson = None
+        try:
+            fallbacks.append(best_ms(new_path, new_app, page))
+        finally:
+            json_provider.orjson = orjson_module
+    before = statistics.median(befores)
+    fallback = statistics.median(fallbacks)
+    slowdown = statistics.median(f / b for f, b in zip(fallbacks, befores))
+    print(f"  Before (conversion loop + stdlib):   {before:8.2f} ms")
+    print(f"  Provider, stdlib fallback:           {fallback:8.2f} ms  ({before / fallback:.1f}x)")
+
+    if orjson_module is not None:
+        after = statistics.median(best_ms(new_path, new_app, page) for _ in range(ROUNDS))
+        print(f"  Provider, orjson:                    {after:8.2f} ms  ({before / after:.1f}x)")
+    else:
+        print("  Provider, orjson:                    not installed (pip install orjson)")
+
+    if slowdown > 1 + TOLERANCE:
+        print(f"❌ The stdlib fallback is {slowdown - 1:.0%} slower than the conversion loop it replaced")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: cold-start cost of the admin backend
+Each run is a fresh interpreter that imports app.py, calls create_app() and
+serves its first requests (a frontend page and /api/routes) with the test
+client. No database is needed: nothing connects before the first query.
+
+Usage:
+    python bench_startup.py                  # measure, compare with the saved baseline
+    python bench_startup.py --save-baseline  # measure and record the baseline
+Exits with status 1 if the median cold start is more than TOLERANCE slower
+than the baseline (or than --max-ms, when given).
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RUNS = 7
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_startup_baseline.json')
+
+# Allowed slowdown over the baseline: 20%, and never less than 50 ms (process start-up is noisy)
+TOLERANCE = 0.20
+MIN_SLACK_MS = 50
+
+CHILD = r'''
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+application = app.create_app()
+created = time.perf_counter()
+client = application.test_client()
+timings = {}
+for path in ('/', '/api/routes'):
+    before = time.perf_counter()
+    status = client.get(path).status_code
+    timings[path] = ((time.perf_counter() - before) * 1000, status)
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_requests': timings,
+    'connected': application.extensions['edunova'].store.connected
+}))
+'''
+
+PHASES = ('import_ms', 'create_app_ms', 'first_request_ms', 'total_ms')
+
+
+def run_once():
+    result = subprocess.run([sys.executable, '-c', CHILD], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    sample = json.loads(result.stdout.strip().splitlines()[-1])
+    for path, (_, status) in sample['first_requests'].items():
+        if status != 200:
+            raise RuntimeError(f'{path} answered {status} during the startup benchmark')
+    if sample['connected']:
+        raise RuntimeError('MongoDB client was created during startup; it must stay lazy')
+    sample['first_request_ms'] = sum(ms for ms, _ in sample['first_requests'].values())
+    sample['total_ms'] = sample['import_ms'] + sample['create_app_ms'] + sample['first_request_ms']
+    return sample
+
+
+def measure():
+    run_once()  # warm-up: asset build, OS file cache, .pyc files
+    samples = [run_once() for _ in range(RUNS)]
+    return {phase: round(statistics.median(s[phase] for s in samples), 1) for phase in PHASES}
+
+
+def load_baseline():
+    try:
+        with open(BASELINE_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def run_benchmark():
+    print(f"📊 Cold start: import app + create_app() + first requests (median of {RUNS} runs)")
+    print("=" * 60)
+    result = measure()
+    for phase in PHASES:
+        print(f"  {phase:<18} {result[phase]:8.1f} ms")
+
+    if '--save-baseline' in sys.argv:
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=1, sort_keys=True)
+            f.write('\n')
+        print(f"💾 Baseline saved to {os.path.basename(BASELINE_FILE)}")
+        return 0
+
+    if '--max-ms' in sys.argv:
+        limit = float(sys.argv[sys.argv.index('--max-ms') + 1])
+    else:
+        baseline = load_baseline()
+        if baseline is None:
+            print("ℹ️ No baseline yet; run with --save-baseline to record one")
+            return 0
+        limit = baseline['total_ms'] + max(baseline['total_ms'] * TOLERANCE, MIN_SLACK_MS)
+        print(f"  baseline total     {baseline['total_ms']:8.1f} ms")
+
+    if result['total_ms'] > limit:
+        print(f"❌ Cold start regressed: {result['total_ms']:.1f} ms > {limit:.1f} ms allowed")
+        return 1
+    print(f"✅ Cold start within budget ({result['total_ms']:.1f} ms <= {limit:.1f} ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_benchmark())
@@ -0,0 +1,20 @@
+from blueprints import auth, courses, dashboard, feedback, frontend, students, system, teachers, timetable
+
+# Registered in this order; the frontend blueprint's catch-all /<path:filename> only
+# matches what no API rule does, whatever the order
+BLUEPRINTS = (
+    system.bp,
+    auth.bp,
+    students.bp,
+    courses.bp,
+    teachers.bp,
+    timetable.bp,
+    feedback.bp,
+    dashboard.bp,
+    frontend.bp
+)
+
+
+def register_blueprints(app):
+    for blueprint in BLUEPRINTS:
+        app.register_blueprint(blueprint)
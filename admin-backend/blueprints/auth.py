@@ -0,0 +1,179 @@
+from flask import Blueprint, current_app, jsonify, request
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from werkzeug.security import generate_password_hash, check_password_hash
+import jwt
+from datetime import datetime, timedelta
+from bson import ObjectId
+
+from services import admins_collection, principal_cache, stats_counters
+from blueprints.common import token_required
+
+bp = Blueprint('auth', __name__)
+
+# Admin Authentication Routes
+@bp.route('/api/admin/register', methods=['POST'])
+def register_admin():
+    try:
+        data = request.get_json()
+        
+        # Validate required fields
+        required_fields = ['username', 'password', 'full_name', 'security_key']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({'message': f'{field} is required'}), 400
+        
+        # Validate security key
+        if data['security_key'] != current_app.config['ADMIN_SECURITY_KEY']:
+            return jsonify({'message': 'Invalid security key. Access denied.'}), 403
+        
+        # Generate email from username if not provided
+        email = data.get('email', f"{data['username']}@edunova.com")
+        
+        # Create new admin (duplicates are rejected by the unique username/email indexes)
+        hashed_password = generate_password_hash(data['password'])
+        admin_data = {
+            'username': data['username'],
+            'email': email,
+            'password': hashed_password,
+            'full_name': data['full_name'],
+            'role': data.get('role', 'admin'),
+            'security_key_used': data['security_key'],  # Store the security key used
+            'created_at': datetime.utcnow(),
+            'is_active': True
+        }
+        
+        try:
+            result = admins_collection.insert_one(admin_data)
+        except DuplicateKeyError:
+            return jsonify({'message': 'Admin already exists'}), 400
+        stats_counters.admin_activated()
+        
+        return jsonify({
+            'message': 'Admin registered successfully',
+            'admin_id': str(result.inserted_id)
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/admin/login', methods=['POST'])
+def login_admin():
+    try:
+        data = request.get_json()
+        
+        if not data.get('username') or not data.get('password'):
+            return jsonify({'message': 'Username and password required'}), 400
+        
+        # Find admin
+        admin = admins_collection.find_one({'username': data['username']})
+        
+        if not admin or not check_password_hash(admin['password'], data['password']):
+            return jsonify({'message': 'Invalid credentials'}), 401
+        
+        if not admin.get('is_active', True):
+            return jsonify({'message': 'Account is deactivated'}), 401
+        
+        # Generate JWT token
+        token = jwt.encode({
+            'admin_id': str(admin['_id']),
+            'username': admin['username'],
+            'exp': datetime.utcnow() + timedelta(hours=24)
+        }, current_app.config['SECRET_KEY'], algorithm='HS256')
+        
+        return jsonify({
+            'message': 'Login successful',
+            'token': token,
+            'admin': {
+                'id': str(admin['_id']),
+                'username': admin['username'],
+                'email': admin['email'],
+                'full_name': admin['full_name'],
+                'role': admin.get('role', 'admin')
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+# Admin logout (stateless JWT: client should discard token)
+@bp.route('/api/admin/logout', methods=['POST'])
+@token_required
+def admin_logout(current_admin):
+    try:
+        # With stateless JWT there is nothing to do server-side (unless token blacklist is used)
+        return jsonify({'message': 'Logged out'}), 200
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+# Settings: current admin profile
+@bp.route('/api/admin/me', methods=['GET'])
+@token_required
+def get_me(current_admin):
+    try:
+        admin = current_admin.copy()
+        # hide password
+        admin.pop('password', None)
+        return jsonify(admin), 200
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/admin/me', methods=['PUT'])
+@token_required
+def update_me(current_admin):
+    try:
+        data = request.get_json()
+        update = {}
+        if 'full_name' in data: update['full_name'] = data['full_name']
+        if 'email' in data: update['email'] = data['email']
+        if not update:
+            return jsonify({'message': 'Nothing to update'}), 400
+        admins_collection.update_one({'_id': current_admin['_id']}, {'$set': update})
+        principal_cache.invalidate(current_admin['_id'])
+        return jsonify({'message': 'Profile updated'}), 200
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/admin/change-password', methods=['POST'])
+@token_required
+def change_password(current_admin):
+    try:
+        data = request.get_json()
+        if not data.get('current_password') or not data.get('new_password'):
+            return jsonify({'message': 'Passwords are required'}), 400
+        if not check_password_hash(current_admin['password'], data['current_password']):
+            return jsonify({'message': 'Current password is incorrect'}), 400
+        hashed = generate_password_hash(data['new_password'])
+        admins_collection.update_one({'_id': current_admin['_id']}, {'$set': {'password': hashed}})
+        principal_cache.invalidate(current_admin['_id'])
+        return jsonify({'message': 'Password changed'}), 200
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/admin/<admin_id>/deactivate', methods=['POST'])
+@token_required
+def deactivate_admin(current_admin, admin_id):
+    """Deactivate another admin account (super admins only)"""
+    try:
+        if current_admin.get('role') != 'super_admin':
+            return jsonify({'message': 'Only super admins can deactivate accounts'}), 403
+        if admin_id == str(current_admin['_id']):
+            return jsonify({'message': 'You cannot deactivate your own account'}), 400
+        previous = admins_collection.find_one_and_update(
+            {'_id': ObjectId(admin_id)},
+            {'$set': {
+                'is_active': False,
+                'updated_at': datetime.utcnow(),
+                'updated_by': str(current_admin['_id'])
+            }},
+            projection={'is_active': 1},
+            return_document=ReturnDocument.BEFORE
+        )
+        if previous is None:
+            return jsonify({'message': 'Admin not found'}), 404
+        if previous.get('is_active'):
+            stats_counters.admin_activated(-1)
+        principal_cache.invalidate(admin_id)
+        return jsonify({'message': 'Admin deactivated'}), 200
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
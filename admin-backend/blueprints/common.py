@@ -0,0 +1,73 @@
+from flask import Response, current_app, jsonify, request, stream_with_context
+import jwt
+from datetime import datetime
+from functools import wraps
+from bson import ObjectId
+
+from exporter import EXPORT_FORMATS, export_rows, parse_columns
+from services import admins_collection, principal_cache
+
+def load_admin(admin_id):
+    """Return the admin document for admin_id, served from the principal cache when possible"""
+    admin = principal_cache.get(admin_id)
+    if admin is None:
+        admin = admins_collection.find_one({'_id': ObjectId(admin_id)})
+        if admin:
+            principal_cache.put(admin_id, admin)
+    return admin
+
+def authenticate():
+    """The active admin whose token the request carries, and None; or None and why not"""
+    token = request.headers.get('Authorization')
+    
+    if not token:
+        return None, 'Token is missing!'
+    
+    try:
+        if token.startswith('Bearer '):
+            token = token[7:]
+        data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
+        current_admin = load_admin(data['admin_id'])
+        if not current_admin:
+            return None, 'Invalid token!'
+        if not current_admin.get('is_active', True):
+            return None, 'Account is deactivated'
+    except jwt.ExpiredSignatureError:
+        return None, 'Token has expired!'
+    except jwt.InvalidTokenError:
+        return None, 'Invalid token!'
+    
+    return current_admin, None
+
+def is_admin_request():
+    """True if the request carries a valid admin token (for checks outside a view)"""
+    return authenticate()[0] is not None
+
+# JWT token required decorator
+def token_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        current_admin, message = authenticate()
+        if current_admin is None:
+            return jsonify({'message': message}), 401
+        
+        return f(current_admin, *args, **kwargs)
+    return decorated
+
+def export_response(resource, collection, query, sort):
+    """Stream a collection export in the format and columns given by the query string"""
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'message': 'Unsupported format. Use csv or ndjson'}), 400
+    try:
+        columns = parse_columns(resource, request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    rows = export_rows(collection, query, sort, columns, fmt, batch_size=current_app.config['EXPORT_BATCH_SIZE'])
+    filename = f"{resource}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{fmt}"
+    return Response(
+        stream_with_context(rows),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
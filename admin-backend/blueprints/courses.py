@@ -0,0 +1,224 @@
+from flask import Blueprint, jsonify, request
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime
+from bson import ObjectId
+
+from projection import InvalidFields, parse_fields
+from response_cache import cached
+from services import course_resources_collection, courses_collection, response_cache, stats_counters
+from blueprints.common import export_response, token_required
+
+bp = Blueprint('courses', __name__)
+
+# Course Management Routes
+@bp.route('/api/courses', methods=['GET'])
+@token_required
+@cached(tags=('courses',))
+def get_courses(current_admin):
+    try:
+        projection = parse_fields('courses', request.args.get('fields'))
+        courses = list(courses_collection.find({}, projection).sort('name', 1))
+        
+        return jsonify({'courses': courses}), 200
+        
+    except InvalidFields as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/courses', methods=['POST'])
+@token_required
+def create_course(current_admin):
+    try:
+        data = request.get_json()
+        
+        required_fields = ['name', 'code', 'duration', 'fee']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({'message': f'{field} is required'}), 400
+        
+        # Duplicate course codes are rejected by the unique code index
+        course_data = {
+            'name': data['name'],
+            'code': data['code'],
+            'description': data.get('description', ''),
+            'duration': data['duration'],
+            'fee': data['fee'],
+            'capacity': data.get('capacity', 50),
+            'status': data.get('status', 'active'),
+            'created_at': datetime.utcnow(),
+            'created_by': str(current_admin['_id'])
+        }
+        
+        try:
+            result = courses_collection.insert_one(course_data)
+        except DuplicateKeyError:
+            return jsonify({'message': 'Course code already exists'}), 400
+        response_cache.invalidate('courses')
+        stats_counters.record_created('courses', course_data['status'])
+        
+        return jsonify({
+            'message': 'Course created successfully',
+            'course_id': str(result.inserted_id)
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/courses/export', methods=['GET'])
+@token_required
+def export_courses(current_admin):
+    """Stream courses as CSV or NDJSON"""
+    try:
+        query = {}
+        if request.args.get('status'):
+            query['status'] = request.args['status']
+        return export_response('courses', courses_collection, query, [('name', 1)])
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/courses/<course_id>', methods=['GET'])
+@token_required
+def get_course(current_admin, course_id):
+    try:
+        projection = parse_fields('courses', request.args.get('fields'))
+        course = courses_collection.find_one({'_id': ObjectId(course_id)}, projection)
+        
+        if not course:
+            return jsonify({'message': 'Course not found'}), 404
+        
+        return jsonify({'course': course}), 200
+        
+    except InvalidFields as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/courses/<course_id>', methods=['PUT'])
+@token_required
+def update_course(current_admin, course_id):
+    try:
+        data = request.get_json()
+        
+        # Remove fields that shouldn't be updated
+        data.pop('_id', None)
+        data.pop('created_at', None)
+        data.pop('created_by', None)
+        
+        # Add update timestamp
+        data['updated_at'] = datetime.utcnow()
+        data['updated_by'] = str(current_admin['_id'])
+        
+        previous = courses_collection.find_one_and_update(
+            {'_id': ObjectId(course_id)},
+            {'$set': data},
+            projection={'status': 1},
+            return_document=ReturnDocument.BEFORE
+        )
+        
+        if previous is None:
+            return jsonify({'message': 'Course not found'}), 404
+        response_cache.invalidate('courses')
+        if 'status' in data:
+            stats_counters.status_changed('courses', previous.get('status'), data['status'])
+        
+        return jsonify({'message': 'Course updated successfully'}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/courses/<course_id>', methods=['DELETE'])
+@token_required
+def delete_course(current_admin, course_id):
+    try:
+        deleted = courses_collection.find_one_and_delete(
+            {'_id': ObjectId(course_id)},
+            projection={'status': 1}
+        )
+        
+        if deleted is None:
+            return jsonify({'message': 'Course not found'}), 404
+        response_cache.invalidate('courses')
+        stats_counters.record_deleted('courses', deleted.get('status'))
+        
+        return jsonify({'message': 'Course deleted successfully'}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+# Course Resources (subject+grade -> one link used for past/model/study)
+@bp.route('/api/course-resources', methods=['GET'])
+@token_required
+def list_course_resources(current_admin):
+    try:
+        # Optional filters: subject, grade
+        subject = request.args.get('subject')
+        grade = request.args.get('grade')
+        query = {}
+        if subject:
+            query['subject'] = subject
+        if grade:
+            query['grade'] = grade
+        docs = list(course_resources_collection.find(query).sort('subject', 1))
+        return jsonify({'resources': docs}), 200
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/course-resources', methods=['POST'])
+@token_required
+def upsert_course_resource(current_admin):
+    try:
+        data = request.get_json()
+        # Expect subject (slug/lower), grade (e.g., '6' or 'grade-6'), and link (OneDrive/Drive)
+        for f in ['subject', 'grade', 'link']:
+            if not data.get(f):
+                return jsonify({'message': f'{f} is required'}), 400
+        # Normalize grade: accept 'grade-6' or '6' -> store as '6'
+        grade = str(data['grade']).replace('grade-', '')
+        subject = str(data['subject']).strip().lower()
+        link = data['link'].strip()
+        now = datetime.utcnow()
+        result = course_resources_collection.update_one(
+            {'subject': subject, 'grade': grade},
+            {'$set': {
+                'subject': subject,
+                'grade': grade,
+                'link': link,
+                'updated_at': now,
+                'updated_by': str(current_admin['_id'])
+            }, '$setOnInsert': {
+                'created_at': now,
+                'created_by': str(current_admin['_id'])
+            }},
+            upsert=True
+        )
+        response_cache.invalidate('course_resources')
+        # Determine id
+        if result.upserted_id:
+            res_id = str(result.upserted_id)
+            msg = 'Resource created'
+        else:
+            # fetch id
+            doc = course_resources_collection.find_one({'subject': subject, 'grade': grade})
+            res_id = str(doc['_id']) if doc else None
+            msg = 'Resource updated'
+        return jsonify({'message': msg, 'id': res_id}), 200
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+# Public resolver (no auth): given subject + grade + type -> redirect/open stored link
+@bp.route('/api/public/course-resource', methods=['GET'])
+@cached(tags=('course_resources',), statuses=(200, 404))
+def public_course_resource():
+    try:
+        subject = request.args.get('subject', '').strip().lower()
+        grade = request.args.get('grade', '').replace('grade-', '')
+        if not subject or not grade:
+            return jsonify({'message': 'subject and grade are required'}), 400
+        doc = course_resources_collection.find_one({'subject': subject, 'grade': grade})
+        if not doc:
+            return jsonify({'message': 'No resource configured for this subject and grade'}), 404
+        return jsonify({'link': doc.get('link')}), 200
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
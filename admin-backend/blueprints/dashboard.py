@@ -0,0 +1,100 @@
+from flask import Blueprint, jsonify, request
+from datetime import datetime, timedelta
+
+from daily_rollups import BUCKET_UNITS, MAX_PERIODS
+from services import courses_collection, daily_rollups, stats_counters, students_collection
+from blueprints.common import token_required
+
+bp = Blueprint('dashboard', __name__)
+
+# Dashboard Statistics
+@bp.route('/api/dashboard/stats', methods=['GET'])
+@token_required
+def get_dashboard_stats(current_admin):
+    try:
+        # One read of the materialized counters instead of a query per figure
+        stats = stats_counters.dashboard_stats()
+        stats['last_login'] = current_admin.get('last_login', 'Never')
+        
+        return jsonify({'stats': stats}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+# Dashboard Activity Data
+@bp.route('/api/dashboard/activity', methods=['GET'])
+@token_required
+def get_dashboard_activity(current_admin):
+    try:
+        bucket = request.args.get('bucket', 'week')
+        if bucket not in BUCKET_UNITS:
+            return jsonify({'message': f"bucket must be one of: {', '.join(BUCKET_UNITS)}"}), 400
+        try:
+            periods = int(request.args.get('periods', 4))
+        except ValueError:
+            return jsonify({'message': 'periods must be an integer'}), 400
+        if not 1 <= periods <= MAX_PERIODS:
+            return jsonify({'message': f'periods must be between 1 and {MAX_PERIODS}'}), 400
+        
+        # Get recent student registrations for activity chart
+        recent_students = list(students_collection.find({
+            'created_at': {'$gte': datetime.utcnow() - timedelta(days=30)}
+        }).sort('created_at', -1).limit(10))
+        
+        # Get recent course activities
+        recent_courses = list(courses_collection.find({
+            'created_at': {'$gte': datetime.utcnow() - timedelta(days=30)}
+        }).sort('created_at', -1).limit(5))
+        
+        # Format the data for frontend
+        activity_data = {
+            'recent_students': [
+                {
+                    'id': student['_id'],
+                    'name': student['full_name'],
+                    'course': student['course'],
+                    'date': student['created_at'],
+                    'status': student['status']
+                } for student in recent_students
+            ],
+            'recent_courses': [
+                {
+                    'id': course['_id'],
+                    'name': course['name'],
+                    'code': course['code'],
+                    'date': course['created_at'],
+                    'status': course['status']
+                } for course in recent_courses
+            ],
+            # Served from the daily rollups, never by scanning students
+            'chart_data': daily_rollups.series(bucket, periods)
+        }
+        
+        return jsonify({'activity': activity_data}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+# Dashboard Quick Actions
+@bp.route('/api/dashboard/quick-actions', methods=['POST'])
+@token_required
+def perform_quick_action(current_admin):
+    try:
+        data = request.get_json()
+        action = data.get('action')
+        
+        if action == 'manage_courses':
+            return jsonify({
+                'message': 'Redirecting to course management',
+                'redirect': '/courses'
+            }), 200
+        elif action == 'manage_students':
+            return jsonify({
+                'message': 'Redirecting to student management',
+                'redirect': '/students'
+            }), 200
+        else:
+            return jsonify({'message': 'Invalid action'}), 400
+            
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
@@ -0,0 +1,287 @@
+from flask import Blueprint, jsonify, request
+from pymongo import ReturnDocument
+from datetime import datetime
+import re
+from bson import ObjectId
+
+from feedback_stats import compute_feedback_stats
+from single_flight import coalesce
+from services import feedback_collection, stats_counters
+from blueprints.common import token_required
+
+bp = Blueprint('feedback', __name__)
+
+# Feedback Management Routes
+@bp.route('/api/feedback', methods=['POST'])
+def create_feedback():
+    """Create new feedback (public endpoint - no authentication required)"""
+    try:
+        data = request.get_json()
+        
+        # Validate required fields
+        required_fields = ['name', 'email', 'message']
+        for field in required_fields:
+            if not data.get(field):
+                return jsonify({'message': f'{field} is required'}), 400
+        
+        # Validate email format
+        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+        if not re.match(email_pattern, data['email']):
+            return jsonify({'message': 'Invalid email format'}), 400
+        
+        # Create feedback document
+        feedback_data = {
+            'name': data['name'].strip(),
+            'email': data['email'].strip().lower(),
+            'message': data['message'].strip(),
+            'rating': data.get('rating', 5),
+            'feedback_type': data.get('feedback_type', 'general'),
+            'student_id': data.get('student_id'),
+            'is_anonymous': data.get('is_anonymous', False),
+            'status': 'pending',
+            'admin_response': None,
+            'responded_at': None,
+            'created_at': datetime.utcnow(),
+            'updated_at': datetime.utcnow()
+        }
+        
+        # Insert feedback
+        result = feedback_collection.insert_one(feedback_data)
+        stats_counters.feedback_created([feedback_data])
+        
+        return jsonify({
+            'message': 'Feedback submitted successfully',
+            'feedback_id': str(result.inserted_id)
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/feedback', methods=['GET'])
+@coalesce()
+def get_feedbacks():
+    """Get feedbacks (public endpoint - returns only approved feedbacks)"""
+    try:
+        # Get query parameters
+        limit = int(request.args.get('limit', 10))
+        feedback_type = request.args.get('type')
+        rating = request.args.get('rating')
+        
+        # Build query
+        query = {'status': {'$in': ['reviewed', 'resolved']}}  # Only show approved feedbacks
+        
+        if feedback_type:
+            query['feedback_type'] = feedback_type
+        if rating:
+            query['rating'] = int(rating)
+        
+        # Get feedbacks
+        feedbacks = list(feedback_collection.find(query)
+                        .sort('created_at', -1)
+                        .limit(limit))
+        
+        return jsonify({'feedbacks': feedbacks}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+# Admin Feedback Management Routes
+@bp.route('/api/admin/feedback', methods=['GET'])
+@token_required
+def get_all_feedbacks(current_admin):
+    """Get all feedbacks for admin (with pagination and filtering)"""
+    try:
+        # Get query parameters
+        page = int(request.args.get('page', 1))
+        limit = int(request.args.get('limit', 20))
+        status = request.args.get('status')
+        feedback_type = request.args.get('type')
+        search = request.args.get('search', '')
+        
+        # Build query
+        query = {}
+        if status:
+            query['status'] = status
+        if feedback_type:
+            query['feedback_type'] = feedback_type
+        if search:
+            # Escape user input so it is matched literally, never run as a pattern
+            pattern = re.escape(search)
+            query['$or'] = [
+                {'name': {'$regex': pattern, '$options': 'i'}},
+                {'email': {'$regex': pattern, '$options': 'i'}},
+                {'message': {'$regex': pattern, '$options': 'i'}}
+            ]
+        
+        # Get total count
+        total = feedback_collection.count_documents(query)
+        
+        # Get feedbacks with pagination
+        feedbacks = list(feedback_collection.find(query)
+                        .skip((page - 1) * limit)
+                        .limit(limit)
+                        .sort('created_at', -1))
+        
+        return jsonify({
+            'feedbacks': feedbacks,
+            'total': total,
+            'page': page,
+            'pages': (total + limit - 1) // limit
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/admin/feedback/<feedback_id>', methods=['GET'])
+@token_required
+def get_feedback(current_admin, feedback_id):
+    """Get specific feedback by ID"""
+    try:
+        feedback = feedback_collection.find_one({'_id': ObjectId(feedback_id)})
+        
+        if not feedback:
+            return jsonify({'message': 'Feedback not found'}), 404
+        
+        return jsonify({'feedback': feedback}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/admin/feedback/<feedback_id>', methods=['PUT'])
+@token_required
+def update_feedback(current_admin, feedback_id):
+    """Update feedback status and admin response"""
+    try:
+        data = request.get_json()
+        
+        # Validate status if provided
+        if 'status' in data and data['status'] not in ['pending', 'reviewed', 'resolved', 'archived']:
+            return jsonify({'message': 'Invalid status'}), 400
+        
+        # Prepare update data
+        update_data = {}
+        if 'status' in data:
+            update_data['status'] = data['status']
+        if 'admin_response' in data:
+            update_data['admin_response'] = data['admin_response']
+            update_data['responded_at'] = datetime.utcnow()
+        
+        update_data['updated_at'] = datetime.utcnow()
+        update_data['updated_by'] = str(current_admin['_id'])
+        
+        # Update feedback
+        previous = feedback_collection.find_one_and_update(
+            {'_id': ObjectId(feedback_id)},
+            {'$set': update_data},
+            projection={'status': 1},
+            return_document=ReturnDocument.BEFORE
+        )
+        
+        if previous is None:
+            return jsonify({'message': 'Feedback not found'}), 404
+        if 'status' in update_data:
+            stats_counters.status_changed('feedback', previous.get('status'), update_data['status'])
+        
+        return jsonify({'message': 'Feedback updated successfully'}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/admin/feedback/<feedback_id>', methods=['DELETE'])
+@token_required
+def delete_feedback(current_admin, feedback_id):
+    """Delete feedback"""
+    try:
+        deleted = feedback_collection.find_one_and_delete(
+            {'_id': ObjectId(feedback_id)},
+            projection={'status': 1, 'rating': 1, 'created_at': 1}
+        )
+        
+        if deleted is None:
+            return jsonify({'message': 'Feedback not found'}), 404
+        stats_counters.feedback_deleted([deleted])
+        
+        return jsonify({'message': 'Feedback deleted successfully'}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+# Status each feedback bulk action sets
+FEEDBACK_ACTION_STATUS = {'mark_reviewed': 'reviewed', 'mark_resolved': 'resolved', 'archive': 'archived'}
+
+@bp.route('/api/admin/feedback/bulk-action', methods=['POST'])
+@token_required
+def bulk_feedback_action(current_admin):
+    """Perform bulk actions on feedbacks"""
+    try:
+        data = request.get_json()
+        action = data.get('action')
+        feedback_ids = data.get('feedback_ids', [])
+        
+        if not action or not feedback_ids:
+            return jsonify({'message': 'Action and feedback IDs are required'}), 400
+        
+        # Convert string IDs to ObjectIds
+        object_ids = [ObjectId(fid) for fid in feedback_ids]
+        
+        # Dashboard counters need the statuses (and ratings, for deletes) being replaced
+        if action == 'delete':
+            removed = list(feedback_collection.find({'_id': {'$in': object_ids}}, {'status': 1, 'rating': 1, 'created_at': 1}))
+        elif action in FEEDBACK_ACTION_STATUS:
+            status_counts = stats_counters.status_counts(feedback_collection, object_ids)
+        
+        if action == 'mark_reviewed':
+            result = feedback_collection.update_many(
+                {'_id': {'$in': object_ids}},
+                {'$set': {
+                    'status': 'reviewed',
+                    'updated_at': datetime.utcnow(),
+                    'updated_by': str(current_admin['_id'])
+                }}
+            )
+        elif action == 'mark_resolved':
+            result = feedback_collection.update_many(
+                {'_id': {'$in': object_ids}},
+                {'$set': {
+                    'status': 'resolved',
+                    'updated_at': datetime.utcnow(),
+                    'updated_by': str(current_admin['_id'])
+                }}
+            )
+        elif action == 'archive':
+            result = feedback_collection.update_many(
+                {'_id': {'$in': object_ids}},
+                {'$set': {
+                    'status': 'archived',
+                    'updated_at': datetime.utcnow(),
+                    'updated_by': str(current_admin['_id'])
+                }}
+            )
+        elif action == 'delete':
+            result = feedback_collection.delete_many({'_id': {'$in': object_ids}})
+        else:
+            return jsonify({'message': 'Invalid action'}), 400
+        
+        if action == 'delete':
+            stats_counters.feedback_deleted(removed)
+        else:
+            stats_counters.bulk_status_changed('feedback', status_counts, FEEDBACK_ACTION_STATUS[action])
+        
+        return jsonify({
+            'message': f'Bulk action completed successfully',
+            'modified_count': result.modified_count if hasattr(result, 'modified_count') else result.deleted_count
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/admin/feedback/stats', methods=['GET'])
+@token_required
+def get_feedback_stats(current_admin):
+    """Get feedback statistics for admin dashboard (one $facet aggregation)"""
+    try:
+        stats = compute_feedback_stats(feedback_collection)
+        return jsonify({'stats': stats}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
@@ -0,0 +1,24 @@
+from flask import Blueprint, jsonify, redirect
+
+from services import static_manifest
+from static_assets import ACCEPT_CH
+
+bp = Blueprint('frontend', __name__)
+
+# FRONTEND SERVING ROUTES
+@bp.route('/admin/index.html')
+def redirect_admin_index():
+    """Redirect /admin/index.html to /admin"""
+    return redirect('/admin')
+
+@bp.route('/', defaults={'filename': ''})
+@bp.route('/<path:filename>')
+def serve_frontend(filename):
+    """Serve public, admin and shared files (and their legacy URLs) from the static manifest"""
+    response = static_manifest.send('/' + filename)
+    if response is None:
+        return jsonify({'error': 'File not found'}), 404
+    if response.mimetype == 'text/html':
+        # Opt in to the width hint for the images this page loads
+        response.headers['Accept-CH'] = ACCEPT_CH
+    return response
@@ -0,0 +1,486 @@
+from flask import Blueprint, current_app, jsonify, request
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from projection import InvalidFields, parse_fields
+from pagination import InvalidCursor, encode_cursor, keyset_query, parse_bool
+from student_search import MAX_SEARCH_RESULTS, search_fields, search_query, search_students
+from student_bulk import BULK_ACTIONS, apply_in_chunks, build_filter, build_update, iter_filter_chunks, iter_id_chunks
+from student_import import (
+    build_student_document, import_students, iter_csv_rows, iter_ndjson_rows, missing_student_field
+)
+from response_cache import cached
+from services import (
+    bulk_jobs, current_services, daily_rollups, registration_links_collection, response_cache, stats_counters,
+    students_collection
+)
+from blueprints.common import export_response, token_required
+
+bp = Blueprint('students', __name__)
+
+# Student Management Routes
+@bp.route('/api/students', methods=['GET'])
+@token_required
+def get_students(current_admin):
+    try:
+        page = max(int(request.args.get('page', 1)), 1)
+        limit = min(max(int(request.args.get('limit', 10)), 1), current_app.config['MAX_PAGE_SIZE'])
+        search = request.args.get('search', '').strip()
+        projection = parse_fields('students', request.args.get('fields'))
+        query = {}
+        
+        # Ranked search over the normalized/text indexes (see student_search.py)
+        if search:
+            include_total = parse_bool(request.args.get('include_total'), default=True)
+            students = search_students(students_collection, search, skip=(page - 1) * limit,
+                                       limit=limit, projection=projection)
+            
+            response = {
+                'students': students,
+                'page': page
+            }
+            if include_total:
+                # search_students never pages past MAX_SEARCH_RESULTS, so neither do total/pages
+                total = students_collection.count_documents(search_query(search), limit=MAX_SEARCH_RESULTS)
+                response['total'] = total
+                response['pages'] = (total + limit - 1) // limit
+            return jsonify(response), 200
+        
+        # Cursor mode: ?cursor= (empty for the first page) walks the
+        # (created_at, _id) index instead of skipping over earlier pages
+        if 'cursor' in request.args:
+            include_total = parse_bool(request.args.get('include_total'), default=False)
+            page_query = keyset_query(query, request.args.get('cursor'))
+            # The cursor is built from created_at, so fetch it even when not requested
+            hide_created_at = bool(projection) and projection.get('_id') == 1 and 'created_at' not in projection
+            if hide_created_at:
+                projection['created_at'] = 1
+            students = list(students_collection.find(page_query, projection)
+                           .sort([('created_at', -1), ('_id', -1)])
+                           .limit(limit + 1))
+            has_more = len(students) > limit
+            students = students[:limit]
+            next_cursor = encode_cursor(students[-1]) if has_more else None
+            
+            if hide_created_at:
+                for student in students:
+                    student.pop('created_at', None)
+            
+            response = {
+                'students': students,
+                'limit': limit,
+                'has_more': has_more,
+                'next_cursor': next_cursor
+            }
+            if include_total:
+                response['total'] = students_collection.count_documents(keyset_query(query, None))
+            return jsonify(response), 200
+        
+        # Offset mode (kept for older clients); the total can be skipped with include_total=false
+        include_total = parse_bool(request.args.get('include_total'), default=True)
+        
+        # Get students with pagination
+        students = list(students_collection.find(query, projection)
+                       .skip((page - 1) * limit)
+                       .limit(limit)
+                       .sort([('created_at', -1), ('_id', -1)]))
+        
+        response = {
+            'students': students,
+            'page': page
+        }
+        if include_total:
+            total = students_collection.count_documents(query)
+            response['total'] = total
+            response['pages'] = (total + limit - 1) // limit
+        return jsonify(response), 200
+        
+    except (InvalidCursor, InvalidFields) as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/students', methods=['POST'])
+@token_required
+def create_student(current_admin):
+    try:
+        data = request.get_json()
+        
+        # Validate required fields
+        missing = missing_student_field(data)
+        if missing:
+            return jsonify({'message': f'{missing} is required'}), 400
+        
+        # Create student record (duplicates are rejected by the unique email/student_id indexes)
+        student_data = build_student_document(data, str(current_admin['_id']))
+        
+        try:
+            result = students_collection.insert_one(student_data)
+        except DuplicateKeyError:
+            return jsonify({'message': 'Student already exists'}), 400
+        stats_counters.students_created([student_data])
+        daily_rollups.enrollments([student_data])
+        
+        return jsonify({
+            'message': 'Student created successfully',
+            'student_id': str(result.inserted_id)
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+def record_students_created(students):
+    """Count imported students in the dashboard counters and daily rollups"""
+    stats_counters.students_created(students)
+    daily_rollups.enrollments(students)
+
+@bp.route('/api/students/import', methods=['POST'])
+@token_required
+def import_students_file(current_admin):
+    """Bulk import students from a CSV or NDJSON upload, streamed in batches"""
+    try:
+        upload = request.files.get('file')
+        if upload:
+            stream = upload.stream
+            filename = (upload.filename or '').lower()
+            content_type = upload.mimetype or ''
+        else:
+            # Raw request body: read straight from the WSGI input, never buffered whole
+            stream = request.stream
+            filename = ''
+            content_type = request.mimetype or ''
+        
+        fmt = request.args.get('format', '').lower()
+        if not fmt:
+            if filename.endswith(('.ndjson', '.jsonl')) or 'ndjson' in content_type or 'jsonl' in content_type:
+                fmt = 'ndjson'
+            elif filename.endswith('.csv') or 'csv' in content_type:
+                fmt = 'csv'
+        if fmt not in ('csv', 'ndjson'):
+            return jsonify({'message': 'Unsupported format. Use CSV or NDJSON'}), 400
+        
+        rows = iter_csv_rows(stream) if fmt == 'csv' else iter_ndjson_rows(stream)
+        report = import_students(
+            students_collection,
+            rows,
+            str(current_admin['_id']),
+            batch_size=current_app.config['IMPORT_BATCH_SIZE'],
+            on_inserted=record_students_created
+        )
+        
+        return jsonify({
+            'message': 'Import completed',
+            'report': report.to_dict()
+        }), 200
+        
+    except UnicodeDecodeError:
+        return jsonify({'message': 'Upload must be UTF-8 encoded'}), 400
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/students/export', methods=['GET'])
+@token_required
+def export_students(current_admin):
+    """Stream students as CSV or NDJSON (same search filter as the list endpoint)"""
+    try:
+        query = {}
+        search = request.args.get('search', '').strip()
+        if search:
+            query = search_query(search)
+        if request.args.get('status'):
+            query['status'] = request.args['status']
+        if request.args.get('course'):
+            query['course'] = request.args['course']
+        return export_response('students', students_collection, query, [('created_at', -1), ('_id', -1)])
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/students/bulk-action', methods=['POST'])
+@token_required
+def bulk_student_action(current_admin):
+    """Change status, reassign course or delete many students at once"""
+    try:
+        data = request.get_json()
+        action = data.get('action')
+        student_ids = data.get('student_ids')
+        selection = data.get('filter')
+        
+        if action not in BULK_ACTIONS:
+            return jsonify({'message': 'Invalid action'}), 400
+        if bool(student_ids) == bool(selection):
+            return jsonify({'message': 'Provide either student_ids or filter'}), 400
+        
+        try:
+            update = build_update(action, data, str(current_admin['_id']))
+            if student_ids:
+                chunks = list(iter_id_chunks(student_ids, current_app.config['BULK_CHUNK_SIZE']))
+                total = len(student_ids)
+            else:
+                query = build_filter(selection)
+                total = students_collection.count_documents(query)
+        except InvalidId:
+            return jsonify({'message': 'Invalid student id'}), 400
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+        
+        # Large jobs run on a background thread, outside this request: bind what they use now
+        services = current_services()
+        chunk_size = current_app.config['BULK_CHUNK_SIZE']
+        
+        def work():
+            students = services.students_collection
+            source = chunks if student_ids else iter_filter_chunks(students, query, chunk_size)
+            return apply_in_chunks(students, source, update,
+                                   counters=services.stats_counters, rollups=services.daily_rollups)
+        
+        # Large selections run in the background; poll the job for progress
+        if total > current_app.config['BULK_ASYNC_THRESHOLD']:
+            job_id = bulk_jobs.submit(f'students.{action}', total, str(current_admin['_id']), work)
+            return jsonify({
+                'message': 'Bulk action started',
+                'job_id': job_id,
+                'total': total,
+                'status_url': f'/api/students/bulk-action/{job_id}'
+            }), 202
+        
+        progress = {'processed': 0, 'matched': 0, 'modified': 0, 'deleted': 0}
+        for progress in work():
+            pass
+        
+        return jsonify({
+            'message': 'Bulk action completed successfully',
+            'matched_count': progress['matched'],
+            'modified_count': progress['deleted'] if action == 'delete' else progress['modified']
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/students/bulk-action/<job_id>', methods=['GET'])
+@token_required
+def get_bulk_student_job(current_admin, job_id):
+    """Report progress of a background bulk action"""
+    try:
+        job = bulk_jobs.get(job_id)
+        if not job:
+            return jsonify({'message': 'Job not found'}), 404
+        
+        job['id'] = job.pop('_id')
+        return jsonify({'job': job}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/students/<student_id>', methods=['GET'])
+@token_required
+def get_student(current_admin, student_id):
+    try:
+        projection = parse_fields('students', request.args.get('fields'))
+        student = students_collection.find_one({'_id': ObjectId(student_id)}, projection)
+        
+        if not student:
+            return jsonify({'message': 'Student not found'}), 404
+        
+        return jsonify({'student': student}), 200
+        
+    except InvalidFields as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/students/<student_id>', methods=['PUT'])
+@token_required
+def update_student(current_admin, student_id):
+    try:
+        data = request.get_json()
+        
+        # Remove fields that shouldn't be updated
+        data.pop('_id', None)
+        data.pop('created_at', None)
+        data.pop('created_by', None)
+        
+        # Keep the normalized search fields in step with the edited values
+        data.update(search_fields(data))
+        
+        # Add update timestamp
+        data['updated_at'] = datetime.utcnow()
+        data['updated_by'] = str(current_admin['_id'])
+        
+        previous = students_collection.find_one_and_update(
+            {'_id': ObjectId(student_id)},
+            {'$set': data},
+            projection={'status': 1},
+            return_document=ReturnDocument.BEFORE
+        )
+        
+        if previous is None:
+            return jsonify({'message': 'Student not found'}), 404
+        if 'status' in data:
+            stats_counters.status_changed('students', previous.get('status'), data['status'])
+        if data.get('status') == 'completed' and previous.get('status') != 'completed':
+            students_collection.update_one(
+                {'_id': previous['_id']},
+                {'$set': {'completed_at': data['updated_at']}}
+            )
+            daily_rollups.completions(data['updated_at'])
+        
+        return jsonify({'message': 'Student updated successfully'}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/students/<student_id>', methods=['DELETE'])
+@token_required
+def delete_student(current_admin, student_id):
+    try:
+        deleted = students_collection.find_one_and_delete(
+            {'_id': ObjectId(student_id)},
+            projection={'status': 1, 'created_at': 1}
+        )
+        
+        if deleted is None:
+            return jsonify({'message': 'Student not found'}), 404
+        stats_counters.students_deleted([deleted])
+        
+        return jsonify({'message': 'Student deleted successfully'}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+# Public API to get current registration link (no authentication required)
+@bp.route('/api/public/registration-link', methods=['GET'])
+@cached(tags=('registration_links',), statuses=(200, 404))
+def get_public_registration_link():
+    try:
+        # Get the current active registration link
+        link_doc = registration_links_collection.find_one({'is_active': True})
+        
+        if link_doc:
+            return jsonify({
+                'link': link_doc['link'],
+                'title': link_doc.get('title', 'Student Registration'),
+                'available': True
+            }), 200
+        else:
+            return jsonify({
+                'link': None,
+                'title': 'Student Registration',
+                'available': False,
+                'message': 'No registration form available'
+            }), 404
+            
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+# Student Registration Link Management
+@bp.route('/api/student-registration/link', methods=['GET'])
+@token_required
+def get_registration_link(current_admin):
+    try:
+        # Get the current registration link
+        link_doc = registration_links_collection.find_one({'is_active': True})
+        
+        if link_doc:
+            return jsonify({
+                'link': link_doc['link'],
+                'title': link_doc.get('title', 'Student Registration'),
+                'created_at': link_doc['created_at'],
+                'created_by': link_doc['created_by']
+            }), 200
+        else:
+            return jsonify({'message': 'No active registration link found'}), 404
+            
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/student-registration/link', methods=['POST'])
+@token_required
+def add_registration_link(current_admin):
+    try:
+        data = request.get_json()
+        
+        if not data.get('link'):
+            return jsonify({'message': 'Registration link is required'}), 400
+        
+        # Deactivate any existing active links
+        registration_links_collection.update_many(
+            {'is_active': True},
+            {'$set': {'is_active': False, 'updated_at': datetime.utcnow()}}
+        )
+        
+        # Create new registration link
+        link_data = {
+            'link': data['link'],
+            'title': data.get('title', 'Student Registration'),
+            'is_active': True,
+            'created_at': datetime.utcnow(),
+            'created_by': str(current_admin['_id']),
+            'admin_username': current_admin['username']
+        }
+        
+        result = registration_links_collection.insert_one(link_data)
+        response_cache.invalidate('registration_links')
+        
+        return jsonify({
+            'message': 'Registration link added successfully',
+            'link_id': str(result.inserted_id)
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/student-registration/link', methods=['PUT'])
+@token_required
+def update_registration_link(current_admin):
+    try:
+        data = request.get_json()
+        
+        if not data.get('link'):
+            return jsonify({'message': 'Registration link is required'}), 400
+        
+        # Find the current active link
+        current_link = registration_links_collection.find_one({'is_active': True})
+        
+        if not current_link:
+            return jsonify({'message': 'No active registration link to update'}), 404
+        
+        # Update the link
+        result = registration_links_collection.update_one(
+            {'_id': current_link['_id']},
+            {
+                '$set': {
+                    'link': data['link'],
+                    'title': data.get('title', 'Student Registration'),
+                    'updated_at': datetime.utcnow(),
+                    'updated_by': str(current_admin['_id']),
+                    'admin_username': current_admin['username']
+                }
+            }
+        )
+        
+        if result.modified_count > 0:
+            response_cache.invalidate('registration_links')
+            return jsonify({'message': 'Registration link updated successfully'}), 200
+        else:
+            return jsonify({'message': 'Failed to update registration link'}), 500
+            
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/student-registration/link/history', methods=['GET'])
+@token_required
+def get_registration_link_history(current_admin):
+    try:
+        # Get all registration links (for history)
+        projection = parse_fields('registration_links', request.args.get('fields'))
+        links = list(registration_links_collection.find({}, projection).sort('created_at', -1))
+        
+        return jsonify({'links': links}), 200
+        
+    except InvalidFields as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
@@ -0,0 +1,179 @@
+from flask import Blueprint, Response, current_app, jsonify, request
+from datetime import datetime
+import os
+
+from response_cache import cached
+from query_profiler import TOP_SORTS
+from request_profiler import SUMMARY_SORTS
+from services import (app_settings_collection, client, metrics, principal_cache, query_profiler, request_profiler,
+                      response_cache, single_flight, static_file_cache)
+from blueprints.common import token_required
+
+bp = Blueprint('system', __name__)
+
+# Health check endpoint
+@bp.route('/health', methods=['GET'])
+def health_check():
+    try:
+        # Test MongoDB connection
+        client.admin.command('ping')
+        frontend_dir = current_app.config['FRONTEND_DIR']
+        return jsonify({
+            'status': 'healthy',
+            'database': 'connected',
+            'timestamp': datetime.utcnow().isoformat(),
+            'frontend_dir': frontend_dir,
+            'public_dir': os.path.join(frontend_dir, 'public'),
+            'admin_dir': os.path.join(frontend_dir, 'admin'),
+            'shared_dir': os.path.join(frontend_dir, 'shared')
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'status': 'unhealthy',
+            'database': 'disconnected',
+            'error': str(e),
+            'timestamp': datetime.utcnow().isoformat()
+        }), 500
+
+# Prometheus scrape endpoint: request, MongoDB and pool metrics summed over all workers
+@bp.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+# Debug route to see all registered routes
+@bp.route('/api/routes', methods=['GET'])
+def list_routes():
+    routes = []
+    for rule in current_app.url_map.iter_rules():
+        routes.append({
+            'endpoint': rule.endpoint,
+            'methods': list(rule.methods),
+            'rule': rule.rule
+        })
+    return jsonify({'routes': routes})
+
+@bp.route('/api/admin/cache/stats', methods=['GET'])
+@token_required
+def get_cache_stats(current_admin):
+    """Expose cache counters (hit ratio, evictions, invalidations)"""
+    try:
+        return jsonify({
+            'principal_cache': principal_cache.stats(),
+            'response_cache': response_cache.stats(),
+            'single_flight': single_flight.stats(),
+            'static_cache': static_file_cache.stats()
+        }), 200
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/admin/slow-queries', methods=['GET'])
+@token_required
+def get_slow_queries(current_admin):
+    """Top MongoDB query shapes by time, and the latest slow-query log entries (this worker)"""
+    sort = request.args.get('sort', 'total_ms')
+    if sort not in TOP_SORTS:
+        return jsonify({'message': f"sort must be one of: {', '.join(TOP_SORTS)}"}), 400
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({'message': 'limit must be an integer'}), 400
+    if not 1 <= limit <= 100:
+        return jsonify({'message': 'limit must be between 1 and 100'}), 400
+    return jsonify({
+        'profiler': query_profiler.stats(),
+        'top': query_profiler.top(limit, sort),
+        'recent': query_profiler.recent(limit)
+    }), 200
+
+@bp.route('/api/admin/slow-queries', methods=['DELETE'])
+@token_required
+def reset_slow_queries(current_admin):
+    query_profiler.reset()
+    return jsonify({'message': 'Query profile reset'}), 200
+
+@bp.route('/api/admin/profiler', methods=['GET'])
+@token_required
+def get_request_profiles(current_admin):
+    """Sampling settings, profiles kept per endpoint and the hottest functions across them (all workers)"""
+    sort = request.args.get('sort', 'tottime')
+    if sort not in SUMMARY_SORTS:
+        return jsonify({'message': f"sort must be one of: {', '.join(SUMMARY_SORTS)}"}), 400
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        return jsonify({'message': 'limit must be an integer'}), 400
+    if not 1 <= limit <= 200:
+        return jsonify({'message': 'limit must be between 1 and 200'}), 400
+    try:
+        summary = request_profiler.summary(request.args.get('endpoint') or None, limit, sort)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    return jsonify({
+        'profiler': request_profiler.status(),
+        'endpoints': request_profiler.endpoints(),
+        'summary': summary
+    }), 200
+
+@bp.route('/api/admin/profiler', methods=['PUT'])
+@token_required
+def configure_request_profiler(current_admin):
+    """Profile a fraction of all requests for a while: {"sample_rate": 0.05, "duration": 600}"""
+    data = request.get_json(silent=True) or {}
+    try:
+        sample_rate = float(data.get('sample_rate', 0))
+        duration = int(data.get('duration', 600))
+    except (TypeError, ValueError):
+        return jsonify({'message': 'sample_rate must be a number and duration an integer'}), 400
+    if not 0 <= sample_rate <= 1:
+        return jsonify({'message': 'sample_rate must be between 0 and 1'}), 400
+    if not 1 <= duration <= 86400:
+        return jsonify({'message': 'duration must be between 1 and 86400 seconds'}), 400
+    try:
+        request_profiler.configure(sample_rate, duration)
+    except OSError as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+    return jsonify({'message': 'Profiler updated', 'profiler': request_profiler.status()}), 200
+
+@bp.route('/api/admin/profiler', methods=['DELETE'])
+@token_required
+def clear_request_profiles(current_admin):
+    try:
+        removed = request_profiler.clear(request.args.get('endpoint') or None)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    return jsonify({'message': f'{removed} profiles deleted'}), 200
+
+# Application settings (single document)
+@bp.route('/api/settings/app', methods=['GET'])
+@token_required
+@cached(tags=('app_settings',))
+def get_app_settings(current_admin):
+    try:
+        doc = app_settings_collection.find_one({}) or {}
+        return jsonify({
+            'site_name': doc.get('site_name', 'EduNova'),
+            'logo_url': doc.get('logo_url', ''),
+            'cors_origins': doc.get('cors_origins', []),
+            'enable_registrations': doc.get('enable_registrations', True)
+        }), 200
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/settings/app', methods=['PUT'])
+@token_required
+def update_app_settings(current_admin):
+    try:
+        data = request.get_json()
+        update = {
+            'site_name': data.get('site_name', 'EduNova'),
+            'logo_url': data.get('logo_url', ''),
+            'cors_origins': data.get('cors_origins', []),
+            'enable_registrations': bool(data.get('enable_registrations', True)),
+            'updated_at': datetime.utcnow(),
+            'updated_by': str(current_admin['_id'])
+        }
+        app_settings_collection.update_one({}, {'$set': update}, upsert=True)
+        response_cache.invalidate('app_settings')
+        return jsonify({'message': 'Settings updated'}), 200
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
@@ -0,0 +1,148 @@
+from flask import Blueprint, jsonify, request
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime
+from bson import ObjectId
+
+from projection import InvalidFields, parse_fields
+from response_cache import cached
+from services import response_cache, stats_counters, teachers_collection
+from blueprints.common import export_response, token_required
+
+bp = Blueprint('teachers', __name__)
+
+# Teacher Management Routes
+@bp.route('/api/teachers', methods=['GET'])
+@token_required
+@cached(tags=('teachers',))
+def get_teachers(current_admin):
+    try:
+        projection = parse_fields('teachers', request.args.get('fields'))
+        teachers = list(teachers_collection.find({}, projection).sort('name', 1))
+        
+        return jsonify({'teachers': teachers}), 200
+        
+    except InvalidFields as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/teachers', methods=['POST'])
+@token_required
+def create_teacher(current_admin):
+    try:
+        data = request.get_json()
+        
+        required_fields = ['name', 'subject', 'contact', 'email']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({'message': f'{field} is required'}), 400
+        
+        # Duplicate emails are rejected by the unique email index
+        teacher_data = {
+            'name': data['name'],
+            'subject': data['subject'],
+            'contact': data['contact'],
+            'email': data['email'],
+            'status': data.get('status', 'active'),
+            'created_at': datetime.utcnow(),
+            'created_by': str(current_admin['_id'])
+        }
+        
+        try:
+            result = teachers_collection.insert_one(teacher_data)
+        except DuplicateKeyError:
+            return jsonify({'message': 'Teacher with this email already exists'}), 400
+        response_cache.invalidate('teachers')
+        stats_counters.record_created('teachers', teacher_data['status'])
+        
+        return jsonify({
+            'message': 'Teacher created successfully',
+            'teacher_id': str(result.inserted_id)
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/teachers/export', methods=['GET'])
+@token_required
+def export_teachers(current_admin):
+    """Stream teachers as CSV or NDJSON"""
+    try:
+        query = {}
+        if request.args.get('status'):
+            query['status'] = request.args['status']
+        if request.args.get('subject'):
+            query['subject'] = request.args['subject']
+        return export_response('teachers', teachers_collection, query, [('name', 1)])
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/teachers/<teacher_id>', methods=['GET'])
+@token_required
+def get_teacher(current_admin, teacher_id):
+    try:
+        projection = parse_fields('teachers', request.args.get('fields'))
+        teacher = teachers_collection.find_one({'_id': ObjectId(teacher_id)}, projection)
+        
+        if not teacher:
+            return jsonify({'message': 'Teacher not found'}), 404
+        
+        return jsonify({'teacher': teacher}), 200
+        
+    except InvalidFields as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/teachers/<teacher_id>', methods=['PUT'])
+@token_required
+def update_teacher(current_admin, teacher_id):
+    try:
+        data = request.get_json()
+        
+        # Remove fields that shouldn't be updated
+        data.pop('_id', None)
+        data.pop('created_at', None)
+        data.pop('created_by', None)
+        
+        # Add update timestamp
+        data['updated_at'] = datetime.utcnow()
+        data['updated_by'] = str(current_admin['_id'])
+        
+        previous = teachers_collection.find_one_and_update(
+            {'_id': ObjectId(teacher_id)},
+            {'$set': data},
+            projection={'status': 1},
+            return_document=ReturnDocument.BEFORE
+        )
+        
+        if previous is None:
+            return jsonify({'message': 'Teacher not found'}), 404
+        response_cache.invalidate('teachers')
+        if 'status' in data:
+            stats_counters.status_changed('teachers', previous.get('status'), data['status'])
+        
+        return jsonify({'message': 'Teacher updated successfully'}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/api/teachers/<teacher_id>', methods=['DELETE'])
+@token_required
+def delete_teacher(current_admin, teacher_id):
+    try:
+        deleted = teachers_collection.find_one_and_delete(
+            {'_id': ObjectId(teacher_id)},
+            projection={'status': 1}
+        )
+        
+        if deleted is None:
+            return jsonify({'message': 'Teacher not found'}), 404
+        response_cache.invalidate('teachers')
+        stats_counters.record_deleted('teachers', deleted.get('status'))
+        
+        return jsonify({'message': 'Teacher deleted successfully'}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
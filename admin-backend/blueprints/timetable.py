@@ -0,0 +1,72 @@
+from flask import Blueprint, jsonify, request
+from datetime import datetime
+from bson import ObjectId
+
+from projection import InvalidFields, parse_fields
+from response_cache import cached
+from services import response_cache, timetable_collection
+from blueprints.common import token_required
+
+bp = Blueprint('timetable', __name__)
+
+# Timetable Endpoints
+# Public: list timetable entries with optional filters
+@bp.route('/api/timetable', methods=['GET'])
+@cached(tags=('timetable',))
+def get_timetable():
+    try:
+        subject = request.args.get('subject')
+        grade = request.args.get('grade')
+        date = request.args.get('date')
+        query = {}
+        if subject:
+            query['subject'] = subject.strip().lower()
+        if grade:
+            query['grade'] = str(grade).replace('grade-', '')
+        if date:
+            query['date'] = date
+        projection = parse_fields('timetable', request.args.get('fields'))
+        entries = list(timetable_collection.find(query, projection).sort([('date', 1), ('start_time', 1)]))
+        return jsonify({'entries': entries}), 200
+    except InvalidFields as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+# Admin: add a timetable entry
+@bp.route('/api/timetable', methods=['POST'])
+@token_required
+def add_timetable_entry(current_admin):
+    try:
+        data = request.get_json()
+        required = ['subject', 'grade', 'date', 'start_time', 'end_time']
+        for f in required:
+            if not data.get(f):
+                return jsonify({'message': f'{f} is required'}), 400
+        doc = {
+            'subject': str(data['subject']).strip().lower(),
+            'grade': str(data['grade']).replace('grade-', ''),
+            'date': data['date'],
+            'start_time': data['start_time'],
+            'end_time': data['end_time'],
+            'created_at': datetime.utcnow(),
+            'created_by': str(current_admin['_id'])
+        }
+        res = timetable_collection.insert_one(doc)
+        response_cache.invalidate('timetable')
+        return jsonify({'message': 'Timetable entry added', 'id': str(res.inserted_id)}), 201
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+# Admin: delete an entry
+@bp.route('/api/timetable/<entry_id>', methods=['DELETE'])
+@token_required
+def delete_timetable_entry(current_admin, entry_id):
+    try:
+        result = timetable_collection.delete_one({'_id': ObjectId(entry_id)})
+        if result.deleted_count == 0:
+            return jsonify({'message': 'Entry not found'}), 404
+        response_cache.invalidate('timetable')
+        return jsonify({'message': 'Entry deleted'}), 200
+    except Exception as e:
+        return jsonify({'message': f'Error: {str(e)}'}), 500
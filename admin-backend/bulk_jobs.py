@@ -0,0 +1,67 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+class BulkJobs:
+    """Runs long bulk operations in background threads.
+
+    Job state lives in a Mongo collection rather than in memory, so any
+    worker process can answer a progress request for a job another worker
+    started.
+    """
+
+    def __init__(self, collection, max_workers=2):
+        self.collection = collection
+        self.max_workers = max_workers
+        self._executor = None
+
+    def _get_executor(self):
+        # Created on first use so no threads exist before a pre-fork server forks
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='bulk-job')
+        return self._executor
+
+    def submit(self, kind, total, created_by, work):
+        """Queue ``work`` and return the new job id.
+
+        ``work`` is a generator function yielding cumulative progress dicts
+        (processed, matched, modified, deleted) after each chunk.
+        """
+        job_id = uuid.uuid4().hex
+        self.collection.insert_one({
+            '_id': job_id,
+            'kind': kind,
+            'status': 'queued',
+            'total': total,
+            'processed': 0,
+            'matched': 0,
+            'modified': 0,
+            'deleted': 0,
+            'error': None,
+            'created_at': datetime.utcnow(),
+            'created_by': created_by
+        })
+        self._get_executor().submit(self._run, job_id, work)
+        return job_id
+
+    def _run(self, job_id, work):
+        self.collection.update_one(
+            {'_id': job_id},
+            {'$set': {'status': 'running', 'started_at': datetime.utcnow()}}
+        )
+        try:
+            for progress in work():
+                self.collection.update_one({'_id': job_id}, {'$set': progress})
+            self.collection.update_one(
+                {'_id': job_id},
+                {'$set': {'status': 'completed', 'finished_at': datetime.utcnow()}}
+            )
+        except Exception as e:
+            self.collection.update_one(
+                {'_id': job_id},
+                {'$set': {'status': 'failed', 'error': str(e), 'finished_at': datetime.utcnow()}}
+            )
+
+    def get(self, job_id):
+        return self.collection.find_one({'_id': job_id})
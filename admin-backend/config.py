@@ -15,6 +15,9 @@ class Config:
     MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/edunova_database')
     DATABASE_NAME = 'edunova_database'
     
+    # Data backend: 'mongo' (MONGODB_URI) or 'memory' (this process only, see memory_store.py)
+    DATA_BACKEND = os.getenv('DATA_BACKEND', 'mongo')
+    
     # JWT Configuration
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-jwt-secret-key-change-this-in-production')
     JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 24))  # hours
@@ -22,5 +25,66 @@ class Config:
     # Admin Security Configuration
     ADMIN_SECURITY_KEY = os.getenv('ADMIN_SECURITY_KEY', 'ADMIN2025SECURE')
     
+    # Upper bound for ?limit= on paginated list endpoints
+    MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 1000))
+    
+    # Rows validated and written per insert_many during bulk student imports
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 1000))
+    
+    # Documents fetched per getMore while streaming exports
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    
+    # Bulk student actions: ids per update_many, and selection size that switches to a background job
+    BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', 1000))
+    BULK_ASYNC_THRESHOLD = int(os.getenv('BULK_ASYNC_THRESHOLD', 5000))
+    
+    # Principal cache used by token_required (admin documents keyed by id)
+    PRINCIPAL_CACHE_SIZE = int(os.getenv('PRINCIPAL_CACHE_SIZE', 1024))
+    PRINCIPAL_CACHE_TTL = int(os.getenv('PRINCIPAL_CACHE_TTL', 60))  # seconds
+    
+    # Response cache for read endpoints: 'memory' (per-process LRU) or 'shared' (Redis at REDIS_URL)
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 512))
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 300))  # seconds
+    REDIS_URL = os.getenv('REDIS_URL', '')
+    
+    # Seconds a coalesced request waits for the in-flight identical query before running its own
+    SINGLE_FLIGHT_TIMEOUT = int(os.getenv('SINGLE_FLIGHT_TIMEOUT', 10))
+    
+    # How often the dashboard counters document is recomputed from the collections (0 disables)
+    STATS_RECONCILE_INTERVAL = int(os.getenv('STATS_RECONCILE_INTERVAL', 600))  # seconds
+    
+    # Frontend (public/, admin/, shared/) and the fingerprinted, precompressed build served in its place
+    FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    STATIC_BUILD = os.getenv('STATIC_BUILD', 'True').lower() == 'true'  # build at startup when sources change
+    STATIC_BUILD_DIR = os.getenv('STATIC_BUILD_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.build'))
+    
+    # Static files up to STATIC_CACHE_MAX_FILE bytes are served from memory, within STATIC_CACHE_BUDGET bytes in total
+    STATIC_CACHE_BUDGET = int(os.getenv('STATIC_CACHE_BUDGET', 32 * 1024 * 1024))
+    STATIC_CACHE_MAX_FILE = int(os.getenv('STATIC_CACHE_MAX_FILE', 256 * 1024))
+    
+    # Production server (serve.py). WEB_WORKERS=0 sizes the pool from the CPU count
+    WEB_WORKERS = int(os.getenv('WEB_WORKERS', 0))
+    WEB_THREADS = int(os.getenv('WEB_THREADS', 4))
+    WEB_TIMEOUT = int(os.getenv('WEB_TIMEOUT', 60))  # seconds before a stuck worker is restarted
+    WEB_GRACEFUL_TIMEOUT = int(os.getenv('WEB_GRACEFUL_TIMEOUT', 30))  # seconds to finish requests on reload/stop
+    
+    # /metrics: worker processes share their figures through files in METRICS_DIR (serve.py sets one),
+    # each writing at most every METRICS_FLUSH_INTERVAL seconds
+    METRICS_DIR = os.getenv('METRICS_DIR', '')
+    METRICS_FLUSH_INTERVAL = int(os.getenv('METRICS_FLUSH_INTERVAL', 5))  # seconds
+    
+    # MongoDB commands at or over SLOW_QUERY_MS go to the edunova.slow_query log; with SLOW_QUERY_EXPLAIN
+    # slow reads are explained in the background to log the documents they examined
+    SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', 100))
+    SLOW_QUERY_EXPLAIN = os.getenv('SLOW_QUERY_EXPLAIN', 'True').lower() == 'true'
+    QUERY_PROFILER_SHAPES = int(os.getenv('QUERY_PROFILER_SHAPES', 500))  # distinct query shapes tracked
+    
+    # cProfile output for sampled requests (rate set at /api/admin/profiler) or ones sent with X-Profile
+    # and an admin token, kept per endpoint under PROFILE_DIR (default <tmp>/edunova-profiles-<port>)
+    PROFILE_DIR = os.getenv('PROFILE_DIR', '')
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))  # fraction of requests, 0 = off
+    PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', 50))  # newest profiles kept per endpoint
+    
     # CORS Configuration
     CORS_ORIGINS = ['http://localhost:3000', 'http://127.0.0.1:3000', 'http://localhost:5000']
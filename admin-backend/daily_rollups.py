@@ -0,0 +1,166 @@
+import logging
+from datetime import datetime, timedelta
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+# Chart bucket sizes accepted by /api/dashboard/activity, and the most buckets one request may ask for
+BUCKET_UNITS = ('day', 'week', 'month')
+MAX_PERIODS = 366
+
+# DailyRollups.rebuild builds into <collection><REBUILD_SUFFIX>, then renames it over the collection
+REBUILD_SUFFIX = '_rebuild'
+
+
+def day_start(when):
+    return datetime(when.year, when.month, when.day)
+
+
+def bucket_start(when, unit):
+    """Start of the day/week (Monday)/month containing ``when``"""
+    day = day_start(when)
+    if unit == 'week':
+        return day - timedelta(days=day.weekday())
+    if unit == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def shift_bucket(start, unit, count):
+    """Move a bucket start ``count`` buckets forward (negative for back)"""
+    if unit == 'day':
+        return start + timedelta(days=count)
+    if unit == 'week':
+        return start + timedelta(weeks=count)
+    months = start.year * 12 + start.month - 1 + count
+    return start.replace(year=months // 12, month=months % 12 + 1)
+
+
+def bucket_label(start, unit):
+    return start.strftime('%Y-%m') if unit == 'month' else start.strftime('%Y-%m-%d')
+
+
+class DailyRollups:
+    """Per-day enrollment/completion counts in the ``daily_rollups`` collection.
+
+    Each document is keyed by the UTC midnight of its day, so a chart over any
+    range reads one small document per day instead of scanning ``students``.
+    Counts are events: deleting a student later does not remove its enrollment.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def _record(self, field, days):
+        counts = {}
+        for day in days:
+            key = day_start(day)
+            counts[key] = counts.get(key, 0) + 1
+        if not counts:
+            return
+        try:
+            self.collection.bulk_write([
+                UpdateOne({'_id': key}, {'$inc': {field: count}}, upsert=True)
+                for key, count in counts.items()
+            ], ordered=False)
+        except Exception as e:
+            logger.warning('daily rollup update failed, run python daily_rollups.py to repair: %s', e)
+
+    def enrollments(self, students):
+        """Count newly created students on the day of their ``created_at``"""
+        self._record('enrollments', [student['created_at'] for student in students])
+
+    def completions(self, when, count=1):
+        """Count ``count`` students reaching status completed at ``when``"""
+        self._record('completions', [when] * count)
+
+    def backfill(self, students_collection):
+        """Build the rollups from ``students`` if there are none yet; True if it did.
+
+        For every app start (init_db.setup_database): once the collection
+        holds counts the increments keep it current, and ``rebuild`` is the
+        explicit repair (``python daily_rollups.py``).
+        """
+        if self.collection.find_one({}, {'_id': 1}) is not None:
+            return False
+        self.rebuild(students_collection)
+        return True
+
+    def rebuild(self, students_collection):
+        """Rebuild the rollups from ``students`` with $dateTrunc and $merge.
+
+        The counts are built in a separate collection that is then renamed
+        over this one, so the chart reads the old rollups until the new ones
+        are complete. Increments made while the rebuild runs land in the old
+        collection and are replaced by the rebuilt counts, which may or may
+        not include them: run it when few students are being added.
+
+        Completions are dated by ``completed_at``; students completed before
+        that field existed fall back to ``updated_at``.
+        """
+        staging = self.collection.database[f'{self.collection.name}{REBUILD_SUFFIX}']
+        staging.drop()
+        merge = {'$merge': {
+            'into': staging.name,
+            'on': '_id',
+            'whenMatched': 'merge',
+            'whenNotMatched': 'insert'
+        }}
+        students_collection.aggregate([
+            {'$match': {'created_at': {'$type': 'date'}}},
+            {'$group': {
+                '_id': {'$dateTrunc': {'date': '$created_at', 'unit': 'day'}},
+                'enrollments': {'$sum': 1}
+            }},
+            merge
+        ])
+        students_collection.aggregate([
+            {'$match': {'status': 'completed'}},
+            {'$project': {'completed_on': {'$ifNull': ['$completed_at', '$updated_at', '$created_at']}}},
+            {'$match': {'completed_on': {'$type': 'date'}}},
+            {'$group': {
+                '_id': {'$dateTrunc': {'date': '$completed_on', 'unit': 'day'}},
+                'completions': {'$sum': 1}
+            }},
+            merge
+        ])
+        if staging.find_one({}, {'_id': 1}) is None:
+            # No students: $merge created nothing to rename
+            self.collection.delete_many({})
+            return
+        staging.rename(self.collection.name, dropTarget=True)
+
+    def series(self, unit='week', periods=4, now=None):
+        """Enrollments and completions for the last ``periods`` buckets of ``unit``.
+
+        Buckets with no activity are returned as zeros, oldest first.
+        """
+        current = bucket_start(now or datetime.utcnow(), unit)
+        starts = [shift_bucket(current, unit, -offset) for offset in range(periods - 1, -1, -1)]
+        rows = self.collection.aggregate([
+            {'$match': {'_id': {'$gte': starts[0]}}},
+            {'$group': {
+                '_id': {'$dateTrunc': {'date': '$_id', 'unit': unit, 'startOfWeek': 'monday'}},
+                'enrollments': {'$sum': '$enrollments'},
+                'completions': {'$sum': '$completions'}
+            }}
+        ])
+        totals = {row['_id']: row for row in rows}
+        return {
+            'bucket': unit,
+            'labels': [bucket_label(start, unit) for start in starts],
+            'enrollments': [totals.get(start, {}).get('enrollments', 0) for start in starts],
+            'completions': [totals.get(start, {}).get('completions', 0) for start in starts]
+        }
+
+
+if __name__ == '__main__':
+    from pymongo import MongoClient
+    from config import Config
+
+    client = MongoClient(Config.MONGODB_URI)
+    db = client[Config.DATABASE_NAME]
+    DailyRollups(db.daily_rollups).rebuild(db.students)
+    print(f"✅ Daily rollups rebuilt ({db.daily_rollups.count_documents({})} days)")
+    client.close()
@@ -0,0 +1,112 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from bson import ObjectId
+
+from projection import FIELD_WHITELISTS
+
+# Columns written when no ?fields= is given, in output order
+EXPORT_COLUMNS = {
+    'students': ['_id', 'student_id', 'full_name', 'email', 'phone', 'course', 'address',
+                 'date_of_birth', 'enrollment_date', 'status', 'created_at', 'updated_at'],
+    'teachers': ['_id', 'name', 'subject', 'contact', 'email', 'status', 'created_at', 'updated_at'],
+    'courses': ['_id', 'code', 'name', 'description', 'duration', 'fee', 'capacity', 'status',
+                'created_at', 'updated_at']
+}
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
+# Rows serialized per yielded chunk; keeps the number of WSGI writes low
+ROWS_PER_CHUNK = 500
+
+
+def parse_columns(resource, fields):
+    """Validate a comma separated ?fields= value against the resource's whitelist.
+
+    Raises ValueError naming the first unknown column.
+    """
+    allowed = FIELD_WHITELISTS[resource]
+    if not fields:
+        return list(EXPORT_COLUMNS[resource])
+    columns = []
+    for field in fields.split(','):
+        field = field.strip()
+        if not field:
+            continue
+        if field not in allowed:
+            raise ValueError(f'Unknown field: {field}')
+        if field not in columns:
+            columns.append(field)
+    if not columns:
+        raise ValueError('No fields requested')
+    return columns
+
+
+def _plain(value):
+    """Convert BSON values to something csv/json can write"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value):
+    value = _plain(value)
+    if value is None:
+        return ''
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_plain)
+    return value
+
+
+def _csv_chunks(cursor, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    rows = 0
+    for doc in cursor:
+        writer.writerow([_csv_value(doc.get(column)) for column in columns])
+        rows += 1
+        if rows % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(cursor, columns):
+    lines = []
+    for doc in cursor:
+        lines.append(json.dumps({column: doc.get(column) for column in columns}, default=_plain))
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def export_rows(collection, query, sort, columns, fmt, batch_size=1000):
+    """Generator streaming matching documents as CSV or NDJSON text.
+
+    Documents come from a server-side cursor fetched ``batch_size`` at a time
+    and only the requested columns are projected, so memory use does not
+    depend on the size of the collection.
+    """
+    projection = {column: 1 for column in columns}
+    if '_id' not in columns:
+        projection['_id'] = 0
+    cursor = collection.find(query, projection).sort(sort).batch_size(batch_size)
+    try:
+        if fmt == 'csv':
+            yield from _csv_chunks(cursor, columns)
+        else:
+            yield from _ndjson_chunks(cursor, columns)
+    finally:
+        cursor.close()
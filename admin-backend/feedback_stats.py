@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+FEEDBACK_STATUSES = ['pending', 'reviewed', 'resolved', 'archived']
+RATING_VALUES = [1, 2, 3, 4, 5]
+
+
+def feedback_stats_pipeline(since):
+    """One aggregation that computes every /api/admin/feedback/stats figure.
+
+    The collection is read once and the $facet sub-pipelines produce status
+    counts, type breakdown, rating histogram/average and the count of
+    feedback created at or after ``since``.
+    """
+    return [
+        {'$project': {'_id': 0, 'status': 1, 'feedback_type': 1, 'rating': 1, 'created_at': 1}},
+        {'$facet': {
+            'by_status': [
+                {'$group': {'_id': '$status', 'count': {'$sum': 1}}}
+            ],
+            'by_type': [
+                {'$group': {'_id': '$feedback_type', 'count': {'$sum': 1}}},
+                {'$sort': {'count': -1}}
+            ],
+            'by_rating': [
+                {'$group': {'_id': '$rating', 'count': {'$sum': 1}}},
+                {'$sort': {'_id': 1}}
+            ],
+            'rating': [
+                {'$group': {'_id': None, 'avg_rating': {'$avg': '$rating'}}}
+            ],
+            'recent': [
+                {'$match': {'created_at': {'$gte': since}}},
+                {'$count': 'count'}
+            ]
+        }}
+    ]
+
+
+def summarize_feedback_facets(facets):
+    """Turn the $facet output document into the stats response body"""
+    by_status = {row['_id']: row['count'] for row in facets['by_status']}
+    histogram = {str(value): 0 for value in RATING_VALUES}
+    for row in facets['by_rating']:
+        if row['_id'] is not None:
+            histogram[str(row['_id'])] = row['count']
+    avg_rating = facets['rating'][0]['avg_rating'] if facets['rating'] else None
+    recent = facets['recent'][0]['count'] if facets['recent'] else 0
+
+    stats = {'total_feedbacks': sum(by_status.values())}
+    for status in FEEDBACK_STATUSES:
+        stats[f'{status}_feedbacks'] = by_status.get(status, 0)
+    stats.update({
+        'recent_feedbacks': recent,
+        'avg_rating': round(avg_rating, 1) if avg_rating is not None else 0,
+        'rating_histogram': histogram,
+        'feedback_types': facets['by_type']
+    })
+    return stats
+
+
+def compute_feedback_stats(collection, days=7):
+    """Compute feedback statistics in a single round trip"""
+    since = datetime.utcnow() - timedelta(days=days)
+    facets = next(collection.aggregate(feedback_stats_pipeline(since)))
+    return summarize_feedback_facets(facets)
@@ -0,0 +1,74 @@
+import hashlib
+
+from flask import request
+
+# Caching policy per endpoint (blueprint.view_function). Public data may be kept by
+# browsers and shared proxies; admin data is private and revalidated with the
+# ETag on every use (max_age 0 => "no-cache").
+HTTP_CACHE_POLICIES = {
+    # Public site
+    'timetable.get_timetable': {'visibility': 'public', 'max_age': 60, 'stale_while_revalidate': 300},
+    'students.get_public_registration_link': {'visibility': 'public', 'max_age': 60, 'stale_while_revalidate': 300},
+    'courses.public_course_resource': {'visibility': 'public', 'max_age': 300, 'stale_while_revalidate': 600},
+    'feedback.get_feedbacks': {'visibility': 'public', 'max_age': 60, 'stale_while_revalidate': 300},
+    # Admin panel
+    'students.get_students': {'visibility': 'private', 'max_age': 0},
+    'students.get_student': {'visibility': 'private', 'max_age': 0},
+    'courses.get_courses': {'visibility': 'private', 'max_age': 0},
+    'courses.get_course': {'visibility': 'private', 'max_age': 0},
+    'teachers.get_teachers': {'visibility': 'private', 'max_age': 0},
+    'teachers.get_teacher': {'visibility': 'private', 'max_age': 0},
+    'feedback.get_all_feedbacks': {'visibility': 'private', 'max_age': 0},
+    'feedback.get_feedback': {'visibility': 'private', 'max_age': 0},
+    'feedback.get_feedback_stats': {'visibility': 'private', 'max_age': 0},
+    'dashboard.get_dashboard_stats': {'visibility': 'private', 'max_age': 0},
+    'dashboard.get_dashboard_activity': {'visibility': 'private', 'max_age': 0},
+    'system.get_app_settings': {'visibility': 'private', 'max_age': 0},
+    'students.get_registration_link_history': {'visibility': 'private', 'max_age': 0}
+}
+
+
+def content_etag(body):
+    """Strong ETag value for a response body (str or bytes)"""
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def cache_control_header(policy):
+    """Render a policy dict as a Cache-Control header value"""
+    parts = [policy['visibility']]
+    if policy['max_age'] > 0:
+        parts.append(f"max-age={policy['max_age']}")
+    else:
+        parts.append('no-cache')
+    if policy.get('stale_while_revalidate'):
+        parts.append(f"stale-while-revalidate={policy['stale_while_revalidate']}")
+    return ', '.join(parts)
+
+
+def not_modified(etag):
+    """True if the current request's If-None-Match already names ``etag``"""
+    return etag is not None and request.if_none_match.contains(etag)
+
+
+def apply_cache_policy(response, policies=HTTP_CACHE_POLICIES):
+    """after_request hook: add Cache-Control and ETag, and answer If-None-Match.
+
+    Responses that already carry an ETag (restored from the response cache)
+    are not hashed again. Streamed responses and errors are left untouched.
+    """
+    policy = policies.get(request.endpoint)
+    if policy is None or request.method not in ('GET', 'HEAD'):
+        return response
+    if response.status_code not in (200, 304) or response.is_streamed:
+        return response
+
+    response.headers['Cache-Control'] = cache_control_header(policy)
+    if policy['visibility'] == 'private':
+        response.vary.add('Authorization')
+    if response.status_code == 200:
+        if 'ETag' not in response.headers:
+            response.set_etag(content_etag(response.get_data()))
+        response.make_conditional(request)
+    return response
@@ -0,0 +1,99 @@
+"""
+Responsive image variants for the asset build.
+
+Each JPEG/PNG is rendered at the widths in VARIANT_WIDTHS that are smaller
+than the original, in its own format and as WebP (plus a full-size WebP
+when that is smaller than the original). Rendering is CPU-bound, so it
+runs in a process pool. Without Pillow no variants are made and images
+are served as they are.
+"""
+
+import hashlib
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:  # optional: images are served unresized
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Content types that get resized and WebP variants
+RESIZABLE_TYPES = ('image/jpeg', 'image/png')
+
+# Variant widths in pixels; only those smaller than the original are rendered
+VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
+
+SAVE_OPTIONS = {
+    'image/jpeg': ('JPEG', 'jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'image/png': ('PNG', 'png', {'optimize': True}),
+    'image/webp': ('WEBP', 'webp', {'quality': 80, 'method': 6})
+}
+
+
+def _encode(image, content_type):
+    image_format, _, options = SAVE_OPTIONS[content_type]
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def render_variants(source, content_type):
+    """Render the variants of the built image ``source`` next to it.
+
+    Runs in a worker process, so it takes and returns plain data:
+    {'width': original width, 'variants': [{width, content_type, path, size, etag}]},
+    or None if the file is not a readable image.
+    """
+    try:
+        with Image.open(source) as image:
+            image.load()
+            original_size = os.path.getsize(source)
+            width, height = image.size
+            stem = source.rsplit('.', 1)[0]
+            variants = []
+            for target in [w for w in VARIANT_WIDTHS if w < width] + [width]:
+                if target == width:
+                    resized, formats = image, ('image/webp',)
+                else:
+                    resized = image.resize((target, max(1, round(height * target / width))), Image.LANCZOS)
+                    formats = (content_type, 'image/webp')
+                for variant_type in formats:
+                    data = _encode(resized, variant_type)
+                    if target == width and len(data) >= original_size:
+                        continue
+                    path = f'{stem}.{target}w.{SAVE_OPTIONS[variant_type][1]}'
+                    with open(path, 'wb') as f:
+                        f.write(data)
+                    variants.append({
+                        'width': target,
+                        'content_type': variant_type,
+                        'path': path,
+                        'size': len(data),
+                        'etag': hashlib.blake2b(data, digest_size=6).hexdigest()
+                    })
+    except OSError as e:
+        logger.warning('could not render variants of %s: %s', source, e)
+        return None
+    return {'width': width, 'variants': variants}
+
+
+def render_all(jobs, workers=None):
+    """Render every (key, source, content_type) job; return {key: render_variants result}"""
+    if Image is None or not jobs:
+        return {}
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    keys = [key for key, _, _ in jobs]
+    sources = [source for _, source, _ in jobs]
+    content_types = [content_type for _, _, content_type in jobs]
+    if workers == 1:
+        results = list(map(render_variants, sources, content_types))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(render_variants, sources, content_types))
+    return {key: result for key, result in zip(keys, results) if result is not None}
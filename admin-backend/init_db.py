@@ -1,7 +1,39 @@
-from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo import MongoClient, ASCENDING, DESCENDING, TEXT
 from datetime import datetime
 from werkzeug.security import generate_password_hash
 from config import Config
+from student_search import backfill_search_fields
+from stats_counters import StatsCounters
+from daily_rollups import DailyRollups
+
+# Unique indexes the API relies on to reject duplicates on insert
+UNIQUE_INDEXES = {
+    'admins': [[("username", ASCENDING)], [("email", ASCENDING)]],
+    'students': [[("email", ASCENDING)], [("student_id", ASCENDING)]],
+    'courses': [[("code", ASCENDING)]],
+    'teachers': [[("email", ASCENDING)]],
+    'course_resources': [[("subject", ASCENDING), ("grade", ASCENDING)]]
+}
+
+def ensure_unique_indexes(db):
+    """Create every index listed in UNIQUE_INDEXES"""
+    for collection_name, index_list in UNIQUE_INDEXES.items():
+        for keys in index_list:
+            db[collection_name].create_index(keys, unique=True)
+
+def missing_unique_indexes(db):
+    """Return a description of each UNIQUE_INDEXES entry not present on the server"""
+    missing = []
+    for collection_name, index_list in UNIQUE_INDEXES.items():
+        existing = [
+            (info['key'], info.get('unique', False))
+            for info in db[collection_name].index_information().values()
+        ]
+        for keys in index_list:
+            if (keys, True) not in existing:
+                fields = ', '.join(field for field, _ in keys)
+                missing.append(f'{collection_name}({fields})')
+    return missing
 
 def init_database():
     """Initialize the database with collections and indexes"""
@@ -10,6 +42,18 @@ def init_database():
     client = MongoClient(Config.MONGODB_URI)
     db = client[Config.DATABASE_NAME]
     
+    setup_database(db)
+    
+    print("🎉 Database initialization completed!")
+    print(f"📊 Database: {Config.DATABASE_NAME}")
+    print(f"🔗 Connection: {Config.MONGODB_URI}")
+    
+    # Close connection
+    client.close()
+
+def setup_database(db):
+    """Create the indexes and seed data in ``db`` (a MongoDB or in-memory database)"""
+    
     # Collections
     admins_collection = db.admins
     students_collection = db.students
@@ -18,31 +62,42 @@ def init_database():
     timetable_collection = db.timetable_entries
     app_settings_collection = db.app_settings
     teachers_collection = db.teachers
+    feedback_collection = db.feedback
     
     print("🔧 Initializing EduNova Database...")
     
     # Create indexes for better performance
     try:
+        # Unique indexes (duplicate detection for every create endpoint)
+        ensure_unique_indexes(db)
+        
         # Admin indexes
-        admins_collection.create_index([("username", ASCENDING)], unique=True)
-        admins_collection.create_index([("email", ASCENDING)], unique=True)
         admins_collection.create_index([("created_at", DESCENDING)])
         
         # Student indexes
-        students_collection.create_index([("email", ASCENDING)], unique=True)
-        students_collection.create_index([("student_id", ASCENDING)], unique=True)
-        students_collection.create_index([("created_at", DESCENDING)])
+        # Compound (created_at, _id) index serves both the default sort and keyset pagination
+        students_collection.create_index([("created_at", DESCENDING), ("_id", DESCENDING)])
         students_collection.create_index([("status", ASCENDING)])
         students_collection.create_index([("course", ASCENDING)])
         
+        # Student search: normalized prefix fields plus a text index for tokens
+        students_collection.create_index([("student_id_lower", ASCENDING)])
+        students_collection.create_index([("email_lower", ASCENDING)])
+        students_collection.create_index([("full_name_lower", ASCENDING)])
+        students_collection.create_index([("name_tokens", ASCENDING)])
+        students_collection.create_index(
+            [("full_name", TEXT), ("email", TEXT), ("student_id", TEXT)],
+            name="students_text_search",
+            weights={"full_name": 10, "student_id": 5, "email": 5},
+            default_language="none"
+        )
+        
         # Course indexes
-        courses_collection.create_index([("code", ASCENDING)], unique=True)
         courses_collection.create_index([("name", ASCENDING)])
         courses_collection.create_index([("status", ASCENDING)])
         courses_collection.create_index([("created_at", DESCENDING)])
         
         # Course resources indexes
-        course_resources_collection.create_index([("subject", ASCENDING), ("grade", ASCENDING)], unique=True)
         course_resources_collection.create_index([("updated_at", DESCENDING)])
         
         # Timetable indexes
@@ -55,17 +110,25 @@ def init_database():
         app_settings_collection.create_index([("updated_at", DESCENDING)])
         
         # Teacher indexes
-        teachers_collection.create_index([("email", ASCENDING)], unique=True)
         teachers_collection.create_index([("name", ASCENDING)])
         teachers_collection.create_index([("subject", ASCENDING)])
         teachers_collection.create_index([("status", ASCENDING)])
         teachers_collection.create_index([("created_at", DESCENDING)])
         
+        # Feedback indexes
+        feedback_collection.create_index([("status", ASCENDING), ("created_at", DESCENDING)])
+        feedback_collection.create_index([("created_at", DESCENDING)])
+        
         print("✅ Database indexes created successfully")
         
     except Exception as e:
         print(f"⚠️ Warning: Some indexes may already exist: {str(e)}")
     
+    # Fill normalized search fields on students that predate them
+    backfilled = backfill_search_fields(students_collection)
+    if backfilled:
+        print(f"✅ Search fields backfilled for {backfilled} students")
+    
     # Create default admin if no admin exists
     if admins_collection.count_documents({}) == 0:
         default_admin = {
@@ -172,12 +235,15 @@ def init_database():
     else:
         print("ℹ️ Teachers already exist")
     
-    print("🎉 Database initialization completed!")
-    print(f"📊 Database: {Config.DATABASE_NAME}")
-    print(f"🔗 Connection: {Config.MONGODB_URI}")
+    # Rebuild the dashboard counters from the seeded collections
+    StatsCounters(db).reconcile()
+    print("✅ Dashboard counters reconciled")
     
-    # Close connection
-    client.close()
+    # Build the daily enrollment/completion rollups behind the activity chart on first run
+    if DailyRollups(db.daily_rollups).backfill(students_collection):
+        print("✅ Daily rollups built")
+    else:
+        print("ℹ️ Daily rollups already exist (python daily_rollups.py rebuilds them)")
 
 if __name__ == '__main__':
     init_database()
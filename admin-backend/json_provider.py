@@ -0,0 +1,116 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder is used instead
+    orjson = None
+
+
+def encode_bson(value):
+    """Encode the BSON/Python types our documents contain that JSON lacks"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+# Exact types converted without going through encode_bson's isinstance checks
+_CONVERTERS = {ObjectId: str, datetime: datetime.isoformat, date: date.isoformat}
+
+def fast_default(value):
+    """``encode_bson`` with a shortcut for the common exact types"""
+    convert = _CONVERTERS.get(type(value))
+    return convert(value) if convert is not None else encode_bson(value)
+
+
+def _convert_documents(docs):
+    """Convert the top-level ObjectId/datetime/date fields of ``docs`` in place.
+
+    A page of documents from one query has the same fields, so the fields to
+    convert are taken from the first one and only those are looked at in the
+    rest. Anything else (nested values, fields the first document lacked or
+    holds another type in) is left for the encoder's ``default`` hook.
+    """
+    plan = [(key, type(value), _CONVERTERS[type(value)])
+            for key, value in docs[0].items() if type(value) in _CONVERTERS]
+    for key, kind, convert in plan:
+        for doc in docs:
+            value = doc.get(key)
+            if type(value) is kind:
+                doc[key] = convert(value)
+
+
+def convert_documents(obj):
+    """Convert the document lists in ``obj`` (``{'students': [...]}`` or a bare list) in place.
+
+    For the stdlib encoder: converting a page in one pass, as handlers used
+    to, is faster than the encoder calling ``default`` for each ObjectId and
+    datetime. The documents are changed, so this is only for data built for
+    the response, such as the query results handed to jsonify.
+    """
+    if type(obj) is list:
+        lists = [obj]
+    elif type(obj) is dict:
+        lists = [value for value in obj.values() if type(value) is list]
+    else:
+        return obj
+    for docs in lists:
+        if docs and type(docs[0]) is dict:
+            _convert_documents(docs)
+    return obj
+
+
+class EduNovaJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes Mongo documents directly.
+
+    ObjectId, datetime and Decimal128 values are written as strings by the
+    encoder itself, so handlers can return documents as they come from
+    pymongo. orjson is used when installed (it is in requirements.txt);
+    otherwise the stdlib encoder writes the same output, with the pages in
+    a response converted by ``convert_documents`` first.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return self._orjson_dumps(obj).decode('utf-8')
+        kwargs.setdefault('default', fast_default)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = None
+        if self.compact is False or (self.compact is None and self._app.debug):
+            indent = 2
+        if orjson is not None:
+            body = self._orjson_dumps(obj, indent=bool(indent))
+        else:
+            body = json.dumps(convert_documents(obj), default=fast_default, sort_keys=self.sort_keys,
+                              ensure_ascii=self.ensure_ascii, indent=indent,
+                              separators=None if indent else (',', ':'))
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def _orjson_dumps(self, obj, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=encode_bson, option=option)
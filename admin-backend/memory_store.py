@@ -0,0 +1,1312 @@
+import itertools
+import re
+import threading
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.operations import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.results import BulkWriteResult, DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+_MISSING = object()
+
+
+# -- values -----------------------------------------------------------------
+
+def _clone(value):
+    """Copy of a document value; only dicts and lists are mutable in BSON"""
+    if isinstance(value, dict):
+        return {key: _clone(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_clone(item) for item in value]
+    return value
+
+
+def _type_rank(value):
+    """Position of ``value``'s type in MongoDB's cross-type sort order"""
+    if value is None:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, dict):
+        return 4
+    if isinstance(value, list):
+        return 5
+    if isinstance(value, bytes):
+        return 6
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime):
+        return 9
+    return 11
+
+
+def _sort_key(value):
+    rank = _type_rank(value)
+    if rank in (2, 3, 6, 7, 8, 9):
+        return (rank, value)
+    return (rank, 0 if value is None else repr(value))
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _index_value(value):
+    """Hashable key of one value that keeps 1 and True (etc.) apart, as MongoDB does"""
+    return (_type_rank(value), _freeze(value))
+
+
+def _get(doc, path, default=None):
+    """Value at dotted ``path``, or ``default`` when any part is missing"""
+    value = doc
+    for part in path.split('.'):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return default
+    return value
+
+
+def _lookup(doc, path):
+    """All values at dotted ``path``, descending into arrays of subdocuments"""
+    values = [doc]
+    for part in path.split('.'):
+        found = []
+        for value in values:
+            if isinstance(value, dict):
+                if part in value:
+                    found.append(value[part])
+            elif isinstance(value, list):
+                if part.isdigit() and int(part) < len(value):
+                    found.append(value[int(part)])
+                else:
+                    found.extend(item[part] for item in value if isinstance(item, dict) and part in item)
+        values = found
+    return values
+
+
+def _set(doc, path, value):
+    parts = path.split('.')
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+        if not isinstance(doc, dict):
+            raise OperationFailure(f"Cannot create field '{part}' in a non-document value")
+    doc[parts[-1]] = value
+
+
+def _unset(doc, path):
+    parts = path.split('.')
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(parts[-1], None)
+
+
+# -- query matching ---------------------------------------------------------
+
+_REGEX_FLAGS = {'i': re.IGNORECASE, 'm': re.MULTILINE, 's': re.DOTALL, 'x': re.VERBOSE}
+
+_TYPE_NAMES = {
+    'double': (float,), 'string': (str,), 'object': (dict,), 'array': (list,),
+    'objectId': (ObjectId,), 'date': (datetime,), 'null': (type(None),), 'int': (int,), 'long': (int,)
+}
+
+
+def _is_operator_dict(value):
+    return isinstance(value, dict) and bool(value) and all(key.startswith('$') for key in value)
+
+
+def _expand(values):
+    """Each value and, for arrays, each element: a condition on an array field matches any element"""
+    for value in values:
+        yield value
+        if isinstance(value, list):
+            yield from value
+
+
+def _equals(value, expected):
+    if isinstance(expected, re.Pattern):
+        return isinstance(value, str) and expected.search(value) is not None
+    return _type_rank(value) == _type_rank(expected) and value == expected
+
+
+def _match_equal(values, expected):
+    if expected is None and not values:
+        return True
+    return any(_equals(value, expected) for value in _expand(values))
+
+
+def _compare(values, expected, accept):
+    key = _sort_key(expected)
+    return any(_type_rank(value) == key[0] and accept(_sort_key(value), key) for value in _expand(values))
+
+
+def _has_type(value, name):
+    if name == 'number':
+        return _is_number(value)
+    if name == 'bool':
+        return isinstance(value, bool)
+    types = _TYPE_NAMES.get(name)
+    if types is None:
+        raise OperationFailure(f'Unknown type name alias: {name}')
+    return isinstance(value, types) and not isinstance(value, bool)
+
+
+def _match_operators(values, condition):
+    for op, arg in condition.items():
+        if op == '$eq':
+            matched = _match_equal(values, arg)
+        elif op == '$ne':
+            matched = not _match_equal(values, arg)
+        elif op == '$gt':
+            matched = _compare(values, arg, lambda a, b: a > b)
+        elif op == '$gte':
+            matched = _compare(values, arg, lambda a, b: a >= b)
+        elif op == '$lt':
+            matched = _compare(values, arg, lambda a, b: a < b)
+        elif op == '$lte':
+            matched = _compare(values, arg, lambda a, b: a <= b)
+        elif op == '$in':
+            matched = any(_match_equal(values, item) for item in arg)
+        elif op == '$nin':
+            matched = not any(_match_equal(values, item) for item in arg)
+        elif op == '$exists':
+            matched = bool(values) == bool(arg)
+        elif op == '$regex':
+            pattern = arg
+            if not isinstance(pattern, re.Pattern):
+                flags = 0
+                for option in condition.get('$options', ''):
+                    flags |= _REGEX_FLAGS.get(option, 0)
+                pattern = re.compile(pattern, flags)
+            matched = any(isinstance(value, str) and pattern.search(value) for value in _expand(values))
+        elif op == '$options':
+            continue
+        elif op == '$type':
+            names = arg if isinstance(arg, list) else [arg]
+            matched = any(_has_type(value, name) for value in _expand(values) for name in names)
+        elif op == '$not':
+            matched = not _match_operators(values, arg if isinstance(arg, dict) else {'$regex': arg})
+        elif op == '$size':
+            matched = any(isinstance(value, list) and len(value) == arg for value in values)
+        elif op == '$all':
+            matched = all(_match_equal(values, item) for item in arg)
+        else:
+            raise OperationFailure(f'unknown operator: {op}')
+        if not matched:
+            return False
+    return True
+
+
+def matches(doc, query, text_scores=None):
+    """True if ``doc`` satisfies the MongoDB filter ``query``.
+
+    ``text_scores`` maps the _id of every document matching the query's
+    $text clause to its score; it must be given when the query has one.
+    """
+    for key, condition in query.items():
+        if key == '$and':
+            matched = all(matches(doc, clause, text_scores) for clause in condition)
+        elif key == '$or':
+            matched = any(matches(doc, clause, text_scores) for clause in condition)
+        elif key == '$nor':
+            matched = not any(matches(doc, clause, text_scores) for clause in condition)
+        elif key == '$text':
+            if text_scores is None:
+                raise OperationFailure('text index required for $text query')
+            matched = _freeze(doc.get('_id')) in text_scores
+        elif key.startswith('$'):
+            raise OperationFailure(f'unknown top level operator: {key}')
+        elif _is_operator_dict(condition):
+            matched = _match_operators(_lookup(doc, key), condition)
+        else:
+            matched = _match_equal(_lookup(doc, key), condition)
+        if not matched:
+            return False
+    return True
+
+
+def _find_text_clause(query):
+    """The $search string of the $text clause in ``query`` (at any $and/$or depth), or None"""
+    for key, condition in query.items():
+        if key == '$text':
+            return condition['$search']
+        if key in ('$and', '$or', '$nor'):
+            for clause in condition:
+                found = _find_text_clause(clause)
+                if found is not None:
+                    return found
+    return None
+
+
+def _sorted(docs, sort, text_scores=None):
+    """``docs`` ordered by a pymongo-style [(field, direction), ...] spec"""
+    docs = list(docs)
+    for field, direction in reversed(sort):
+        if isinstance(direction, dict):
+            # {'$meta': 'textScore'}: best match first
+            docs.sort(key=lambda doc: text_scores.get(_freeze(doc['_id']), 0), reverse=True)
+        else:
+            docs.sort(key=lambda doc: _sort_key(_get(doc, field)), reverse=direction < 0)
+    return docs
+
+
+def _project(doc, projection, score=None):
+    """A copy of ``doc`` reduced to ``projection`` (inclusion or exclusion, top-level fields)"""
+    if not projection:
+        return _clone(doc)
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+    meta = [field for field, value in projection.items() if isinstance(value, dict)]
+    fields = {field: value for field, value in projection.items() if not isinstance(value, dict)}
+    include_id = bool(fields.pop('_id', True))
+    if any(fields.values()):
+        wanted = {field.split('.')[0] for field, value in fields.items() if value}
+        result = {key: _clone(value) for key, value in doc.items()
+                  if key in wanted or (key == '_id' and include_id)}
+    else:
+        result = {key: _clone(value) for key, value in doc.items()
+                  if key not in fields and (key != '_id' or include_id)}
+    for field in meta:
+        result[field] = score
+    return result
+
+
+# -- updates ----------------------------------------------------------------
+
+def _each(value):
+    return value['$each'] if isinstance(value, dict) and '$each' in value else [value]
+
+
+def _apply_update(doc, update, inserting=False):
+    """Apply the update operators in ``update`` to ``doc`` in place"""
+    if not update or not all(key.startswith('$') for key in update):
+        raise ValueError('update only works with $ operators')
+    for op, fields in update.items():
+        for path, value in fields.items():
+            if op == '$set' or (op == '$setOnInsert' and inserting):
+                _set(doc, path, _clone(value))
+            elif op == '$setOnInsert':
+                continue
+            elif op == '$unset':
+                _unset(doc, path)
+            elif op == '$inc':
+                current = _get(doc, path, 0)
+                if not _is_number(current) or not _is_number(value):
+                    raise OperationFailure(f"Cannot apply $inc to a value of non-numeric type at '{path}'")
+                _set(doc, path, current + value)
+            elif op in ('$min', '$max'):
+                current = _get(doc, path, _MISSING)
+                if current is _MISSING or (_sort_key(value) < _sort_key(current)) == (op == '$min'):
+                    _set(doc, path, _clone(value))
+            elif op in ('$push', '$addToSet'):
+                current = _get(doc, path, _MISSING)
+                if current is _MISSING:
+                    current = []
+                    _set(doc, path, current)
+                elif not isinstance(current, list):
+                    raise OperationFailure(f"The field '{path}' must be an array")
+                for item in _each(value):
+                    if op == '$push' or item not in current:
+                        current.append(_clone(item))
+            elif op == '$pull':
+                current = _get(doc, path)
+                if isinstance(current, list):
+                    current[:] = [item for item in current if not (
+                        matches({'v': item}, {'v': value}) if _is_operator_dict(value) else item == value)]
+            else:
+                raise OperationFailure(f'Unknown modifier: {op}')
+
+
+def _upsert_seed(query):
+    """The document an upsert starts from: the equality fields of its filter"""
+    doc = {}
+    for key, condition in query.items():
+        if key == '$and':
+            for clause in condition:
+                doc.update(_upsert_seed(clause))
+        elif key.startswith('$'):
+            continue
+        elif _is_operator_dict(condition):
+            if '$eq' in condition:
+                _set(doc, key, _clone(condition['$eq']))
+        else:
+            _set(doc, key, _clone(condition))
+    return doc
+
+
+# -- aggregation expressions --------------------------------------------------
+
+_WEEKDAYS = {name: index for index, name in enumerate(
+    ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'))}
+_WEEKDAYS.update({name[:3]: index for name, index in list(_WEEKDAYS.items())})
+
+
+def _date_trunc(date, unit, start_of_week='sunday'):
+    if unit == 'year':
+        return datetime(date.year, 1, 1)
+    if unit == 'quarter':
+        return datetime(date.year, (date.month - 1) // 3 * 3 + 1, 1)
+    if unit == 'month':
+        return datetime(date.year, date.month, 1)
+    day = datetime(date.year, date.month, date.day)
+    if unit == 'week':
+        return day - timedelta(days=(day.weekday() - _WEEKDAYS[start_of_week.lower()]) % 7)
+    if unit == 'day':
+        return day
+    if unit == 'hour':
+        return date.replace(minute=0, second=0, microsecond=0)
+    if unit == 'minute':
+        return date.replace(second=0, microsecond=0)
+    if unit == 'second':
+        return date.replace(microsecond=0)
+    raise OperationFailure(f'$dateTrunc: unknown unit {unit!r}')
+
+
+def _date_to_string(date, fmt='%Y-%m-%dT%H:%M:%S.%LZ'):
+    fmt = fmt.replace('%L', f'{date.microsecond // 1000:03d}')
+    return date.strftime(fmt)
+
+
+def _evaluate(expr, doc):
+    """Value of an aggregation expression (field path, literal or operator) for ``doc``"""
+    if isinstance(expr, str) and expr.startswith('$'):
+        if expr == '$$ROOT':
+            return doc
+        return _get(doc, expr[1:])
+    if isinstance(expr, list):
+        return [_evaluate(item, doc) for item in expr]
+    if not isinstance(expr, dict):
+        return expr
+    if len(expr) != 1 or not next(iter(expr)).startswith('$'):
+        return {key: _evaluate(value, doc) for key, value in expr.items()}
+
+    op, arg = next(iter(expr.items()))
+    if op == '$literal':
+        return arg
+    if op == '$ifNull':
+        for item in arg:
+            value = _evaluate(item, doc)
+            if value is not None:
+                return value
+        return None
+    if op == '$cond':
+        if isinstance(arg, list):
+            arg = dict(zip(('if', 'then', 'else'), arg))
+        return _evaluate(arg['then'] if _evaluate(arg['if'], doc) else arg['else'], doc)
+    if op == '$dateTrunc':
+        date = _evaluate(arg['date'], doc)
+        if date is None:
+            return None
+        if arg.get('binSize', 1) != 1:
+            raise OperationFailure('$dateTrunc: only binSize 1 is supported by the memory backend')
+        return _date_trunc(date, _evaluate(arg['unit'], doc), arg.get('startOfWeek', 'sunday'))
+    if op == '$dateToString':
+        date = _evaluate(arg['date'], doc)
+        return None if date is None else _date_to_string(date, arg.get('format', '%Y-%m-%dT%H:%M:%S.%LZ'))
+
+    values = _evaluate(arg, doc)
+    if op in ('$add', '$multiply', '$concat', '$and', '$or'):
+        if op == '$and':
+            return all(values)
+        if op == '$or':
+            return any(values)
+        if any(value is None for value in values):
+            return None
+        if op == '$concat':
+            return ''.join(values)
+        if op == '$multiply':
+            result = 1
+            for value in values:
+                result *= value
+            return result
+        dates = [value for value in values if isinstance(value, datetime)]
+        total = sum(value for value in values if not isinstance(value, datetime))
+        return dates[0] + timedelta(milliseconds=total) if dates else total
+    if op in ('$subtract', '$divide'):
+        left, right = values
+        if left is None or right is None:
+            return None
+        if op == '$divide':
+            return left / right
+        if isinstance(left, datetime) and isinstance(right, datetime):
+            return int((left - right).total_seconds() * 1000)
+        if isinstance(left, datetime):
+            return left - timedelta(milliseconds=right)
+        return left - right
+    if op in ('$eq', '$ne', '$gt', '$gte', '$lt', '$lte'):
+        left, right = (_sort_key(value) for value in values)
+        return {'$eq': left == right, '$ne': left != right, '$gt': left > right,
+                '$gte': left >= right, '$lt': left < right, '$lte': left <= right}[op]
+    if op == '$not':
+        return not (values[0] if isinstance(values, list) else values)
+    if op == '$size':
+        return len(values)
+    if op == '$toLower':
+        return '' if values is None else str(values).lower()
+    if op == '$toUpper':
+        return '' if values is None else str(values).upper()
+    if op == '$toString':
+        return None if values is None else str(values)
+    raise OperationFailure(f"Unrecognized expression '{op}'")
+
+
+class _Accumulator:
+    """State of one $group accumulator for one group"""
+
+    def __init__(self, op, expr):
+        self.op = op
+        self.expr = expr
+        self.values = []
+
+    def add(self, doc):
+        self.values.append(_evaluate(self.expr, doc))
+
+    def result(self):
+        values = self.values
+        numbers = [value for value in values if _is_number(value)]
+        if self.op == '$sum':
+            return sum(numbers)
+        if self.op == '$avg':
+            return sum(numbers) / len(numbers) if numbers else None
+        if self.op == '$count':
+            return len(values)
+        present = [value for value in values if value is not None]
+        if self.op == '$min':
+            return min(present, key=_sort_key) if present else None
+        if self.op == '$max':
+            return max(present, key=_sort_key) if present else None
+        if self.op == '$first':
+            return values[0] if values else None
+        if self.op == '$last':
+            return values[-1] if values else None
+        if self.op == '$push':
+            return values
+        if self.op == '$addToSet':
+            unique = {}
+            for value in values:
+                unique.setdefault(_index_value(value), value)
+            return list(unique.values())
+        raise OperationFailure(f"unknown group operator '{self.op}'")
+
+
+def _group(docs, spec):
+    groups = {}
+    for doc in docs:
+        key = _evaluate(spec['_id'], doc)
+        group = groups.get(_index_value(key))
+        if group is None:
+            group = groups[_index_value(key)] = (key, {
+                field: _Accumulator(*next(iter(accumulator.items())))
+                for field, accumulator in spec.items() if field != '_id'
+            })
+        for accumulator in group[1].values():
+            accumulator.add(doc)
+    return [dict({'_id': key}, **{field: acc.result() for field, acc in accumulators.items()})
+            for key, accumulators in groups.values()]
+
+
+def _project_stage(doc, spec):
+    """$project: 1/0 keep or drop a field, any other value is an expression computing it"""
+    flags = {field: value for field, value in spec.items() if isinstance(value, (bool, int))}
+    computed = {field: expr for field, expr in spec.items() if field not in flags}
+    if not computed and not any(value for field, value in flags.items() if field != '_id'):
+        return _project(doc, flags)
+    keep = {field.split('.')[0] for field, value in flags.items() if value}
+    result = {key: _clone(value) for key, value in doc.items()
+              if key in keep or (key == '_id' and spec.get('_id', 1))}
+    for field, expr in computed.items():
+        _set(result, field, _evaluate(expr, doc))
+    return result
+
+
+def _unwind(docs, spec):
+    if isinstance(spec, str):
+        spec = {'path': spec}
+    path = spec['path'][1:]
+    keep_empty = spec.get('preserveNullAndEmptyArrays', False)
+    for doc in docs:
+        value = _get(doc, path)
+        if isinstance(value, list) and value:
+            for item in value:
+                unwound = dict(doc)
+                _set(unwound, path, item)
+                yield unwound
+        elif keep_empty or (value is not None and not isinstance(value, list)):
+            yield doc
+
+
+# -- collections --------------------------------------------------------------
+
+class _Index:
+    """A secondary index: index key -> set of _ids, plus the same by leading field only"""
+
+    def __init__(self, name, keys, unique=False):
+        self.name = name
+        self.keys = keys
+        self.fields = [field for field, _ in keys]
+        self.unique = unique
+        self.entries = {}
+        self.prefix = {}
+
+    def keys_of(self, doc):
+        per_field = []
+        for field in self.fields:
+            value = _get(doc, field)
+            # Multikey: an array field is indexed under each of its elements
+            values = value if isinstance(value, list) and value else [value]
+            per_field.append([_index_value(item) for item in values])
+        return set(itertools.product(*per_field))
+
+    def add(self, doc):
+        for key in self.keys_of(doc):
+            self.entries.setdefault(key, set()).add(_freeze(doc['_id']))
+            self.prefix.setdefault(key[0], set()).add(_freeze(doc['_id']))
+
+    def remove(self, doc):
+        for key in self.keys_of(doc):
+            for table, entry in ((self.entries, key), (self.prefix, key[0])):
+                ids = table.get(entry)
+                if ids is not None:
+                    ids.discard(_freeze(doc['_id']))
+                    if not ids:
+                        del table[entry]
+
+    def info(self):
+        info = {'v': 2, 'key': list(self.keys)}
+        if self.unique:
+            info['unique'] = True
+        return info
+
+
+class _TextIndex:
+    """Inverted index over the words of the text-indexed fields: word -> set of _ids"""
+
+    def __init__(self, name, fields, weights):
+        self.name = name
+        self.fields = fields
+        self.weights = {field: weights.get(field, 1) for field in fields}
+        self.unique = False
+        self.postings = {}
+
+    def words_of(self, doc):
+        words = {}
+        for field in self.fields:
+            value = _get(doc, field)
+            for text in (value if isinstance(value, list) else [value]):
+                if isinstance(text, str):
+                    for word in re.findall(r'\w+', text.lower()):
+                        words.setdefault(word, []).append(field)
+        return words
+
+    def add(self, doc):
+        for word in self.words_of(doc):
+            self.postings.setdefault(word, set()).add(_freeze(doc['_id']))
+
+    def remove(self, doc):
+        for word in self.words_of(doc):
+            ids = self.postings.get(word)
+            if ids is not None:
+                ids.discard(_freeze(doc['_id']))
+                if not ids:
+                    del self.postings[word]
+
+    def texts_of(self, doc):
+        texts = []
+        for field in self.fields:
+            value = _get(doc, field)
+            texts.extend(text.lower() for text in (value if isinstance(value, list) else [value])
+                         if isinstance(text, str))
+        return texts
+
+    def search(self, docs, terms):
+        """{document key: score} of the documents containing any of ``terms``, weighted per field.
+
+        As in MongoDB, a quoted "phrase" is required: with phrases, only
+        documents containing every one of them match.
+        """
+        phrases = [phrase.lower() for phrase in re.findall(r'"([^"]*)"', terms) if phrase.strip()]
+        terms = set(re.findall(r'\w+', terms.lower()))
+        ids = set()
+        for term in terms:
+            ids |= self.postings.get(term, set())
+        if phrases:
+            ids = {key for key in ids
+                   if all(any(phrase in text for text in self.texts_of(docs[key])) for phrase in phrases)}
+        scores = {}
+        for key in ids:
+            words = self.words_of(docs[key])
+            scores[key] = sum(self.weights[field] for term in terms for field in words.get(term, ()))
+        return scores
+
+    def info(self):
+        return {'v': 2, 'key': [('_fts', 'text'), ('_ftsx', 1)], 'weights': dict(self.weights)}
+
+
+def _index_keys(keys):
+    if isinstance(keys, str):
+        return [(keys, 1)]
+    return [(key, 1) if isinstance(key, str) else tuple(key) for key in keys]
+
+
+def _write_error(index, error, op):
+    details = dict(error.details or {}, index=index, op=op)
+    details.setdefault('code', error.code)
+    details.setdefault('errmsg', str(error))
+    return details
+
+
+def _bulk_result(n_inserted=0, n_matched=0, n_modified=0, n_removed=0, upserted=()):
+    return {
+        'writeErrors': [], 'writeConcernErrors': [], 'nInserted': n_inserted, 'nUpserted': len(upserted),
+        'nMatched': n_matched, 'nModified': n_modified, 'nRemoved': n_removed, 'upserted': list(upserted)
+    }
+
+
+class MemoryCursor:
+    """The part of pymongo's Cursor the app uses; runs its query on first iteration"""
+
+    def __init__(self, collection, query, projection=None, sort=None, skip=0, limit=0):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort = sort
+        self._skip = skip
+        self._limit = limit
+        self._results = None
+
+    def sort(self, key_or_list, direction=None):
+        if isinstance(key_or_list, str):
+            self._sort = [(key_or_list, 1 if direction is None else direction)]
+        else:
+            self._sort = list(key_or_list)
+        return self
+
+    def skip(self, skip):
+        self._skip = skip
+        return self
+
+    def limit(self, limit):
+        self._limit = limit
+        return self
+
+    def batch_size(self, batch_size):
+        return self
+
+    def close(self):
+        self._results = iter(())
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._results is None:
+            self._results = iter(self._collection._find(
+                self._query, self._projection, self._sort, self._skip, self._limit))
+        return next(self._results)
+
+
+class MemoryCollection:
+    """An indexed, in-process stand-in for a pymongo Collection.
+
+    Documents live in a dict keyed by _id. Secondary indexes created with
+    ``create_index`` are hash tables from index key to _ids: an equality or
+    $in condition on an index's leading field (or on _id) reads only those
+    documents, everything else is a scan of the dict. Unique indexes reject
+    duplicates with the same DuplicateKeyError/BulkWriteError the server
+    raises, and a text index backs $text queries and textScore sorting.
+    Every operation holds the collection's lock, and documents go in and
+    out as copies, so callers never share state with the store.
+    """
+
+    def __init__(self, database, name):
+        self.database = database
+        self.name = name
+        self.full_name = f'{database.name}.{name}'
+        self._lock = threading.RLock()
+        self._docs = {}
+        self._order = {}
+        self._sequence = itertools.count()
+        self._indexes = {}
+        self._text_index = None
+
+    # -- storage -------------------------------------------------------------
+
+    def _duplicate(self, index, doc):
+        fields = index.fields if index is not None else ['_id']
+        key_value = {field: _get(doc, field) for field in fields}
+        name = index.name if index is not None else '_id_'
+        message = (f'E11000 duplicate key error collection: {self.full_name} '
+                   f'index: {name} dup key: {key_value!r}')
+        return DuplicateKeyError(message, 11000, {
+            'code': 11000, 'errmsg': message,
+            'keyPattern': {field: 1 for field in fields}, 'keyValue': key_value
+        })
+
+    def _check_unique(self, doc, indexes=None):
+        for index in indexes or self._indexes.values():
+            if index.unique:
+                for key in index.keys_of(doc):
+                    if index.entries.get(key, set()) - {_freeze(doc['_id'])}:
+                        raise self._duplicate(index, doc)
+
+    def _all_indexes(self):
+        indexes = list(self._indexes.values())
+        if self._text_index is not None:
+            indexes.append(self._text_index)
+        return indexes
+
+    def _insert(self, doc):
+        if '_id' not in doc:
+            doc['_id'] = ObjectId()
+        stored = _clone(doc)
+        if _freeze(stored['_id']) in self._order:
+            raise self._duplicate(None, stored)
+        self._check_unique(stored)
+        self._docs[_freeze(stored['_id'])] = stored
+        self._order[_freeze(stored['_id'])] = next(self._sequence)
+        for index in self._all_indexes():
+            index.add(stored)
+        return stored['_id']
+
+    def _replace(self, old, new):
+        if new['_id'] != old['_id']:
+            raise OperationFailure("Performing an update on the path '_id' would modify the immutable field '_id'")
+        if new == old:
+            return False
+        self._check_unique(new)
+        for index in self._all_indexes():
+            index.remove(old)
+            index.add(new)
+        self._docs[_freeze(new['_id'])] = new
+        return True
+
+    def _remove(self, doc):
+        for index in self._all_indexes():
+            index.remove(doc)
+        del self._docs[_freeze(doc['_id'])]
+        del self._order[_freeze(doc['_id'])]
+
+    # -- reads ---------------------------------------------------------------
+
+    def _equality_values(self, condition):
+        if _is_operator_dict(condition):
+            if '$eq' in condition:
+                return [condition['$eq']]
+            if '$in' in condition and not any(isinstance(item, re.Pattern) for item in condition['$in']):
+                return list(condition['$in'])
+            return None
+        if isinstance(condition, (dict, list, re.Pattern)):
+            return None
+        return [condition]
+
+    def _candidates(self, query, text_scores):
+        """Keys of the documents that can match ``query`` per the indexes, or None to scan"""
+        best = None
+        for field, condition in query.items():
+            ids = None
+            if field == '$and':
+                for clause in condition:
+                    found = self._candidates(clause, text_scores)
+                    if found is not None and (ids is None or len(found) < len(ids)):
+                        ids = found
+            elif field == '$or':
+                parts = [self._candidates(clause, text_scores) for clause in condition]
+                if parts and all(part is not None for part in parts):
+                    ids = set().union(*parts)
+            elif field == '$text':
+                ids = set(text_scores)
+            elif not field.startswith('$'):
+                values = self._equality_values(condition)
+                if values is not None:
+                    ids = self._lookup_ids(field, values)
+            if ids is not None and (best is None or len(ids) < len(best)):
+                best = ids
+        return best
+
+    def _lookup_ids(self, field, values):
+        if field == '_id':
+            return {_freeze(value) for value in values} & self._docs.keys()
+        for index in self._indexes.values():
+            if index.fields[0] == field:
+                ids = set()
+                for value in values:
+                    ids |= index.prefix.get(_index_value(value), set())
+                return ids
+        return None
+
+    def _text_scores(self, query):
+        terms = _find_text_clause(query)
+        if terms is None:
+            return None
+        if self._text_index is None:
+            raise OperationFailure('text index required for $text query')
+        return self._text_index.search(self._docs, terms)
+
+    def _matching(self, query):
+        """Stored documents matching ``query`` in insertion order, and the $text scores"""
+        query = query or {}
+        text_scores = self._text_scores(query)
+        keys = self._candidates(query, text_scores)
+        if keys is None:
+            pool = self._docs.values()
+        else:
+            pool = [self._docs[key] for key in sorted(keys, key=self._order.__getitem__)]
+        return [doc for doc in pool if matches(doc, query, text_scores)], text_scores or {}
+
+    def _find(self, query, projection=None, sort=None, skip=0, limit=0):
+        with self._lock:
+            docs, text_scores = self._matching(query)
+            if sort:
+                docs = _sorted(docs, sort, text_scores)
+            if skip:
+                docs = docs[skip:]
+            if limit:
+                docs = docs[:abs(limit)]
+            return [_project(doc, projection, text_scores.get(_freeze(doc['_id']))) for doc in docs]
+
+    def _first(self, query, sort=None):
+        docs, text_scores = self._matching(query)
+        if sort:
+            docs = _sorted(docs, sort, text_scores)
+        return docs[0] if docs else None
+
+    @staticmethod
+    def _filter(query):
+        if query is None:
+            return {}
+        return query if isinstance(query, dict) else {'_id': query}
+
+    def find(self, filter=None, projection=None, skip=0, limit=0, sort=None, **kwargs):
+        cursor = MemoryCursor(self, self._filter(filter), projection, skip=skip, limit=limit)
+        if sort:
+            cursor.sort(sort)
+        return cursor
+
+    def find_one(self, filter=None, projection=None, *args, **kwargs):
+        for doc in self.find(filter, projection, *args, **kwargs).limit(1):
+            return doc
+        return None
+
+    def count_documents(self, filter, skip=0, limit=0, **kwargs):
+        with self._lock:
+            count = len(self._matching(filter)[0]) - skip
+        count = max(count, 0)
+        return min(count, limit) if limit else count
+
+    def estimated_document_count(self, **kwargs):
+        return len(self._docs)
+
+    def distinct(self, key, filter=None, **kwargs):
+        with self._lock:
+            values = {}
+            for doc in self._matching(self._filter(filter))[0]:
+                for value in _expand(_lookup(doc, key)):
+                    if not isinstance(value, list):
+                        values.setdefault(_index_value(value), _clone(value))
+            return list(values.values())
+
+    # -- writes --------------------------------------------------------------
+
+    def insert_one(self, document, **kwargs):
+        with self._lock:
+            return InsertOneResult(self._insert(document), True)
+
+    def insert_many(self, documents, ordered=True, **kwargs):
+        inserted = []
+        errors = []
+        with self._lock:
+            for index, document in enumerate(documents):
+                try:
+                    inserted.append(self._insert(document))
+                except DuplicateKeyError as e:
+                    errors.append(_write_error(index, e, document))
+                    if ordered:
+                        break
+        if errors:
+            result = _bulk_result(n_inserted=len(inserted))
+            result['writeErrors'] = errors
+            raise BulkWriteError(result)
+        return InsertManyResult(inserted, True)
+
+    def _update(self, query, update, upsert=False, multi=False, replacement=False):
+        """Apply ``update`` to the first (or every) match; returns (matched, modified, upserted_id)"""
+        query = self._filter(query)
+        if replacement and any(key.startswith('$') for key in update):
+            raise ValueError('replacement can not include $ operators')
+        docs = self._matching(query)[0]
+        if not multi:
+            docs = docs[:1]
+        modified = 0
+        for doc in docs:
+            if replacement:
+                new = _clone(update)
+                new.setdefault('_id', doc['_id'])
+            else:
+                new = _clone(doc)
+                _apply_update(new, update)
+            modified += self._replace(doc, new)
+        if docs or not upsert:
+            return len(docs), modified, None
+        new = _upsert_seed(query)
+        if replacement:
+            new.update(_clone(update))
+        else:
+            _apply_update(new, update, inserting=True)
+        return 0, 0, self._insert(new)
+
+    def update_one(self, filter, update, upsert=False, **kwargs):
+        with self._lock:
+            matched, modified, upserted_id = self._update(filter, update, upsert)
+        raw = {'n': matched or int(upserted_id is not None), 'nModified': modified}
+        if upserted_id is not None:
+            raw['upserted'] = upserted_id
+        return UpdateResult(raw, True)
+
+    def update_many(self, filter, update, upsert=False, **kwargs):
+        with self._lock:
+            matched, modified, upserted_id = self._update(filter, update, upsert, multi=True)
+        raw = {'n': matched or int(upserted_id is not None), 'nModified': modified}
+        if upserted_id is not None:
+            raw['upserted'] = upserted_id
+        return UpdateResult(raw, True)
+
+    def replace_one(self, filter, replacement, upsert=False, **kwargs):
+        with self._lock:
+            matched, modified, upserted_id = self._update(filter, replacement, upsert, replacement=True)
+        raw = {'n': matched or int(upserted_id is not None), 'nModified': modified}
+        if upserted_id is not None:
+            raw['upserted'] = upserted_id
+        return UpdateResult(raw, True)
+
+    def _delete(self, query, multi):
+        docs = self._matching(self._filter(query))[0]
+        if not multi:
+            docs = docs[:1]
+        for doc in docs:
+            self._remove(doc)
+        return len(docs)
+
+    def delete_one(self, filter, **kwargs):
+        with self._lock:
+            return DeleteResult({'n': self._delete(filter, multi=False)}, True)
+
+    def delete_many(self, filter, **kwargs):
+        with self._lock:
+            return DeleteResult({'n': self._delete(filter, multi=True)}, True)
+
+    def find_one_and_update(self, filter, update, projection=None, sort=None, upsert=False,
+                            return_document=False, **kwargs):
+        query = self._filter(filter)
+        with self._lock:
+            doc = self._first(query, sort)
+            if doc is None:
+                if not upsert:
+                    return None
+                _, _, upserted_id = self._update(query, update, upsert=True)
+                return _project(self._docs[_freeze(upserted_id)], projection) if return_document else None
+            new = _clone(doc)
+            _apply_update(new, update)
+            self._replace(doc, new)
+            return _project(new if return_document else doc, projection)
+
+    def find_one_and_delete(self, filter, projection=None, sort=None, **kwargs):
+        with self._lock:
+            doc = self._first(self._filter(filter), sort)
+            if doc is None:
+                return None
+            self._remove(doc)
+            return _project(doc, projection)
+
+    def bulk_write(self, requests, ordered=True, **kwargs):
+        counts = {'n_inserted': 0, 'n_matched': 0, 'n_modified': 0, 'n_removed': 0}
+        upserted = []
+        errors = []
+        with self._lock:
+            for index, request in enumerate(requests):
+                try:
+                    if isinstance(request, InsertOne):
+                        self._insert(request._doc)
+                        counts['n_inserted'] += 1
+                    elif isinstance(request, (UpdateOne, UpdateMany, ReplaceOne)):
+                        matched, modified, upserted_id = self._update(
+                            request._filter, request._doc, request._upsert,
+                            multi=isinstance(request, UpdateMany), replacement=isinstance(request, ReplaceOne))
+                        counts['n_matched'] += matched
+                        counts['n_modified'] += modified
+                        if upserted_id is not None:
+                            upserted.append({'index': index, '_id': upserted_id})
+                    elif isinstance(request, (DeleteOne, DeleteMany)):
+                        counts['n_removed'] += self._delete(request._filter, isinstance(request, DeleteMany))
+                    else:
+                        raise TypeError(f'{request!r} is not a valid request')
+                except DuplicateKeyError as e:
+                    errors.append(_write_error(index, e, getattr(request, '_doc', None)))
+                    if ordered:
+                        break
+        result = _bulk_result(upserted=upserted, **counts)
+        if errors:
+            result['writeErrors'] = errors
+            raise BulkWriteError(result)
+        return BulkWriteResult(result, True)
+
+    # -- indexes -------------------------------------------------------------
+
+    def create_index(self, keys, unique=False, name=None, weights=None, **kwargs):
+        keys = _index_keys(keys)
+        text_fields = [field for field, kind in keys if kind == 'text']
+        name = name or '_'.join(f'{field}_{kind}' for field, kind in keys)
+        with self._lock:
+            if text_fields:
+                if self._text_index is not None:
+                    if self._text_index.name == name:
+                        return name
+                    raise OperationFailure('only one text index per collection allowed', 85)
+                index = _TextIndex(name, text_fields, weights or {})
+            else:
+                if name in self._indexes:
+                    return name
+                index = _Index(name, keys, unique)
+                for doc in self._docs.values():
+                    self._check_unique(doc, [index])
+                    index.add(doc)
+                self._indexes[name] = index
+                return name
+            for doc in self._docs.values():
+                index.add(doc)
+            self._text_index = index
+        return name
+
+    def create_indexes(self, indexes, **kwargs):
+        return [self.create_index(model.document['key'].items(), **{
+            key: value for key, value in model.document.items() if key != 'key'}) for model in indexes]
+
+    def drop_index(self, index_or_name):
+        with self._lock:
+            if self._text_index is not None and self._text_index.name == index_or_name:
+                self._text_index = None
+            elif self._indexes.pop(index_or_name, None) is None:
+                raise OperationFailure(f'index not found with name [{index_or_name}]', 27)
+
+    def drop_indexes(self, **kwargs):
+        with self._lock:
+            self._indexes = {}
+            self._text_index = None
+
+    def index_information(self):
+        with self._lock:
+            info = {'_id_': {'v': 2, 'key': [('_id', 1)]}}
+            for index in self._all_indexes():
+                info[index.name] = index.info()
+            return info
+
+    def drop(self, **kwargs):
+        with self._lock:
+            self._docs = {}
+            self._order = {}
+            self._indexes = {}
+            self._text_index = None
+
+    def rename(self, new_name, dropTarget=False, **kwargs):
+        """Move the documents and indexes to collection ``new_name``, replacing it if ``dropTarget``"""
+        target = self.database[new_name]
+        if target is self:
+            raise OperationFailure("Can't rename a collection to itself", 20)
+        with self._lock, target._lock:
+            if not dropTarget and (target._docs or target._indexes or target._text_index):
+                raise OperationFailure('target namespace exists', 48)
+            # The target object keeps its identity: services hold collections by reference
+            target._docs, target._order, target._sequence = self._docs, self._order, self._sequence
+            target._indexes, target._text_index = self._indexes, self._text_index
+            self._docs, self._order, self._sequence = {}, {}, itertools.count()
+            self._indexes, self._text_index = {}, None
+        self.database.drop_collection(self.name)
+
+    # -- aggregation ---------------------------------------------------------
+
+    def aggregate(self, pipeline, **kwargs):
+        """Run ``pipeline`` over copies of the documents; a leading $match uses the indexes"""
+        pipeline = list(pipeline)
+        query = pipeline.pop(0)['$match'] if pipeline and '$match' in pipeline[0] else {}
+        docs = self._find(query)
+        return iter(self._run_pipeline(docs, pipeline))
+
+    def _run_pipeline(self, docs, pipeline):
+        for stage in pipeline:
+            (name, spec), = stage.items()
+            if name == '$match':
+                docs = [doc for doc in docs if matches(doc, spec)]
+            elif name == '$project':
+                docs = [_project_stage(doc, spec) for doc in docs]
+            elif name in ('$addFields', '$set'):
+                docs = [self._add_fields(doc, spec) for doc in docs]
+            elif name == '$unset':
+                docs = [_project(doc, {field: 0 for field in ([spec] if isinstance(spec, str) else spec)})
+                        for doc in docs]
+            elif name == '$group':
+                docs = _group(docs, spec)
+            elif name == '$sort':
+                docs = _sorted(docs, list(spec.items()))
+            elif name == '$skip':
+                docs = docs[spec:]
+            elif name == '$limit':
+                docs = docs[:spec]
+            elif name == '$count':
+                docs = [{spec: len(docs)}] if docs else []
+            elif name == '$unwind':
+                docs = list(_unwind(docs, spec))
+            elif name == '$facet':
+                docs = [{field: self._run_pipeline(list(docs), sub) for field, sub in spec.items()}]
+            elif name == '$merge':
+                self._merge(docs, spec)
+                docs = []
+            elif name == '$out':
+                target = self.database[spec]
+                target.delete_many({})
+                if docs:
+                    target.insert_many(docs)
+                docs = []
+            else:
+                raise OperationFailure(f'Unrecognized pipeline stage name: {name!r}')
+        return docs
+
+    @staticmethod
+    def _add_fields(doc, spec):
+        result = dict(doc)
+        for field, expr in spec.items():
+            _set(result, field, _evaluate(expr, doc))
+        return result
+
+    def _merge(self, docs, spec):
+        if isinstance(spec, str):
+            spec = {'into': spec}
+        into = spec['into']
+        target = self.database[into if isinstance(into, str) else into['coll']]
+        on = spec.get('on', '_id')
+        on = [on] if isinstance(on, str) else list(on)
+        when_matched = spec.get('whenMatched', 'merge')
+        when_not_matched = spec.get('whenNotMatched', 'insert')
+        for doc in docs:
+            selector = {field: _get(doc, field) for field in on}
+            if target.find_one(selector, {'_id': 1}) is None:
+                if when_not_matched == 'insert':
+                    target.insert_one(doc)
+                elif when_not_matched == 'fail':
+                    raise OperationFailure('$merge could not find a matching document in the target collection')
+            elif when_matched == 'merge':
+                target.update_one(selector, {'$set': {key: value for key, value in doc.items() if key != '_id'}})
+            elif when_matched == 'replace':
+                target.replace_one(selector, {key: value for key, value in doc.items() if key != '_id'})
+            elif when_matched == 'fail':
+                raise self._duplicate(None, doc)
+
+
+# -- database / client ---------------------------------------------------------
+
+class MemoryDatabase:
+    """Collections by name, created on first use like MongoDB's"""
+
+    def __init__(self, name):
+        self.name = name
+        self._collections = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name):
+        collection = self._collections.get(name)
+        if collection is None:
+            with self._lock:
+                collection = self._collections.setdefault(name, MemoryCollection(self, name))
+        return collection
+
+    def get_collection(self, name, **kwargs):
+        return self[name]
+
+    def list_collection_names(self, **kwargs):
+        return list(self._collections)
+
+    def drop_collection(self, name, **kwargs):
+        with self._lock:
+            self._collections.pop(name if isinstance(name, str) else name.name, None)
+
+    def command(self, command, **kwargs):
+        name = command if isinstance(command, str) else next(iter(command))
+        if name == 'ping':
+            return {'ok': 1.0}
+        raise OperationFailure(f'no such command: {name!r}', 59)
+
+
+class MemoryClient:
+    """Databases by name, like MongoClient (``client.admin.command('ping')`` answers ok)"""
+
+    def __init__(self):
+        self._databases = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name):
+        database = self._databases.get(name)
+        if database is None:
+            with self._lock:
+                database = self._databases.setdefault(name, MemoryDatabase(name))
+        return database
+
+    def get_database(self, name, **kwargs):
+        return self[name]
+
+    def list_database_names(self):
+        return list(self._databases)
+
+    def close(self):
+        pass
+
+
+class MemoryStore:
+    """In-process counterpart of LazyMongoClient (``DATA_BACKEND=memory``).
+
+    Same interface, so ``LazyDatabase`` and everything built on it work
+    unchanged. The data lives in this process only: it is lost on exit and a
+    forked worker gets its own copy, so the memory backend is for a single
+    process (app_no_db.py, benchmarks, tests).
+    """
+
+    # There is no server to connect to
+    connected = False
+
+    def __init__(self, database_name):
+        self.database_name = database_name
+        self.client = MemoryClient()
+
+    @property
+    def database(self):
+        return self.client[self.database_name]
+
+    def collection(self, name):
+        return self.client[self.database_name][name]
+
+    def close(self):
+        """Nothing to close; unlike a MongoClient the data must outlive it"""
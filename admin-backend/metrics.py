@@ -0,0 +1,356 @@
+import glob
+import json
+import logging
+import os
+import threading
+import time
+
+from flask import g, request
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# name -> (type, help) of every metric this app exports
+METRICS = {
+    'edunova_http_requests_total': ('counter', 'HTTP requests by endpoint, method and status'),
+    'edunova_http_request_duration_seconds': ('histogram', 'Time to produce the response, by endpoint'),
+    'edunova_http_requests_in_flight': ('gauge', 'Requests being handled, by endpoint'),
+    'edunova_mongodb_commands_total': ('counter', 'MongoDB commands by name and outcome'),
+    'edunova_mongodb_command_duration_seconds': ('histogram', 'MongoDB command round trip time, by name'),
+    'edunova_mongodb_pool_connections': ('gauge', 'Open MongoDB connections, by server'),
+    'edunova_mongodb_pool_connections_in_use': ('gauge', 'MongoDB connections checked out, by server'),
+    'edunova_mongodb_pool_checkout_wait_seconds': ('histogram', 'Time spent waiting for a pooled connection'),
+    'edunova_mongodb_pool_checkout_failures_total': ('counter', 'Failed connection checkouts, by reason'),
+    'edunova_mongodb_pool_clears_total': ('counter', 'Connection pools cleared after an error, by server'),
+    'edunova_metrics_processes': ('gauge', 'Worker processes whose metrics are included'),
+}
+
+# Label value for requests that matched no route
+UNMATCHED = '<unmatched>'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """Counters, gauges and histograms of one process, exported in Prometheus text format.
+
+    With a ``directory`` (set by serve.py for gunicorn), a background thread
+    in every worker writes its values to ``<pid>.json`` there every
+    ``flush_interval`` seconds when they changed, and the worker answering
+    /metrics writes its own first and then adds up the files of all
+    workers. Other workers' figures can therefore lag by up to
+    ``flush_interval``. Counters and histograms of workers that
+    have exited are kept in ``dead.json`` so totals never go backwards.
+    """
+
+    def __init__(self, directory=None, flush_interval=5):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._changed = False
+        self._flusher_pid = None
+        self._pid = os.getpid()
+
+    # -- recording --------------------------------------------------------
+
+    def _own(self):
+        # A forked worker starts from zero instead of repeating the parent's values
+        if self._pid != os.getpid():
+            self._counters, self._gauges, self._histograms = {}, {}, {}
+            self._pid = os.getpid()
+
+    def inc(self, name, labels=(), amount=1):
+        key = (name, tuple(labels))
+        with self._lock:
+            self._own()
+            self._changed = True
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def add(self, name, labels=(), amount=1):
+        """Move a gauge up (or down, with a negative ``amount``)"""
+        key = (name, tuple(labels))
+        with self._lock:
+            self._own()
+            self._changed = True
+            self._gauges[key] = self._gauges.get(key, 0) + amount
+
+    def observe(self, name, labels, value, buckets=LATENCY_BUCKETS):
+        key = (name, tuple(labels))
+        with self._lock:
+            self._own()
+            self._changed = True
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram[index] += 1
+                    break
+            else:
+                histogram[len(buckets)] += 1
+            histogram[-1] += value
+
+    # -- snapshots --------------------------------------------------------
+
+    def snapshot(self):
+        """This process's values as JSON-friendly lists"""
+        with self._lock:
+            self._own()
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'gauges': [[name, list(labels), value] for (name, labels), value in self._gauges.items()],
+                'histograms': [[name, list(labels), list(values)]
+                               for (name, labels), values in self._histograms.items()]
+            }
+
+    def _path(self, name):
+        return os.path.join(self.directory, f'{name}.json')
+
+    def _write(self, path, snapshot):
+        temp = f'{path}.{os.getpid()}.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+        os.replace(temp, path)
+
+    def flush(self):
+        """Write this process's snapshot for the other workers"""
+        self._changed = False
+        try:
+            self._write(self._path(os.getpid()), self.snapshot())
+        except OSError as e:
+            logger.warning('could not write metrics snapshot: %s', e)
+
+    def _flush_loop(self):
+        while self._flusher_pid == os.getpid():
+            time.sleep(self.flush_interval)
+            if self._changed:
+                self.flush()
+
+    def start_flusher(self):
+        """Start this process's background flush thread (threads do not survive fork)"""
+        if not self.directory or self._flusher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._flusher_pid != os.getpid():
+                self._flusher_pid = os.getpid()
+                threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+
+    def use_directory(self, directory):
+        """Share metrics through ``directory``, dropping files left by an earlier server"""
+        os.makedirs(directory, exist_ok=True)
+        for pattern in ('*.json', '*.tmp'):
+            for path in glob.glob(os.path.join(directory, pattern)):
+                os.remove(path)
+        self.directory = directory
+
+    def mark_process_dead(self, pid):
+        """Fold an exited worker's counters and histograms into dead.json; its gauges go"""
+        path = self._path(pid)
+        try:
+            with open(path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+        snapshot['gauges'] = []
+        with self._lock:
+            dead = self._load(self._path('dead'))
+            self._write(self._path('dead'), _as_snapshot(_merge([dead, snapshot])) if dead else snapshot)
+        os.remove(path)
+
+    @staticmethod
+    def _load(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def collect(self):
+        """Merged values of every worker (just this process without a directory)"""
+        if not self.directory:
+            return _merge([self.snapshot()]), 1
+        self.flush()
+        snapshots = []
+        processes = 0
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            snapshot = self._load(path)
+            if snapshot is not None:
+                snapshots.append(snapshot)
+                processes += not path.endswith('dead.json')
+        return _merge(snapshots), processes
+
+    def render(self):
+        """Everything in Prometheus text exposition format (version 0.0.4)"""
+        merged, processes = self.collect()
+        merged['gauges'][('edunova_metrics_processes', ())] = processes
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            series = merged['histograms' if kind == 'histogram' else kind + 's']
+            rows = sorted((labels, value) for (metric, labels), value in series.items() if metric == name)
+            if not rows:
+                continue
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in rows:
+                labels = [tuple(label) for label in labels]
+                if kind != 'histogram':
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+                    continue
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), value[:-1]):
+                    cumulative += count
+                    bucket_labels = labels + [('le', bound if bound == '+Inf' else repr(bound))]
+                    lines.append(f'{name}_bucket{_format_labels(bucket_labels)} {cumulative}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(value[-1])}')
+                lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+    # -- Flask ------------------------------------------------------------
+
+    def init_app(self, app):
+        """Time every request of ``app`` and count it by endpoint, method and status"""
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def _before_request(self):
+        g.metrics_started = time.perf_counter()
+        g.metrics_endpoint = request.endpoint or UNMATCHED
+        self.add('edunova_http_requests_in_flight', [('endpoint', g.metrics_endpoint)])
+
+    def _record(self, status):
+        endpoint = g.metrics_endpoint
+        self.inc('edunova_http_requests_total',
+                 [('endpoint', endpoint), ('method', request.method), ('status', str(status))])
+        self.observe('edunova_http_request_duration_seconds',
+                     [('endpoint', endpoint), ('method', request.method)],
+                     time.perf_counter() - g.metrics_started)
+        g.metrics_recorded = True
+
+    def _after_request(self, response):
+        if 'metrics_started' in g:
+            self._record(response.status_code)
+        return response
+
+    def _teardown_request(self, error=None):
+        if 'metrics_started' not in g:
+            return
+        if 'metrics_recorded' not in g:
+            # The request failed before a response was made
+            self._record(500)
+        self.add('edunova_http_requests_in_flight', [('endpoint', g.metrics_endpoint)], -1)
+        self.start_flusher()
+
+
+def _merge(snapshots):
+    """Sum snapshots into {'counters'|'gauges'|'histograms': {(name, labels): value}}"""
+    merged = {'counters': {}, 'gauges': {}, 'histograms': {}}
+    for snapshot in snapshots:
+        for kind in ('counters', 'gauges'):
+            for name, labels, value in snapshot.get(kind, ()):
+                key = (name, tuple(tuple(label) for label in labels))
+                merged[kind][key] = merged[kind].get(key, 0) + value
+        for name, labels, values in snapshot.get('histograms', ()):
+            key = (name, tuple(tuple(label) for label in labels))
+            current = merged['histograms'].get(key)
+            merged['histograms'][key] = values if current is None else [a + b for a, b in zip(current, values)]
+    return merged
+
+
+def _as_snapshot(merged):
+    """Inverse of _merge for one merged result: back to the lists written to disk"""
+    return {kind: [[name, [list(label) for label in labels], value] for (name, labels), value in series.items()]
+            for kind, series in merged.items()}
+
+
+class MongoMetrics(monitoring.CommandListener, monitoring.ConnectionPoolListener):
+    """pymongo event listener feeding command and connection pool metrics into ``metrics``.
+
+    Passed to the MongoClient as an event listener (see services.py), so it
+    sees every command and pool event of the process's client.
+    """
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self._checkouts = threading.local()
+
+    # -- commands ---------------------------------------------------------
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._command(event, 'ok')
+
+    def failed(self, event):
+        self._command(event, 'error')
+
+    def _command(self, event, outcome):
+        self.metrics.inc('edunova_mongodb_commands_total', [('command', event.command_name), ('outcome', outcome)])
+        self.metrics.observe('edunova_mongodb_command_duration_seconds', [('command', event.command_name)],
+                             event.duration_micros / 1e6)
+
+    # -- connection pool --------------------------------------------------
+
+    @staticmethod
+    def _server(event):
+        host, port = event.address
+        return [('server', f'{host}:{port}')]
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.metrics.inc('edunova_mongodb_pool_clears_total', self._server(event))
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.metrics.add('edunova_mongodb_pool_connections', self._server(event))
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.metrics.add('edunova_mongodb_pool_connections', self._server(event), -1)
+
+    def connection_check_out_started(self, event):
+        self._checkouts.started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self.metrics.inc('edunova_mongodb_pool_checkout_failures_total', [('reason', str(event.reason))])
+
+    def connection_checked_out(self, event):
+        started = getattr(self._checkouts, 'started', None)
+        if started is not None:
+            self.metrics.observe('edunova_mongodb_pool_checkout_wait_seconds', [],
+                                 time.perf_counter() - started)
+            self._checkouts.started = None
+        self.metrics.add('edunova_mongodb_pool_connections_in_use', self._server(event))
+
+    def connection_checked_in(self, event):
+        self.metrics.add('edunova_mongodb_pool_connections_in_use', self._server(event), -1)
@@ -0,0 +1,80 @@
+import os
+import threading
+from functools import partial
+
+from pymongo import MongoClient
+from werkzeug.local import LocalProxy
+
+
+class LazyMongoClient:
+    """A MongoClient per process, created on first use.
+
+    Nothing connects until the first query, so importing the app or creating
+    it in a pre-fork master costs no connection. A MongoClient must not be
+    used across fork: when the process id changes, the child builds a client
+    (and connection pool) of its own instead of reusing the parent's.
+    """
+
+    def __init__(self, uri, database_name, **options):
+        self.uri = uri
+        self.database_name = database_name
+        self.options = options
+        self._lock = threading.Lock()
+        self._client = None
+        self._pid = None
+        self._collections = {}
+
+    @property
+    def client(self):
+        pid = os.getpid()
+        if self._client is None or self._pid != pid:
+            with self._lock:
+                if self._client is None or self._pid != pid:
+                    self._client = MongoClient(self.uri, **self.options)
+                    self._collections = {}
+                    self._pid = pid
+        return self._client
+
+    @property
+    def database(self):
+        return self.client[self.database_name]
+
+    def collection(self, name):
+        """Collection ``name`` of this process's client (Collection objects are reused)"""
+        client = self.client
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = client[self.database_name][name]
+        return collection
+
+    @property
+    def connected(self):
+        """True if this process has already created its client"""
+        return self._client is not None and self._pid == os.getpid()
+
+    def close(self):
+        """Close this process's client; the next query opens a new one"""
+        with self._lock:
+            if self.connected:
+                self._client.close()
+            self._client = None
+            self._collections = {}
+            self._pid = None
+
+
+class LazyDatabase:
+    """Stands in for a Database: ``db.students`` / ``db['students']`` are proxies
+    that resolve to the current process's collection on every use, so they can
+    be created (and held by long-lived objects) before any connection exists.
+    """
+
+    def __init__(self, mongo):
+        self._mongo = mongo
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name):
+        return LocalProxy(partial(self._mongo.collection, name))
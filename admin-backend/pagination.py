@@ -0,0 +1,54 @@
+import base64
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue"""
+
+
+def encode_cursor(doc, field='created_at'):
+    """Build an opaque cursor pointing just past ``doc`` in (field, _id) order"""
+    payload = {'v': doc[field].isoformat(), 'id': str(doc['_id'])}
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return the (datetime, ObjectId) pair stored in a cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(payload['v']), ObjectId(payload['id'])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+
+def keyset_query(query, cursor, field='created_at'):
+    """Restrict ``query`` to documents after ``cursor`` in descending (field, _id) order.
+
+    Combined with a sort on [(field, -1), ('_id', -1)] and the matching compound
+    index, every page is an index range scan no matter how deep the client is.
+    Only documents whose ``field`` is a date are walked (legacy rows without
+    one could not be encoded into a cursor); pass ``cursor=None`` for the
+    matching count.
+    """
+    clauses = [query] if query else []
+    clauses.append({field: {'$type': 'date'}})
+    if cursor:
+        value, last_id = decode_cursor(cursor)
+        clauses.append({'$or': [
+            {field: {'$lt': value}},
+            {field: value, '_id': {'$lt': last_id}}
+        ]})
+    return clauses[0] if len(clauses) == 1 else {'$and': clauses}
+
+
+def parse_bool(value, default=False):
+    """Interpret a query string flag such as include_total=true"""
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class PrincipalCache:
+    """Bounded in-process cache of admin documents used by token_required.
+
+    Entries expire after ``ttl`` seconds and the least recently used entry is
+    evicted once ``max_size`` is reached. The cache is per process, so write
+    paths that change an admin must call ``invalidate`` and the TTL bounds how
+    long other workers can keep serving the old document.
+    """
+
+    def __init__(self, max_size=1024, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, admin_id):
+        """Return a copy of the cached admin document, or None on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(admin_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, admin = entry
+            if expires_at <= now:
+                del self._entries[admin_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(admin_id)
+            self.hits += 1
+            return admin.copy()
+
+    def put(self, admin_id, admin):
+        """Store an admin document, evicting the oldest entries if needed"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[admin_id] = (time.monotonic() + self.ttl, admin.copy())
+            self._entries.move_to_end(admin_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, admin_id):
+        """Drop a single admin, e.g. after its document was modified"""
+        with self._lock:
+            if self._entries.pop(str(admin_id), None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
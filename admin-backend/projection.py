@@ -0,0 +1,45 @@
+# Fields clients may request with ?fields= on list and detail endpoints
+FIELD_WHITELISTS = {
+    'students': ['_id', 'student_id', 'full_name', 'email', 'phone', 'course', 'address',
+                 'date_of_birth', 'enrollment_date', 'status', 'created_at', 'created_by',
+                 'updated_at', 'updated_by'],
+    'courses': ['_id', 'code', 'name', 'description', 'duration', 'fee', 'capacity', 'status',
+                'created_at', 'created_by', 'updated_at', 'updated_by'],
+    'teachers': ['_id', 'name', 'subject', 'contact', 'email', 'status',
+                 'created_at', 'created_by', 'updated_at', 'updated_by'],
+    'timetable': ['_id', 'subject', 'grade', 'date', 'start_time', 'end_time',
+                  'created_at', 'created_by'],
+    'registration_links': ['_id', 'link', 'title', 'is_active', 'admin_username',
+                           'created_at', 'created_by', 'updated_at', 'updated_by']
+}
+
+# Internal fields left out of responses when no ?fields= is given
+DEFAULT_EXCLUDES = {
+    'students': ['full_name_lower', 'email_lower', 'student_id_lower', 'name_tokens']
+}
+
+
+class InvalidFields(ValueError):
+    """Raised when ?fields= names something outside the whitelist"""
+
+
+def parse_fields(resource, value):
+    """Turn a comma separated ?fields= value into a Mongo projection.
+
+    Without ``value`` the default projection is returned (None when the
+    resource has nothing to hide). ``_id`` is always included.
+    """
+    if not value:
+        excludes = DEFAULT_EXCLUDES.get(resource)
+        return {field: 0 for field in excludes} if excludes else None
+
+    allowed = FIELD_WHITELISTS[resource]
+    projection = {'_id': 1}
+    for field in value.split(','):
+        field = field.strip()
+        if not field:
+            continue
+        if field not in allowed:
+            raise InvalidFields(f'Unknown field: {field}')
+        projection[field] = 1
+    return projection
@@ -0,0 +1,312 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+
+from flask import has_request_context, request
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+# Structured slow-query log: one JSON object per line
+slow_query_log = logging.getLogger('edunova.slow_query')
+
+# Commands that carry a filter, and where it is
+FILTER_FIELDS = {
+    'find': 'filter',
+    'count': 'query',
+    'distinct': 'query',
+    'findAndModify': 'query',
+    'delete': 'deletes',
+    'update': 'updates',
+}
+
+# Commands run again under explain to find how many documents a slow one examined
+EXPLAINABLE = ('find', 'aggregate', 'count', 'distinct')
+
+# Driver and session fields that are not part of what the server is asked to do
+COMMAND_METADATA = ('lsid', '$db', '$clusterTime', '$readPreference', 'txnNumber', 'autocommit',
+                    'startTransaction', 'readConcern', 'writeConcern', 'apiVersion', '$audit')
+
+# Orders accepted by QueryProfiler.top (and ?sort= on /api/admin/slow-queries)
+TOP_SORTS = ('total_ms', 'max_ms', 'avg_ms', 'count')
+
+# Shape key used once ``max_shapes`` distinct shapes are being tracked
+OTHER_SHAPE = '<other>'
+
+# Started commands waiting for their succeeded/failed event. Unacknowledged
+# writes and dropped connections never send one, so the oldest are dropped
+# beyond this many, or once older than PENDING_MAX_AGE seconds
+MAX_PENDING = 1000
+PENDING_MAX_AGE = 600
+
+
+def shape_of(value):
+    """``value`` with every literal replaced by '?': field names and operators are kept.
+
+    Lists of literals ($in, $nin, ...) collapse to ['?'] so the shape does not
+    depend on how many values were passed.
+    """
+    if isinstance(value, dict):
+        return {key: shape_of(item) for key, item in value.items()}
+    if isinstance(value, list):
+        shapes = []
+        for item in value:
+            shaped = shape_of(item)
+            if shaped not in shapes:
+                shapes.append(shaped)
+        return shapes
+    return '?'
+
+
+def command_filter(command_name, command):
+    """The part of ``command`` that decides which documents it reads or writes"""
+    if command_name == 'aggregate':
+        return [stage for stage in command.get('pipeline', ()) if '$match' in stage] or None
+    field = FILTER_FIELDS.get(command_name)
+    if field is None:
+        return None
+    if field in ('deletes', 'updates'):
+        return [statement.get('q') for statement in command.get(field, ())] or None
+    return command.get(field)
+
+
+def command_shape(command_name, command):
+    filter_shape = shape_of(command_filter(command_name, command) or {})
+    shape = {'filter': filter_shape}
+    if command.get('sort'):
+        shape['sort'] = dict(command['sort'])
+    return json.dumps(shape, sort_keys=True, separators=(',', ':'))
+
+
+def current_route():
+    """The Flask route the command runs for, or None outside a request (background jobs)"""
+    if not has_request_context():
+        return None
+    return f'{request.method} {request.url_rule.rule if request.url_rule else request.path}'
+
+
+class _ShapeStats:
+    __slots__ = ('command', 'namespace', 'shape', 'count', 'total_ms', 'max_ms', 'slow_count',
+                 'docs_examined', 'explained', 'routes')
+
+    def __init__(self, command, namespace, shape):
+        self.command = command
+        self.namespace = namespace
+        self.shape = shape
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow_count = 0
+        self.docs_examined = 0
+        self.explained = 0
+        self.routes = {}
+
+    def to_dict(self):
+        return {
+            'command': self.command,
+            'namespace': self.namespace,
+            'shape': json.loads(self.shape) if self.shape != OTHER_SHAPE else OTHER_SHAPE,
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0,
+            'max_ms': round(self.max_ms, 3),
+            'slow_count': self.slow_count,
+            'avg_docs_examined': round(self.docs_examined / self.explained, 1) if self.explained else None,
+            'routes': dict(sorted(self.routes.items(), key=lambda item: -item[1])[:5])
+        }
+
+
+class QueryProfiler(monitoring.CommandListener):
+    """Times every MongoDB command by query shape and logs the slow ones.
+
+    Registered as an event listener on the MongoClient (see services.py).
+    Each command is keyed by name, namespace and shape (its filter, and sort,
+    with the values taken out), and the per-shape count, total and maximum
+    time are kept for ``top``. A command slower than ``threshold_ms`` goes
+    to the ``edunova.slow_query`` log as one JSON object with the Flask
+    route it ran for. With ``explain``, slow reads are first run again
+    under explain("executionStats") on a background thread to add the
+    number of documents they examined; a shape is explained at most once
+    per ``explain_interval`` seconds. Figures are per process. Between the
+    started and finished events only the shape is kept (plus the command
+    of reads that may be explained), and at most MAX_PENDING of them.
+    """
+
+    def __init__(self, threshold_ms=100, explain=True, client=None, max_shapes=500,
+                 recent=100, explain_interval=60):
+        self.threshold_ms = threshold_ms
+        self.explain = explain and client is not None
+        self.client = client
+        self.max_shapes = max_shapes
+        self.explain_interval = explain_interval
+        self._lock = threading.Lock()
+        self._started = OrderedDict()
+        self._shapes = {}
+        self._recent = deque(maxlen=recent)
+        self._explained_at = {}
+        self._queue = queue.Queue(maxsize=100)
+        self._worker_pid = None
+
+    # -- listener ---------------------------------------------------------
+
+    def started(self, event):
+        if event.command_name == 'explain' or not event.command:
+            return
+        command = event.command
+        # getMore names its collection separately; its first field is the cursor id
+        collection = command.get('collection' if event.command_name == 'getMore' else event.command_name)
+        namespace = f'{event.database_name}.{collection}' if isinstance(collection, str) else event.database_name
+        # Only reads that may be explained keep their command; never insert batches
+        explainable = command if self.explain and event.command_name in EXPLAINABLE else None
+        now = time.monotonic()
+        with self._lock:
+            self._started[(event.connection_id, event.request_id)] = (
+                namespace, command_shape(event.command_name, command), current_route(), explainable,
+                event.database_name, now)
+            while self._started:
+                oldest = next(iter(self._started.values()))
+                if len(self._started) <= MAX_PENDING and now - oldest[5] < PENDING_MAX_AGE:
+                    break
+                self._started.popitem(last=False)
+
+    def succeeded(self, event):
+        self._finished(event, None)
+
+    def failed(self, event):
+        failure = event.failure
+        self._finished(event, str(failure.get('errmsg', failure) if isinstance(failure, dict) else failure))
+
+    def _finished(self, event, error):
+        with self._lock:
+            started = self._started.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        namespace, shape, route, command, database, _ = started
+        duration_ms = event.duration_micros / 1000
+        slow = duration_ms >= self.threshold_ms
+        key = (event.command_name, namespace, shape)
+        with self._lock:
+            stats = self._shapes.get(key)
+            if stats is None:
+                if len(self._shapes) >= self.max_shapes:
+                    key = (event.command_name, namespace, OTHER_SHAPE)
+                    stats = self._shapes.get(key)
+                if stats is None:
+                    stats = self._shapes[key] = _ShapeStats(*key)
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            if route is not None:
+                stats.routes[route] = stats.routes.get(route, 0) + 1
+            if slow:
+                stats.slow_count += 1
+        if not slow:
+            return
+
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'command': event.command_name,
+            'namespace': namespace,
+            'duration_ms': round(duration_ms, 3),
+            'shape': json.loads(shape),
+            'route': route,
+            'docs_examined': None,
+            'keys_examined': None,
+            'error': error
+        }
+        if command is not None and self._should_explain(event.command_name, key):
+            try:
+                self._start_worker()
+                self._queue.put_nowait((entry, key, database, command))
+                return
+            except queue.Full:
+                pass
+        self._log(entry)
+
+    # -- explain ------------------------------------------------------------
+
+    def _should_explain(self, command_name, key):
+        if not self.explain or command_name not in EXPLAINABLE:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - self._explained_at.get(key, -self.explain_interval) < self.explain_interval:
+                return False
+            self._explained_at[key] = now
+        return True
+
+    def _start_worker(self):
+        # One thread per process, started on first use so it exists after fork
+        if self._worker_pid != os.getpid():
+            with self._lock:
+                if self._worker_pid != os.getpid():
+                    self._worker_pid = os.getpid()
+                    threading.Thread(target=self._explain_loop, name='query-explain', daemon=True).start()
+
+    def _explain_loop(self):
+        while True:
+            entry, key, database, command = self._queue.get()
+            try:
+                stats = self._execution_stats(database, command)
+                entry['docs_examined'] = stats.get('totalDocsExamined')
+                entry['keys_examined'] = stats.get('totalKeysExamined')
+                if entry['docs_examined'] is not None:
+                    with self._lock:
+                        shape = self._shapes.get(key)
+                        if shape is not None:
+                            shape.docs_examined += entry['docs_examined']
+                            shape.explained += 1
+            except Exception as e:
+                logger.warning('explain of a slow %s failed: %s', entry['command'], e)
+            self._log(entry)
+
+    def _execution_stats(self, database, command):
+        command = {key: value for key, value in command.items() if key not in COMMAND_METADATA}
+        plan = self.client()[database].command({'explain': command, 'verbosity': 'executionStats'})
+        if 'executionStats' in plan:
+            return plan['executionStats']
+        # aggregate: the $cursor stage of the first pipeline stage holds the find's stats
+        for stage in plan.get('stages', ()):
+            if '$cursor' in stage:
+                return stage['$cursor'].get('executionStats', {})
+        return {}
+
+    def _log(self, entry):
+        with self._lock:
+            self._recent.append(entry)
+        slow_query_log.warning(json.dumps(entry, default=str, separators=(',', ':')))
+
+    # -- reports --------------------------------------------------------------
+
+    def top(self, limit=10, sort='total_ms'):
+        """The ``limit`` shapes with the most total (or max, avg, count) time"""
+        with self._lock:
+            shapes = [stats.to_dict() for stats in self._shapes.values()]
+        shapes.sort(key=lambda stats: stats[sort], reverse=True)
+        return shapes[:limit]
+
+    def recent(self, limit=20):
+        """The latest slow-query log entries, newest first"""
+        with self._lock:
+            return list(self._recent)[-limit:][::-1]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'threshold_ms': self.threshold_ms,
+                'explain': self.explain,
+                'shapes': len(self._shapes),
+                'pending': len(self._started),
+                'commands': sum(stats.count for stats in self._shapes.values()),
+                'slow_commands': sum(stats.slow_count for stats in self._shapes.values())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._shapes = {}
+            self._recent.clear()
+            self._explained_at = {}
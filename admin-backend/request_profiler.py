@@ -0,0 +1,276 @@
+import cProfile
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+
+from flask import g, request
+
+logger = logging.getLogger(__name__)
+
+# Request header asking for one request to be profiled (admin token required)
+PROFILE_HEADER = 'X-Profile'
+
+# Orders accepted by RequestProfiler.summary (and ?sort= on /api/admin/profiler)
+SUMMARY_SORTS = ('tottime', 'cumtime', 'calls')
+
+# Name of the file holding the sample rate set through /api/admin/profiler
+SETTINGS_FILE = 'settings.json'
+
+# Directory for requests that match no route
+UNMATCHED = '_unmatched'
+
+
+def _directory_name(endpoint):
+    """``endpoint`` as a directory name: Flask endpoints are dotted identifiers already"""
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', endpoint) if endpoint else UNMATCHED
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        # Pruned by another worker meanwhile
+        return 0
+
+
+def _function_name(function):
+    filename, line, name = function
+    if filename == '~':
+        # Built-ins (len, dict.get, ...) have no file
+        return name
+    return f'{name} ({filename}:{line})'
+
+
+class RequestProfiler:
+    """cProfile for a sample of requests, or one request on demand.
+
+    A request is profiled when it sends ``X-Profile: 1`` with a valid admin
+    token (checked by ``authorize``), or at random with the sample rate set
+    through ``configure`` (or ``sample_rate``). The rate is kept in a file
+    in ``directory`` so every worker of serve.py picks it up, and it lapses
+    at the time given to ``configure`` so sampling is not left on by
+    accident. Each profile is written with ``pstats`` to
+    ``<directory>/<endpoint>/``, keeping the newest ``keep`` per endpoint;
+    ``summary`` adds them up into the functions with the most time.
+    """
+
+    def __init__(self, directory, sample_rate=0.0, keep=50, authorize=None):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.keep = keep
+        self.authorize = authorize
+        self._lock = threading.Lock()
+        self._settings = {}
+        self._settings_mtime = None
+        self._settings_checked = 0.0
+        self._sequence = 0
+
+    def init_app(self, app, authorize=None):
+        """Profile requests of ``app``; register before other hooks so they are included"""
+        if authorize is not None:
+            self.authorize = authorize
+        app.before_request(self._before_request)
+        app.teardown_request(self._teardown_request)
+
+    # -- settings -----------------------------------------------------------
+
+    def _settings_path(self):
+        return os.path.join(self.directory, SETTINGS_FILE)
+
+    def _load_settings(self):
+        # Re-read the shared settings at most once a second, and only when they changed
+        now = time.monotonic()
+        if now - self._settings_checked < 1:
+            return self._settings
+        self._settings_checked = now
+        try:
+            mtime = os.stat(self._settings_path()).st_mtime
+        except OSError:
+            self._settings, self._settings_mtime = {}, None
+            return self._settings
+        if mtime != self._settings_mtime:
+            try:
+                with open(self._settings_path()) as f:
+                    self._settings = json.load(f)
+                self._settings_mtime = mtime
+            except (OSError, ValueError) as e:
+                logger.warning('Could not read profiler settings: %s', e)
+        return self._settings
+
+    def current_rate(self):
+        """The fraction of requests being profiled now"""
+        settings = self._load_settings()
+        if settings.get('until', 0) > time.time():
+            return settings.get('sample_rate', 0.0)
+        return self.sample_rate
+
+    def configure(self, sample_rate, duration):
+        """Profile ``sample_rate`` of all requests, in every worker, for ``duration`` seconds"""
+        os.makedirs(self.directory, exist_ok=True)
+        settings = {'sample_rate': sample_rate, 'until': time.time() + duration if sample_rate else 0}
+        path = self._settings_path()
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(settings, f)
+        os.replace(tmp, path)
+        self._settings_checked = 0.0
+
+    def status(self):
+        settings = self._load_settings()
+        until = settings.get('until', 0)
+        return {
+            'directory': self.directory,
+            'sample_rate': self.current_rate(),
+            'default_sample_rate': self.sample_rate,
+            'until': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(until)) if until > time.time() else None,
+            'header': PROFILE_HEADER,
+            'keep': self.keep
+        }
+
+    # -- profiling ------------------------------------------------------------
+
+    def _wanted(self):
+        if request.headers.get(PROFILE_HEADER):
+            if self.authorize is None:
+                return False
+            try:
+                return self.authorize()
+            except Exception as e:
+                # Never fail the request itself over the profiling header
+                logger.warning('Could not check %s authorization: %s', PROFILE_HEADER, e)
+                return False
+        rate = self.current_rate()
+        return rate > 0 and random.random() < rate
+
+    def _before_request(self):
+        if not self._wanted():
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is active (Python 3.12+ allows one per process)
+            return
+        g.request_profile = profile
+        g.request_profile_started = time.perf_counter()
+
+    def _teardown_request(self, error=None):
+        profile = g.pop('request_profile', None)
+        if profile is None:
+            return
+        profile.disable()
+        duration_ms = (time.perf_counter() - g.pop('request_profile_started')) * 1000
+        try:
+            self._save(profile, request.endpoint, duration_ms)
+        except (OSError, ValueError) as e:
+            logger.warning('Could not save request profile: %s', e)
+
+    def _endpoint_directory(self, endpoint):
+        """The directory of ``endpoint``'s profiles; ValueError unless it is directly inside ``directory``"""
+        name = _directory_name(endpoint)
+        path = os.path.realpath(os.path.join(self.directory, name))
+        if name.startswith('.') or os.path.dirname(path) != os.path.realpath(self.directory):
+            raise ValueError(f'Invalid endpoint: {endpoint}')
+        return path
+
+    def _save(self, profile, endpoint, duration_ms):
+        directory = self._endpoint_directory(endpoint)
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{sequence}-{round(duration_ms)}ms.prof"
+        profile.dump_stats(os.path.join(directory, name))
+        self._prune(directory)
+
+    def _prune(self, directory):
+        profiles = sorted(self._profiles(directory), key=_mtime)
+        for path in profiles[:-self.keep]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    # -- reports ----------------------------------------------------------------
+
+    def _profiles(self, directory):
+        try:
+            return [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.prof')]
+        except OSError:
+            return []
+
+    def endpoints(self):
+        """Endpoint directory -> number of profiles kept for it"""
+        try:
+            names = sorted(os.listdir(self.directory))
+        except OSError:
+            return {}
+        counts = {}
+        for name in names:
+            path = os.path.join(self.directory, name)
+            if not name.startswith('.') and os.path.isdir(path):
+                counts[name] = len(self._profiles(path))
+        return counts
+
+    def _endpoint_directories(self, endpoint=None):
+        if endpoint:
+            return [self._endpoint_directory(endpoint)]
+        return [self._endpoint_directory(name) for name in self.endpoints()]
+
+    def summary(self, endpoint=None, limit=20, sort='tottime'):
+        """The ``limit`` functions with the most own time (or cumulative time, calls) over the kept profiles"""
+        directories = self._endpoint_directories(endpoint)
+        paths = [path for directory in directories for path in self._profiles(directory)]
+        stats = None
+        loaded = 0
+        for path in paths:
+            try:
+                if stats is None:
+                    stats = pstats.Stats(path)
+                else:
+                    stats.add(path)
+                loaded += 1
+            except (OSError, EOFError, TypeError, ValueError) as e:
+                # A profile being pruned, or one cut short
+                logger.warning('Could not read profile %s: %s', path, e)
+        if stats is None:
+            return {'profiles': 0, 'total_time': 0, 'functions': []}
+
+        functions = []
+        for function, (primitive_calls, calls, tottime, cumtime, _callers) in stats.stats.items():
+            functions.append({
+                'function': _function_name(function),
+                'calls': calls,
+                'primitive_calls': primitive_calls,
+                'tottime': round(tottime, 6),
+                'cumtime': round(cumtime, 6),
+                'percall_ms': round(cumtime / calls * 1000, 3) if calls else 0
+            })
+        functions.sort(key=lambda item: item[sort], reverse=True)
+        return {
+            'profiles': loaded,
+            'total_time': round(stats.total_tt, 6),
+            'functions': functions[:limit]
+        }
+
+    def clear(self, endpoint=None):
+        """Delete the kept profiles (of one endpoint); returns how many were removed"""
+        removed = 0
+        for directory in self._endpoint_directories(endpoint):
+            for path in self._profiles(directory):
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+            try:
+                os.rmdir(directory)
+            except OSError:
+                # Not empty (a profile written meanwhile) or already gone
+                pass
+        return removed
@@ -0,0 +1,319 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+
+from http_cache import content_etag, not_modified
+from single_flight import request_key, restore_response, snapshot_response
+
+try:
+    import redis
+except ImportError:  # optional: the shared backend falls back to LocalSharedStore
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class LRUBackend:
+    """In-process cache bounded by entry count and per-entry TTL.
+
+    Tag versions live in the same process, so an invalidation in one worker
+    is not seen by the others; their entries age out after ``ttl`` seconds.
+    """
+
+    # Invalidations do not reach other processes
+    process_local = True
+
+    def __init__(self, max_size=512, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def tag_versions(self, tags):
+        with self._lock:
+            return [self._versions.get(tag, 0) for tag in tags]
+
+    def bump(self, tag):
+        with self._lock:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
+class LocalSharedStore:
+    """Single-process stand-in for the few Redis commands SharedBackend uses.
+
+    Lets the shared backend run in development and tests without a Redis
+    server; it is not shared between processes.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key, now):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= now:
+            del self._data[key]
+            return None
+        return value
+
+    def get(self, key):
+        with self._lock:
+            return self._live(key, time.monotonic())
+
+    def mget(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            return [self._live(key, now) for key in keys]
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ex if ex else None)
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self._live(key, time.monotonic()) or 0) + 1
+            self._data[key] = (value, None)
+            return value
+
+    def flushdb(self):
+        with self._lock:
+            self._data.clear()
+
+    def dbsize(self):
+        with self._lock:
+            return len(self._data)
+
+
+class SharedBackend:
+    """Cache shared by every worker through Redis (or a LocalSharedStore).
+
+    Entries are stored as JSON with a server-side TTL, and tag versions are
+    Redis counters, so an invalidation is seen by all workers at once.
+    """
+
+    def __init__(self, client, ttl=300, prefix='edunova:cache:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @property
+    def process_local(self):
+        # Only Redis is shared; the LocalSharedStore stand-in lives in one process
+        return not (redis is not None and isinstance(self.client, redis.Redis))
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl or self.ttl)
+
+    def tag_versions(self, tags):
+        values = self.client.mget([f'{self.prefix}tag:{tag}' for tag in tags])
+        return [int(value or 0) for value in values]
+
+    def bump(self, tag):
+        self.client.incr(f'{self.prefix}tag:{tag}')
+
+    def clear(self):
+        self.client.flushdb()
+
+    def stats(self):
+        backend = 'redis' if redis is not None and isinstance(self.client, redis.Redis) else 'local'
+        return {'backend': f'shared ({backend})', 'ttl_seconds': self.ttl}
+
+
+def make_backend(kind, max_size, ttl, redis_url=None):
+    """Build the backend named by RESPONSE_CACHE_BACKEND ('memory' or 'shared')"""
+    if kind == 'shared':
+        if redis is not None and redis_url:
+            return SharedBackend(redis.Redis.from_url(redis_url), ttl)
+        logger.warning('shared response cache requested without redis/REDIS_URL; using a local stand-in')
+        return SharedBackend(LocalSharedStore(), ttl)
+    if kind == 'memory':
+        return LRUBackend(max_size, ttl)
+    raise ValueError(f"RESPONSE_CACHE_BACKEND must be 'memory' or 'shared', not {kind!r}")
+
+
+class ResponseCache:
+    """Caches GET responses of Flask views, invalidated by collection tags.
+
+    Every entry key embeds the current version of each of its tags, so
+    ``invalidate('courses')`` makes all course-derived entries unreachable in
+    one step; the orphaned entries are then evicted or expire on their own.
+    Entries keep the ETag of their body, so a matching If-None-Match is
+    answered with 304 straight from the entry.
+    A backend failure is logged and the view runs uncached. With a
+    ``single_flight``, concurrent misses for the same key run the view once.
+    After ``disable`` every view runs uncached (serve.py does this when a
+    process-local backend would serve stale responses across workers).
+    """
+
+    def __init__(self, backend, single_flight=None):
+        self.backend = backend
+        self.single_flight = single_flight
+        self.enabled = True
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.errors = 0
+        self.invalidations = {}
+
+    def _count(self, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def _key(self, tags):
+        versions = self.backend.tag_versions(tags)
+        stamp = ','.join(f'{tag}.{version}' for tag, version in zip(tags, versions))
+        return f'{request_key()}|{stamp}'
+
+    def init_app(self, app):
+        """Make this the cache used by the module-level ``cached`` decorator in ``app``"""
+        app.extensions['response_cache'] = self
+
+    def disable(self):
+        """Run every cached view uncached from now on"""
+        self.enabled = False
+
+    def cached(self, tags, ttl=None, statuses=(200,)):
+        """Decorator for a GET view whose response depends only on its query string and ``tags``"""
+        tags = tuple(tags)
+
+        def decorator(f):
+            @wraps(f)
+            def wrapper(*args, **kwargs):
+                return self.serve(f, args, kwargs, tags, ttl, statuses)
+            return wrapper
+        return decorator
+
+    def serve(self, f, args, kwargs, tags, ttl=None, statuses=(200,)):
+        """Answer the current request from the cache, or by calling ``f(*args, **kwargs)``"""
+        if request.method != 'GET' or not self.enabled:
+            return f(*args, **kwargs)
+        try:
+            key = self._key(tags)
+            entry = self.backend.get(key)
+        except Exception as e:
+            logger.warning('response cache unavailable: %s', e)
+            self._count('errors')
+            return f(*args, **kwargs)
+
+        if entry is not None:
+            self._count('hits')
+            if not_modified(entry.get('etag')):
+                # Client already has this body: answer without rebuilding it
+                response = current_app.response_class(status=304)
+                response.set_etag(entry['etag'])
+            else:
+                response = restore_response(entry)
+            response.headers['X-Cache'] = 'HIT'
+            return response
+
+        def fill():
+            entry = snapshot_response(current_app.make_response(f(*args, **kwargs)))
+            entry['etag'] = content_etag(entry['body'])
+            if entry['status'] in statuses:
+                try:
+                    self.backend.set(key, entry, ttl)
+                    self._count('stores')
+                except Exception as e:
+                    logger.warning('response cache store failed: %s', e)
+                    self._count('errors')
+            return entry
+
+        self._count('misses')
+        entry = self.single_flight.do(key, fill) if self.single_flight else fill()
+        response = restore_response(entry)
+        response.headers['X-Cache'] = 'MISS'
+        return response
+
+    def invalidate(self, *tags):
+        """Make every entry tagged with any of ``tags`` stale"""
+        for tag in tags:
+            try:
+                self.backend.bump(tag)
+            except Exception as e:
+                logger.warning('response cache invalidation of %s failed: %s', tag, e)
+                self._count('errors')
+                continue
+            with self._lock:
+                self.invalidations[tag] = self.invalidations.get(tag, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                'enabled': self.enabled,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'stores': self.stores,
+                'errors': self.errors,
+                'invalidations': dict(self.invalidations)
+            }
+        stats.update(self.backend.stats())
+        return stats
+
+
+def cached(tags, ttl=None, statuses=(200,)):
+    """``ResponseCache.cached`` for blueprint views: uses the cache registered on the current app"""
+    tags = tuple(tags)
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            return current_app.extensions['response_cache'].serve(f, args, kwargs, tags, ttl, statuses)
+        return wrapper
+    return decorator
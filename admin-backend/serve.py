@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+EduNova Admin Backend - production server
+
+Runs app.py under gunicorn with pre-forked worker processes, each serving
+WEB_THREADS threads. The app is created once in the master (preload), so
+the static route manifest, asset build and in-memory static file cache are
+built before forking and shared copy-on-write by every worker. The
+master's database checks run on a client it closes before forking; each
+worker opens its own connection pool on its first query.
+
+Usage: python serve.py
+Reload (finish in-flight requests, start fresh workers): kill -HUP <master pid>
+Stop gracefully: kill -TERM <master pid>
+"""
+
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+
+# Production defaults unless set explicitly in the environment (before config reads it)
+os.environ.setdefault('FLASK_DEBUG', 'False')
+
+from gunicorn.app.base import BaseApplication
+
+from app import create_app, init_db, verify_unique_indexes
+from config import Config
+from init_db import setup_database
+
+logger = logging.getLogger('edunova.serve')
+
+
+def default_workers():
+    """Gunicorn's usual sizing: two workers per core plus one"""
+    return multiprocessing.cpu_count() * 2 + 1
+
+
+def preflight(services):
+    """Database checks for the master; its client is closed again before forking"""
+    if Config.DATA_BACKEND == 'memory':
+        # Seeded here so the forked worker starts with the sample data
+        setup_database(services.db)
+        return True
+    try:
+        init_db(services.db)
+        return verify_unique_indexes(services.db)
+    finally:
+        services.store.close()
+
+
+def worker_exit(server, worker):
+    """Publish the exiting worker's last metrics before child_exit folds them in"""
+    server.app.wsgi().extensions['edunova'].metrics.flush()
+
+
+def child_exit(server, worker):
+    """Keep an exited worker's request counts in /metrics (its gauges are dropped)"""
+    server.app.wsgi().extensions['edunova'].metrics.mark_process_dead(worker.pid)
+
+
+def post_fork(server, worker):
+    """Per-worker start-up: background threads do not survive fork, so start them here"""
+    services = server.app.wsgi().extensions['edunova']
+    # Every worker runs the loop; the lease in stats_counters lets only one reconcile per interval
+    services.stats_counters.start_reconciler(Config.STATS_RECONCILE_INTERVAL)
+    server.log.info('Worker %s ready', worker.pid)
+
+
+class EduNovaServer(BaseApplication):
+    def __init__(self, options=None):
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key.lower(), value)
+
+    def load(self):
+        app = create_app()
+        services = app.extensions['edunova']
+        if not preflight(services):
+            sys.exit(1)
+        # Workers publish their metrics here so /metrics can add up all of them
+        services.metrics.use_directory(
+            Config.METRICS_DIR or os.path.join(tempfile.gettempdir(), f'edunova-metrics-{Config.PORT}'))
+        services.static_manifest.warm()
+        stats = services.static_file_cache.stats()
+        logger.info('Static file cache warmed: %d files, %d bytes', stats['entries'], stats['bytes'])
+        if self.cfg.workers > 1 and services.response_cache.backend.process_local:
+            # A write would invalidate only its own worker's cache; the others would serve
+            # the old response for up to RESPONSE_CACHE_TTL seconds
+            logger.warning('RESPONSE_CACHE_BACKEND=%s is per worker; response caching is off with %d workers. '
+                           'Set RESPONSE_CACHE_BACKEND=shared and REDIS_URL to cache across workers.',
+                           Config.RESPONSE_CACHE_BACKEND, self.cfg.workers)
+            services.response_cache.disable()
+        return app
+
+
+def server_options():
+    threads = max(1, Config.WEB_THREADS)
+    workers = Config.WEB_WORKERS or default_workers()
+    if Config.DATA_BACKEND == 'memory' and workers > 1:
+        # Each worker would get its own copy of the data and writes would diverge
+        logger.warning('DATA_BACKEND=memory keeps the data in one process; running 1 worker instead of %d', workers)
+        workers = 1
+    return {
+        'bind': f'{Config.HOST}:{Config.PORT}',
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'preload_app': True,
+        'timeout': Config.WEB_TIMEOUT,
+        'graceful_timeout': Config.WEB_GRACEFUL_TIMEOUT,
+        'accesslog': '-',
+        'post_fork': post_fork,
+        'worker_exit': worker_exit,
+        'child_exit': child_exit
+    }
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(process)d] %(levelname)s %(message)s')
+    options = server_options()
+    print("🚀 Starting EduNova Admin Backend (production)")
+    print(f"📍 Server: http://{options['bind']}")
+    print(f"👷 {options['workers']} workers x {options['threads']} threads ({options['worker_class']})")
+    EduNovaServer(options).run()
@@ -0,0 +1,164 @@
+import os
+import tempfile
+
+from flask import current_app
+from werkzeug.local import LocalProxy
+
+from bulk_jobs import BulkJobs
+from daily_rollups import DailyRollups
+from memory_store import MemoryStore
+from metrics import Metrics, MongoMetrics
+from mongo_client import LazyDatabase, LazyMongoClient
+from principal_cache import PrincipalCache
+from query_profiler import QueryProfiler
+from request_profiler import RequestProfiler
+from response_cache import ResponseCache, make_backend
+from single_flight import SingleFlight
+from static_assets import StaticAssets
+from static_cache import StaticFileCache
+from static_manifest import StaticManifest
+from stats_counters import StatsCounters
+
+# Attribute name -> MongoDB collection name
+COLLECTIONS = {
+    'students_collection': 'students',
+    'admins_collection': 'admins',
+    'courses_collection': 'courses',
+    'teachers_collection': 'teachers',
+    'registration_links_collection': 'registration_links',
+    'course_resources_collection': 'course_resources',
+    'timetable_collection': 'timetable_entries',
+    'feedback_collection': 'feedback',
+    'bulk_jobs_collection': 'bulk_jobs',
+    'daily_rollups_collection': 'daily_rollups',
+    'app_settings_collection': 'app_settings'
+}
+
+
+def make_store(config, event_listeners=()):
+    """The data store named by DATA_BACKEND: 'mongo' or 'memory'"""
+    backend = config['DATA_BACKEND']
+    if backend == 'memory':
+        return MemoryStore(config['DATABASE_NAME'])
+    if backend == 'mongo':
+        return LazyMongoClient(config['MONGODB_URI'], config['DATABASE_NAME'],
+                               event_listeners=list(event_listeners))
+    raise ValueError(f"DATA_BACKEND must be 'mongo' or 'memory', not {backend!r}")
+
+
+class Services:
+    """Everything the views of one app share, built from its config.
+
+    Creating it opens no connection: the MongoClient is made per process on
+    the first query (see mongo_client.py) and the collections below are
+    proxies onto it. With DATA_BACKEND=memory they are in-process collections
+    with the same interface instead (memory_store.py). The static asset build and route manifest are built
+    here, so a pre-fork master shares them with its workers.
+    """
+
+    def __init__(self, config):
+        # Request, MongoDB command and connection pool figures served at /metrics
+        self.metrics = Metrics(config['METRICS_DIR'] or None, flush_interval=config['METRICS_FLUSH_INTERVAL'])
+
+        # Per-shape MongoDB command timings and the slow-query log (explains go through this app's client)
+        self.query_profiler = QueryProfiler(
+            threshold_ms=config['SLOW_QUERY_MS'],
+            explain=config['SLOW_QUERY_EXPLAIN'],
+            client=lambda: self.store.client,
+            max_shapes=config['QUERY_PROFILER_SHAPES']
+        )
+
+        # On-demand cProfile of requests, written per endpoint to a directory all workers share
+        self.request_profiler = RequestProfiler(
+            config['PROFILE_DIR'] or os.path.join(tempfile.gettempdir(), f"edunova-profiles-{config['PORT']}"),
+            sample_rate=config['PROFILE_SAMPLE_RATE'],
+            keep=config['PROFILE_KEEP']
+        )
+
+        self.store = make_store(config, event_listeners=[MongoMetrics(self.metrics), self.query_profiler])
+        self.db = LazyDatabase(self.store)
+        for attribute, name in COLLECTIONS.items():
+            setattr(self, attribute, self.db[name])
+
+        # Small hot static files are kept in memory; larger ones go out via wsgi.file_wrapper
+        self.static_file_cache = StaticFileCache(
+            budget=config['STATIC_CACHE_BUDGET'],
+            max_file_size=config['STATIC_CACHE_MAX_FILE']
+        )
+
+        # Fingerprinted + precompressed copies of the frontend (rebuilt here when sources change)
+        self.static_assets = StaticAssets.load(
+            config['FRONTEND_DIR'], config['STATIC_BUILD_DIR'],
+            build=config['STATIC_BUILD'], file_cache=self.static_file_cache
+        )
+
+        # Every servable URL -> file, so static requests are one dict lookup (watched for changes in debug)
+        self.static_manifest = StaticManifest(config['FRONTEND_DIR'], self.static_assets, watch=config['DEBUG'])
+
+        # Background runner for bulk actions too large to finish inside one request
+        self.bulk_jobs = BulkJobs(self.bulk_jobs_collection)
+
+        # Collapses concurrent identical reads (cache misses, hot public endpoints) into one query
+        self.single_flight = SingleFlight(timeout=config['SINGLE_FLIGHT_TIMEOUT'])
+
+        # Cached GET responses, invalidated by collection tag from the write handlers
+        self.response_cache = ResponseCache(make_backend(
+            config['RESPONSE_CACHE_BACKEND'],
+            max_size=config['RESPONSE_CACHE_SIZE'],
+            ttl=config['RESPONSE_CACHE_TTL'],
+            redis_url=config['REDIS_URL']
+        ), single_flight=self.single_flight)
+
+        # Dashboard counters, maintained with $inc on every write path
+        self.stats_counters = StatsCounters(self.db)
+
+        # Per-day enrollment/completion counts behind the dashboard activity chart
+        self.daily_rollups = DailyRollups(self.daily_rollups_collection)
+
+        # Cache of authenticated admins so token_required does not hit Mongo per request
+        self.principal_cache = PrincipalCache(
+            max_size=config['PRINCIPAL_CACHE_SIZE'],
+            ttl=config['PRINCIPAL_CACHE_TTL']
+        )
+
+    def init_app(self, app, authorize_profiling=None):
+        app.extensions['edunova'] = self
+        # First, so the profile covers the other request hooks too
+        self.request_profiler.init_app(app, authorize=authorize_profiling)
+        self.response_cache.init_app(app)
+        self.single_flight.init_app(app)
+        self.metrics.init_app(app)
+
+
+def current_services():
+    return current_app.extensions['edunova']
+
+
+def _service(name):
+    return LocalProxy(lambda: getattr(current_services(), name))
+
+
+# The current app's services under the names the views use. They resolve
+# inside a request; code running outside one (background jobs) must be handed
+# the objects themselves via current_services().
+client = LocalProxy(lambda: current_services().store.client)
+students_collection = _service('students_collection')
+admins_collection = _service('admins_collection')
+courses_collection = _service('courses_collection')
+teachers_collection = _service('teachers_collection')
+registration_links_collection = _service('registration_links_collection')
+course_resources_collection = _service('course_resources_collection')
+timetable_collection = _service('timetable_collection')
+feedback_collection = _service('feedback_collection')
+app_settings_collection = _service('app_settings_collection')
+bulk_jobs = _service('bulk_jobs')
+response_cache = _service('response_cache')
+single_flight = _service('single_flight')
+stats_counters = _service('stats_counters')
+daily_rollups = _service('daily_rollups')
+principal_cache = _service('principal_cache')
+static_manifest = _service('static_manifest')
+static_file_cache = _service('static_file_cache')
+metrics = _service('metrics')
+query_profiler = _service('query_profiler')
+request_profiler = _service('request_profiler')
@@ -0,0 +1,133 @@
+import threading
+from functools import wraps
+
+from flask import current_app, request
+
+
+def request_key():
+    """Identify a GET request by endpoint, path parameters and normalized query string"""
+    view_args = '&'.join(f'{k}={v}' for k, v in sorted((request.view_args or {}).items()))
+    args = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+    return f'{request.endpoint}|{view_args}|{args}'
+
+
+def snapshot_response(response):
+    """Reduce a response to plain data that can be shared between requests"""
+    return {
+        'status': response.status_code,
+        'body': response.get_data(as_text=True),
+        'mimetype': response.mimetype
+    }
+
+
+def restore_response(snapshot):
+    """Build a fresh response object from ``snapshot_response`` output"""
+    response = current_app.response_class(
+        snapshot['body'], status=snapshot['status'], mimetype=snapshot['mimetype']
+    )
+    if snapshot.get('etag'):
+        response.set_etag(snapshot['etag'])
+    return response
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.returned = False
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Collapse concurrent identical calls into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and receive the same result (or exception).
+    Works across the threads of one process. A waiter that is still blocked
+    after ``timeout`` seconds gives up and runs the function itself, as do
+    the waiters of a caller interrupted by a BaseException (SystemExit,
+    GeneratorExit), which is not passed on to them.
+    """
+
+    def __init__(self, timeout=10):
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                with self._lock:
+                    self.timeouts += 1
+                return fn()
+            if call.error is not None:
+                raise call.error
+            if not call.returned:
+                return fn()
+            return call.result
+
+        try:
+            call.result = fn()
+            call.returned = True
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def init_app(self, app):
+        """Make this the instance used by the module-level ``coalesce`` decorator in ``app``"""
+        app.extensions['single_flight'] = self
+
+    def coalesce(self):
+        """Decorator for a GET view whose response depends only on its query string"""
+        def decorator(f):
+            @wraps(f)
+            def wrapper(*args, **kwargs):
+                return self.serve(f, args, kwargs)
+            return wrapper
+        return decorator
+
+    def serve(self, f, args, kwargs):
+        """Run the view for the current request, shared with identical requests in flight"""
+        if request.method != 'GET':
+            return f(*args, **kwargs)
+        key = request_key()
+        snapshot = self.do(key, lambda: snapshot_response(current_app.make_response(f(*args, **kwargs))))
+        return restore_response(snapshot)
+
+    def stats(self):
+        with self._lock:
+            calls = self.executions + self.coalesced
+            return {
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'coalesced_ratio': round(self.coalesced / calls, 4) if calls else 0.0,
+                'timeouts': self.timeouts,
+                'in_flight': len(self._calls)
+            }
+
+
+def coalesce():
+    """``SingleFlight.coalesce`` for blueprint views: uses the instance registered on the current app"""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            return current_app.extensions['single_flight'].serve(f, args, kwargs)
+        return wrapper
+    return decorator
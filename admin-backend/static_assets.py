@@ -0,0 +1,131 @@
+import logging
+import os
+
+from flask import request
+
+from asset_build import ensure_built, load_manifest
+from static_cache import StaticFileCache
+
+logger = logging.getLogger(__name__)
+
+# Preference order when the client accepts several encodings
+ENCODING_PREFERENCE = ('br', 'gzip')
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# Request headers carrying the displayed image width (client hints); ?w= takes precedence
+WIDTH_HINT_HEADERS = ('Sec-CH-Width', 'Width')
+IMAGE_VARY = ', '.join(('Accept',) + WIDTH_HINT_HEADERS)
+
+# Accept-CH sent with HTML pages, so browsers add Sec-CH-Width to the image
+# requests of the page. No Critical-CH: the page itself does not vary with it.
+ACCEPT_CH = 'Sec-CH-Width'
+
+
+def requested_width():
+    """Image width the client asked for via ?w= or a client hint, or None"""
+    for value in [request.args.get('w')] + [request.headers.get(name) for name in WIDTH_HINT_HEADERS]:
+        try:
+            width = int(float(value))
+        except (TypeError, ValueError):
+            continue
+        if width > 0:
+            return width
+    return None
+
+
+class StaticAssets:
+    """Serves the output of asset_build.py.
+
+    Fingerprinted URLs are cached for a year as immutable; original URLs
+    (and HTML pages) must be revalidated, which their ETag makes cheap.
+    A precompressed variant is chosen from Accept-Encoding, and for images
+    the smallest rendered variant that covers the requested width, WebP if
+    the client's Accept lists it.
+    """
+
+    def __init__(self, build_dir, manifest=None, build=True, file_cache=None):
+        self.build_dir = build_dir
+        self.build = build
+        self.files = (manifest or {}).get('files', {})
+        # Without a memory budget every file is streamed with send_file
+        self.file_cache = file_cache or StaticFileCache(budget=0)
+
+    @classmethod
+    def load(cls, frontend_dir, build_dir, build=True, file_cache=None):
+        """Load the manifest, (re)building first if ``build`` and the sources changed"""
+        try:
+            manifest = ensure_built(frontend_dir, build_dir) if build else load_manifest(build_dir)
+        except OSError as e:
+            logger.warning('static asset build failed, serving source files: %s', e)
+            manifest = None
+        return cls(build_dir, manifest, build, file_cache)
+
+    def reload(self, frontend_dir):
+        """Fresh instance for changed sources (rebuilt if this one was built)"""
+        return StaticAssets.load(frontend_dir, self.build_dir, self.build, self.file_cache)
+
+    def hashed_url(self, url_path):
+        entry = self.files.get(url_path)
+        return entry.get('hashed_url', url_path) if entry else url_path
+
+    def negotiate(self, entry):
+        """Pick the best precompressed encoding the client accepts, or None"""
+        accepted = request.accept_encodings
+        for encoding in ENCODING_PREFERENCE:
+            if encoding in entry['encodings'] and accepted[encoding]:
+                return encoding
+        return None
+
+    def choose_image(self, entry):
+        """Smallest image (a variant or ``entry`` itself) at least as wide as requested"""
+        accepts_webp = 'image/webp' in request.accept_mimetypes.values()
+        candidates = [
+            variant for variant in entry['variants']
+            if variant['content_type'] == entry['content_type'] or (accepts_webp and variant['content_type'] == 'image/webp')
+        ]
+        candidates.append(entry)
+        width = min(requested_width() or entry['width'], entry['width'])
+        return min((c for c in candidates if c['width'] >= width), key=lambda c: c['size'])
+
+    def warm(self):
+        """Preload every built file (and variant) small enough for the file cache"""
+        for entry in self.files.values():
+            files = [(entry['path'], entry['size'], entry['content_type'], entry['etag'])]
+            files += [(path, entry['size'], entry['content_type'], f"{entry['etag']}-{encoding}")
+                      for encoding, path in entry['encodings'].items()]
+            files += [(v['path'], v['size'], v['content_type'], v['etag']) for v in entry.get('variants', ())]
+            for path, size, content_type, etag in files:
+                self.file_cache.preload(os.path.join(self.build_dir, path), size, content_type, etag)
+
+    def send(self, url_path):
+        """Response for a built file, or None if ``url_path`` is not in the build"""
+        entry = self.files.get(url_path)
+        if entry is None:
+            return None
+        cache_control = IMMUTABLE_CACHE_CONTROL if entry['immutable'] else REVALIDATE_CACHE_CONTROL
+        if entry.get('variants'):
+            image = self.choose_image(entry)
+            return self.file_cache.send(
+                os.path.join(self.build_dir, image['path']),
+                image['size'],
+                image['content_type'],
+                image['etag'],
+                [('Cache-Control', cache_control), ('Vary', IMAGE_VARY)]
+            )
+        encoding = self.negotiate(entry)
+        relative = entry['encodings'][encoding] if encoding else entry['path']
+        headers = [('Cache-Control', cache_control)]
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+        if entry['encodings']:
+            headers.append(('Vary', 'Accept-Encoding'))
+        # The uncompressed size decides memory vs. file_wrapper, so variants of one file are treated alike
+        return self.file_cache.send(
+            os.path.join(self.build_dir, relative),
+            entry['size'],
+            entry['content_type'],
+            f"{entry['etag']}-{encoding}" if encoding else entry['etag'],
+            headers
+        )
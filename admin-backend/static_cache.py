@@ -0,0 +1,113 @@
+import os
+import threading
+from collections import OrderedDict
+
+from flask import current_app, request, send_file
+from werkzeug.http import quote_etag
+from werkzeug.utils import get_content_type
+
+
+class StaticFileCache:
+    """Serves static files, keeping small ones in memory.
+
+    Files up to ``max_file_size`` bytes are read once and kept as immutable
+    bytes together with their precomputed Content-Type, ETag and
+    modification time, evicting the least recently used once ``budget``
+    bytes are held. Both kinds answer conditional and Range requests. Larger files go
+    through ``send_file``, which hands the open file to the server's
+    ``wsgi.file_wrapper`` (sendfile under gunicorn) so their contents are
+    never copied through Python.
+
+    Entries are keyed by path and ETag, so a changed file is a new entry;
+    the per-URL ``headers`` are not part of the entry, so URLs sharing a file
+    (original and fingerprinted names) share its bytes.
+    """
+
+    def __init__(self, budget=32 * 1024 * 1024, max_file_size=256 * 1024):
+        self.budget = budget
+        self.max_file_size = max_file_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.large_files = 0
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _put(self, key, entry):
+        size = len(entry[0])
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = entry
+            self.used += size
+            while self.used > self.budget and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.used -= len(evicted[0])
+                self.evictions += 1
+
+    def fits(self, size):
+        return size <= self.max_file_size and size <= self.budget
+
+    def _load(self, path, content_type, etag):
+        with open(path, 'rb') as f:
+            body = f.read()
+            mtime = os.fstat(f.fileno()).st_mtime
+        entry = (body, ('Content-Type', get_content_type(content_type, 'utf-8')), ('ETag', quote_etag(etag)), mtime)
+        self._put((path, etag), entry)
+        return entry
+
+    def preload(self, path, size, content_type, etag):
+        """Read ``path`` into the cache ahead of the first request; False if it is not cacheable"""
+        if not self.fits(size):
+            return False
+        with self._lock:
+            if (path, etag) in self._entries:
+                return True
+        self._load(path, content_type, etag)
+        return True
+
+    def send(self, path, size, content_type, etag, headers=()):
+        """Response for ``path``; ``headers`` (Cache-Control, Content-Encoding...) are added as-is"""
+        if not self.fits(size):
+            with self._lock:
+                self.large_files += 1
+            response = send_file(path, mimetype=content_type, etag=etag, conditional=True)
+            for name, value in headers:
+                response.headers[name] = value
+            return response
+
+        entry = self._get((path, etag))
+        if entry is None:
+            entry = self._load(path, content_type, etag)
+
+        body, content_type_header, etag_header, mtime = entry
+        response = current_app.response_class(body, headers=[content_type_header, etag_header, *headers])
+        # Last-Modified as send_file sets it, for If-Modified-Since and If-Range
+        response.last_modified = mtime
+        return response.make_conditional(request, accept_ranges=True, complete_length=len(body))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.used,
+                'budget_bytes': self.budget,
+                'max_file_bytes': self.max_file_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'large_file_sends': self.large_files
+            }
@@ -0,0 +1,174 @@
+import hashlib
+import mimetypes
+import os
+import threading
+import time
+
+from asset_build import iter_source_files
+
+# Page URLs that do not mirror a file path
+PAGE_ALIASES = {
+    '/': '/public/index.html',
+    '/index.html': '/public/index.html',
+    '/about': '/public/about.html',
+    '/courses': '/public/courses.html',
+    '/timetable': '/public/timetable.html',
+    '/contact': '/public/Contact.html',
+    '/admin': '/admin/Dashboard.html',
+    '/admin/': '/admin/Dashboard.html'
+}
+
+# Short legacy prefixes (/js/x.js, /css/x.css, /assets/x) and the roots searched for them, in order
+LEGACY_PREFIXES = (
+    ('js', ('shared', 'admin', 'public')),
+    ('css', ('shared', 'public', 'admin')),
+    ('assets', ('shared',))
+)
+
+# Legacy /page.html URLs are looked up in these roots, in order
+LEGACY_HTML_ROOTS = ('public', 'admin')
+
+# Files directly under the frontend directory that may be served (e.g. /register.html)
+TOP_LEVEL_EXTENSIONS = ('.html', '.css', '.js', '.ico', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.txt')
+
+
+def file_entry(path, source):
+    """Stat ``path`` once and record what serving it needs"""
+    stat = os.stat(path)
+    content_type, _ = mimetypes.guess_type(path)
+    return {
+        'file': path,
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'content_type': content_type or 'application/octet-stream',
+        'source': source
+    }
+
+
+def build_routes(frontend_dir, asset_files=None):
+    """Map every servable URL path to its file entry.
+
+    ``source`` is the canonical /public|/admin|/shared URL of the file, used
+    to find its built variant; the first rule to claim a URL wins, in the
+    same order the old try/except cascade tried directories.
+    """
+    routes = {}
+    canonical = {}
+    for url_path, path in iter_source_files(frontend_dir):
+        canonical[url_path] = path
+        routes[url_path] = file_entry(path, url_path)
+
+    for alias, target in PAGE_ALIASES.items():
+        if target in routes:
+            routes.setdefault(alias, routes[target])
+
+    for root in LEGACY_HTML_ROOTS:
+        prefix = f'/{root}/'
+        for url_path, entry in list(routes.items()):
+            if url_path.startswith(prefix) and url_path.endswith('.html') and entry['source'] == url_path:
+                routes.setdefault('/' + url_path[len(prefix):], entry)
+
+    for short, roots in LEGACY_PREFIXES:
+        for root in roots:
+            prefix = f'/{root}/{short}/'
+            for url_path in canonical:
+                if url_path.startswith(prefix):
+                    routes.setdefault(f'/{short}/{url_path[len(prefix):]}', routes[url_path])
+
+    for name in sorted(os.listdir(frontend_dir)):
+        path = os.path.join(frontend_dir, name)
+        if name.lower().endswith(TOP_LEVEL_EXTENSIONS) and os.path.isfile(path):
+            routes.setdefault('/' + name, file_entry(path, None))
+
+    # Fingerprinted names exist only in the asset build
+    for url_path, asset in (asset_files or {}).items():
+        if asset.get('immutable'):
+            routes.setdefault(url_path, {
+                'file': None,
+                'size': asset['size'],
+                'mtime': None,
+                'content_type': asset['content_type'],
+                'source': url_path
+            })
+    return routes
+
+
+def frontend_signature(frontend_dir):
+    """Changes whenever any servable file is added, removed or modified"""
+    digest = hashlib.blake2b(digest_size=16)
+    paths = [path for _, path in iter_source_files(frontend_dir)]
+    paths += [os.path.join(frontend_dir, name) for name in sorted(os.listdir(frontend_dir))
+              if name.lower().endswith(TOP_LEVEL_EXTENSIONS)]
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f'{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class StaticManifest:
+    """URL path -> file table for every frontend file, built once.
+
+    Resolving a request is one dict lookup; a miss is answered without any
+    filesystem access. With ``watch`` (development), the sources are checked
+    at most every ``watch_interval`` seconds and the asset build and table
+    are rebuilt when something changed.
+    """
+
+    def __init__(self, frontend_dir, assets, watch=False, watch_interval=1.0):
+        self.frontend_dir = frontend_dir
+        self.assets = assets
+        self.watch = watch
+        self.watch_interval = watch_interval
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._signature = frontend_signature(frontend_dir) if watch else None
+        self.routes = build_routes(frontend_dir, assets.files)
+
+    def refresh_if_changed(self):
+        now = time.monotonic()
+        if not self.watch or now - self._checked_at < self.watch_interval:
+            return
+        with self._lock:
+            if now - self._checked_at < self.watch_interval:
+                return
+            self._checked_at = now
+            signature = frontend_signature(self.frontend_dir)
+            if signature == self._signature:
+                return
+            self.assets = self.assets.reload(self.frontend_dir)
+            self.routes = build_routes(self.frontend_dir, self.assets.files)
+            self._signature = signature
+
+    def lookup(self, url_path):
+        self.refresh_if_changed()
+        return self.routes.get(url_path)
+
+    def warm(self):
+        """Load the static file cache before serving (in a pre-fork master, before forking)"""
+        self.assets.warm()
+        for entry in self.routes.values():
+            if entry['file'] is not None and entry['source'] not in self.assets.files:
+                self.assets.file_cache.preload(
+                    entry['file'], entry['size'], entry['content_type'], f"{int(entry['mtime'])}-{entry['size']}"
+                )
+
+    def send(self, url_path):
+        """Response for ``url_path``, or None if it is not a frontend file"""
+        entry = self.lookup(url_path)
+        if entry is None:
+            return None
+        if entry['source'] is not None:
+            response = self.assets.send(entry['source'])
+            if response is not None:
+                return response
+        if entry['file'] is None:
+            return None
+        return self.assets.file_cache.send(
+            entry['file'],
+            entry['size'],
+            entry['content_type'],
+            f"{int(entry['mtime'])}-{entry['size']}"
+        )
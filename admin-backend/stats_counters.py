@@ -0,0 +1,270 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_ID = 'dashboard'
+
+# Day buckets kept for the "last 7 days" figures
+RECENT_DAYS = 7
+
+# Attempts at storing a reconcile before giving up until the next interval
+RECONCILE_ATTEMPTS = 3
+
+
+def day_key(when):
+    return when.strftime('%Y-%m-%d')
+
+
+def status_key(status):
+    """``status`` as a field name under ``*_by_status``.
+
+    Statuses come from clients; '.' and '$' would turn them into a nested
+    path or an operator, so those (and '%', the escape) are percent-encoded.
+    """
+    key = str(status).replace('%', '%25').replace('.', '%2E').replace('$', '%24')
+    return key or '%20'
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class StatsCounters:
+    """Materialized dashboard counters kept in a single ``stats_counters`` document.
+
+    Write paths call the ``*_created``/``*_changed``/``*_deleted`` helpers,
+    which apply an atomic ``$inc``. A failed increment is logged and never
+    fails the request; ``reconcile`` recomputes everything from the source
+    collections and is run periodically to correct any drift. Every
+    increment also bumps ``version``, so a reconcile that raced with one is
+    retried rather than stored over it.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.collection = db.stats_counters
+        self._reconciler = None
+
+    # -- increments -------------------------------------------------------
+
+    def incr(self, deltas):
+        deltas = {field: value for field, value in deltas.items() if value}
+        if not deltas:
+            return
+        try:
+            self.collection.update_one({'_id': COUNTERS_ID}, {'$inc': dict(deltas, version=1)}, upsert=True)
+        except Exception as e:
+            logger.warning('stats counter update failed, will be fixed by reconcile: %s', e)
+
+    def status_changed(self, kind, old_status, new_status, count=1):
+        if old_status == new_status:
+            return
+        self.incr({
+            f'{kind}_by_status.{status_key(old_status)}': -count,
+            f'{kind}_by_status.{status_key(new_status)}': count
+        })
+
+    def _student_deltas(self, students, sign):
+        deltas = {}
+        for student in students:
+            fields = [f"students_by_status.{status_key(student.get('status'))}"]
+            if student.get('created_at'):
+                fields.append(f"students_by_day.{day_key(student['created_at'])}")
+            for field in fields:
+                deltas[field] = deltas.get(field, 0) + sign
+        return deltas
+
+    def students_created(self, students):
+        self.incr(self._student_deltas(students, 1))
+
+    def students_deleted(self, students):
+        self.incr(self._student_deltas(students, -1))
+
+    def record_created(self, kind, status):
+        """A course or teacher was inserted with ``status``"""
+        self.incr({f'{kind}_by_status.{status_key(status)}': 1})
+
+    def record_deleted(self, kind, status, count=1):
+        self.incr({f'{kind}_by_status.{status_key(status)}': -count})
+
+    def admin_activated(self, count=1):
+        self.incr({'admins_active': count})
+
+    def _feedback_deltas(self, feedbacks, sign):
+        deltas = {}
+        for feedback in feedbacks:
+            for field, value in ((f"feedback_by_status.{status_key(feedback.get('status'))}", 1), ('feedback_total', 1)):
+                deltas[field] = deltas.get(field, 0) + sign * value
+            if _is_number(feedback.get('rating')):
+                deltas['feedback_rating_sum'] = deltas.get('feedback_rating_sum', 0) + sign * feedback['rating']
+                deltas['feedback_rating_count'] = deltas.get('feedback_rating_count', 0) + sign
+            if feedback.get('created_at'):
+                field = f"feedback_by_day.{day_key(feedback['created_at'])}"
+                deltas[field] = deltas.get(field, 0) + sign
+        return deltas
+
+    def feedback_created(self, feedbacks):
+        self.incr(self._feedback_deltas(feedbacks, 1))
+
+    def feedback_deleted(self, feedbacks):
+        self.incr(self._feedback_deltas(feedbacks, -1))
+
+    # -- bulk helpers -----------------------------------------------------
+
+    @staticmethod
+    def status_counts(collection, ids):
+        """Count documents per status among ``ids`` (used before bulk writes)"""
+        return {row['_id']: row['count'] for row in collection.aggregate([
+            {'$match': {'_id': {'$in': ids}}},
+            {'$group': {'_id': '$status', 'count': {'$sum': 1}}}
+        ])}
+
+    def bulk_status_changed(self, kind, counts, new_status):
+        deltas = {}
+        new_field = f'{kind}_by_status.{status_key(new_status)}'
+        for status, count in counts.items():
+            if status != new_status:
+                field = f'{kind}_by_status.{status_key(status)}'
+                deltas[field] = deltas.get(field, 0) - count
+                deltas[new_field] = deltas.get(new_field, 0) + count
+        self.incr(deltas)
+
+    # -- reads ------------------------------------------------------------
+
+    def get(self):
+        doc = self.collection.find_one({'_id': COUNTERS_ID})
+        if doc is None or 'reconciled_at' not in doc:
+            doc = self.reconcile()
+        return doc
+
+    def dashboard_stats(self):
+        """Build the /api/dashboard/stats figures from the counters document"""
+        doc = self.get()
+        students = doc.get('students_by_status', {})
+        today = datetime.utcnow()
+        recent_days = [day_key(today - timedelta(days=i)) for i in range(RECENT_DAYS)]
+        active_students = students.get('active', 0)
+        rating_count = doc.get('feedback_rating_count', 0)
+        avg_rating = round(doc.get('feedback_rating_sum', 0) / rating_count, 1) if rating_count else 4.8
+        return {
+            'total_students': active_students,
+            'total_courses': doc.get('courses_by_status', {}).get('active', 0),
+            'total_teachers': doc.get('teachers_by_status', {}).get('active', 0),
+            'total_admins': doc.get('admins_active', 0),
+            'total_feedbacks': doc.get('feedback_total', 0),
+            'pending_feedbacks': doc.get('feedback_by_status', {}).get('pending', 0),
+            'recent_registrations': sum(doc.get('students_by_day', {}).get(d, 0) for d in recent_days),
+            'recent_feedbacks': sum(doc.get('feedback_by_day', {}).get(d, 0) for d in recent_days),
+            'pending_registrations': students.get('pending', 0),
+            'completion_rate': round((students.get('completed', 0) / max(active_students, 1)) * 100, 1),
+            'avg_rating': avg_rating
+        }
+
+    # -- reconciliation ---------------------------------------------------
+
+    def _count_by_status(self, collection):
+        return {status_key(row['_id']): row['count'] for row in collection.aggregate([
+            {'$group': {'_id': '$status', 'count': {'$sum': 1}}}
+        ])}
+
+    def _count_by_day(self, collection, since):
+        return {row['_id']: row['count'] for row in collection.aggregate([
+            {'$match': {'created_at': {'$gte': since}}},
+            {'$group': {
+                '_id': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$created_at'}},
+                'count': {'$sum': 1}
+            }}
+        ])}
+
+    def reconcile(self):
+        """Recompute every counter from the source collections and store the result.
+
+        The result replaces the document only if no increment landed while
+        it was being computed (``version`` unchanged); otherwise it is
+        computed again, up to RECONCILE_ATTEMPTS times.
+        """
+        for _ in range(RECONCILE_ATTEMPTS):
+            current = self.collection.find_one({'_id': COUNTERS_ID}, {'version': 1})
+            doc = self._recompute()
+            if current is None:
+                doc['version'] = 0
+                try:
+                    self.collection.insert_one(doc)
+                    return doc
+                except DuplicateKeyError:
+                    continue
+            version = current.get('version')
+            doc['version'] = (version or 0) + 1
+            guard = {'_id': COUNTERS_ID, 'version': version if version is not None else {'$exists': False}}
+            if self.collection.replace_one(guard, doc).matched_count:
+                return doc
+        logger.warning('stats counters kept changing during reconcile, retrying next interval')
+        return doc
+
+    def _recompute(self):
+        db = self.db
+        now = datetime.utcnow()
+        since = datetime(now.year, now.month, now.day) - timedelta(days=RECENT_DAYS - 1)
+        rating = list(db.feedback.aggregate([
+            {'$match': {'rating': {'$type': 'number'}}},
+            {'$group': {'_id': None, 'sum': {'$sum': '$rating'}, 'count': {'$sum': 1}}}
+        ]))
+        return {
+            '_id': COUNTERS_ID,
+            'students_by_status': self._count_by_status(db.students),
+            'students_by_day': self._count_by_day(db.students, since),
+            'courses_by_status': self._count_by_status(db.courses),
+            'teachers_by_status': self._count_by_status(db.teachers),
+            'admins_active': db.admins.count_documents({'is_active': True}),
+            'feedback_total': db.feedback.count_documents({}),
+            'feedback_by_status': self._count_by_status(db.feedback),
+            'feedback_by_day': self._count_by_day(db.feedback, since),
+            'feedback_rating_sum': rating[0]['sum'] if rating else 0,
+            'feedback_rating_count': rating[0]['count'] if rating else 0,
+            'reconciled_at': now
+        }
+
+    def _claim_reconcile(self, interval):
+        """Atomically claim this interval's reconcile so only one worker runs it"""
+        cutoff = datetime.utcnow() - timedelta(seconds=interval)
+        claimed = self.collection.find_one_and_update(
+            {'_id': COUNTERS_ID, 'reconciled_at': {'$lt': cutoff}},
+            {'$set': {'reconciled_at': datetime.utcnow()}},
+            projection={'_id': 1},
+            return_document=ReturnDocument.AFTER
+        )
+        return claimed is not None
+
+    def start_reconciler(self, interval):
+        """Reconcile every ``interval`` seconds on a daemon thread"""
+        if self._reconciler is not None or interval <= 0:
+            return
+
+        def loop():
+            stop = threading.Event()
+            while not stop.wait(interval):
+                try:
+                    missing = self.collection.find_one({'_id': COUNTERS_ID}, {'_id': 1}) is None
+                    if missing or self._claim_reconcile(interval):
+                        self.reconcile()
+                except Exception as e:
+                    logger.warning('stats counter reconcile failed: %s', e)
+
+        self._reconciler = threading.Thread(target=loop, name='stats-reconciler', daemon=True)
+        self._reconciler.start()
+
+
+if __name__ == '__main__':
+    from pymongo import MongoClient
+    from config import Config
+
+    client = MongoClient(Config.MONGODB_URI)
+    counters = StatsCounters(client[Config.DATABASE_NAME])
+    counters.reconcile()
+    print("✅ Dashboard counters reconciled")
+    client.close()
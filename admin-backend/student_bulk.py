@@ -0,0 +1,121 @@
+from datetime import datetime
+
+from bson import ObjectId
+
+from student_search import search_query
+
+# Actions accepted by POST /api/students/bulk-action
+BULK_ACTIONS = ('set_status', 'reassign_course', 'delete')
+
+# Keys a filter-based selection may use
+FILTER_KEYS = ('status', 'course', 'search')
+
+
+def build_filter(selection):
+    """Translate a bulk-action ``filter`` object into a Mongo query.
+
+    Raises ValueError for unknown keys or an empty filter, so a request can
+    never silently select every student.
+    """
+    if not isinstance(selection, dict) or not selection:
+        raise ValueError('filter must be a non-empty object')
+    unknown = [key for key in selection if key not in FILTER_KEYS]
+    if unknown:
+        raise ValueError(f'Unsupported filter key: {unknown[0]}')
+
+    clauses = []
+    if selection.get('status'):
+        clauses.append({'status': selection['status']})
+    if selection.get('course'):
+        clauses.append({'course': selection['course']})
+    if selection.get('search'):
+        clauses.append(search_query(selection['search']))
+    if not clauses:
+        raise ValueError('filter must be a non-empty object')
+    return clauses[0] if len(clauses) == 1 else {'$and': clauses}
+
+
+def build_update(action, data, admin_id):
+    """Return the $set document for an update action, or None for delete"""
+    if action == 'delete':
+        return None
+    if action == 'set_status':
+        field = 'status'
+    else:
+        field = 'course'
+    value = data.get(field)
+    if not value or not isinstance(value, str):
+        raise ValueError(f'{field} is required for {action}')
+    return {'$set': {
+        field: value,
+        'updated_at': datetime.utcnow(),
+        'updated_by': admin_id
+    }}
+
+
+def iter_id_chunks(ids, chunk_size):
+    """Split an explicit id list into ObjectId chunks"""
+    object_ids = [ObjectId(sid) for sid in ids]
+    for start in range(0, len(object_ids), chunk_size):
+        yield object_ids[start:start + chunk_size]
+
+
+def iter_filter_chunks(collection, query, chunk_size):
+    """Yield _id chunks matching ``query`` in _id order.
+
+    Each chunk restarts from the last seen _id, so documents changed by an
+    earlier chunk can never shift the ones still to be visited.
+    """
+    last_id = None
+    while True:
+        chunk_query = query if last_id is None else {'$and': [query, {'_id': {'$gt': last_id}}]}
+        ids = [doc['_id'] for doc in collection.find(chunk_query, {'_id': 1})
+               .sort('_id', 1)
+               .limit(chunk_size)]
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def apply_in_chunks(collection, chunks, update, counters=None, rollups=None):
+    """Apply an update (or delete when update is None) chunk by chunk.
+
+    Yields cumulative counts after every chunk so callers can report progress.
+    When ``counters`` (a StatsCounters) is given, the per-status dashboard
+    counters are adjusted for deletes and status changes. When ``rollups``
+    (a DailyRollups) is given, students newly set to completed get a
+    ``completed_at`` and are counted as that day's completions.
+    """
+    new_status = None if update is None else update['$set'].get('status')
+    track = counters is not None and (update is None or new_status is not None)
+    completing = rollups is not None and new_status == 'completed'
+    progress = {'processed': 0, 'matched': 0, 'modified': 0, 'deleted': 0}
+    for ids in chunks:
+        selector = {'_id': {'$in': ids}}
+        if track and update is None:
+            removed = list(collection.find(selector, {'status': 1, 'created_at': 1}))
+        elif track:
+            status_counts = counters.status_counts(collection, ids)
+        if completing:
+            newly_completed = [doc['_id'] for doc in collection.find(
+                {'_id': {'$in': ids}, 'status': {'$ne': 'completed'}}, {'_id': 1}
+            )]
+        if update is None:
+            result = collection.delete_many(selector)
+            progress['matched'] += result.deleted_count
+            progress['deleted'] += result.deleted_count
+        else:
+            result = collection.update_many(selector, update)
+            progress['matched'] += result.matched_count
+            progress['modified'] += result.modified_count
+        if track and update is None:
+            counters.students_deleted(removed)
+        elif track:
+            counters.bulk_status_changed('students', status_counts, new_status)
+        if completing and newly_completed:
+            completed_at = update['$set']['updated_at']
+            collection.update_many({'_id': {'$in': newly_completed}}, {'$set': {'completed_at': completed_at}})
+            rollups.completions(completed_at, len(newly_completed))
+        progress['processed'] += len(ids)
+        yield dict(progress)
@@ -0,0 +1,171 @@
+import csv
+import json
+from datetime import datetime
+
+from pymongo.errors import BulkWriteError
+
+from student_search import search_fields
+
+# Fields a student record must provide (same rules as POST /api/students)
+REQUIRED_STUDENT_FIELDS = ['full_name', 'email', 'student_id', 'course', 'phone']
+
+# Optional fields accepted from a create request or an import row
+OPTIONAL_STUDENT_FIELDS = ['address', 'date_of_birth', 'enrollment_date', 'status']
+
+# Stop listing row errors after this many; counts stay exact
+MAX_REPORTED_ERRORS = 1000
+
+
+def missing_student_field(data):
+    """Return the first required field missing from data, or None"""
+    for field in REQUIRED_STUDENT_FIELDS:
+        if field not in data:
+            return field
+    return None
+
+
+def build_student_document(data, created_by, now=None):
+    """Build the stored student document from validated input"""
+    now = now or datetime.utcnow()
+    student_data = {
+        'full_name': data['full_name'],
+        'email': data['email'],
+        'student_id': data['student_id'],
+        'course': data['course'],
+        'phone': data['phone'],
+        'address': data.get('address', ''),
+        'date_of_birth': data.get('date_of_birth'),
+        'enrollment_date': data.get('enrollment_date', now.isoformat()),
+        'status': data.get('status', 'active'),
+        'created_at': now,
+        'created_by': created_by
+    }
+    student_data.update(search_fields(student_data))
+    return student_data
+
+
+def iter_lines(stream, chunk_size=64 * 1024):
+    """Yield decoded lines (newline included) from a binary stream, one chunk at a time"""
+    pending = b''
+    first = True
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        if first:
+            # Spreadsheet exports often start with a UTF-8 byte order mark
+            if chunk.startswith(b'\xef\xbb\xbf'):
+                chunk = chunk[3:]
+            first = False
+        pending += chunk
+        lines = pending.split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line.decode('utf-8') + '\n'
+    if pending:
+        yield pending.decode('utf-8')
+
+
+def iter_csv_rows(stream):
+    """Yield (row_number, data, error) for every CSV data row; row 1 is the header"""
+    reader = csv.DictReader(iter_lines(stream))
+    for data in reader:
+        row_number = reader.line_num
+        # Blank cells count as missing so the row is reported, not stored half empty
+        yield row_number, {k.strip(): v.strip() for k, v in data.items()
+                           if k and v is not None and v.strip() != ''}, None
+
+
+def iter_ndjson_rows(stream):
+    """Yield (row_number, data, error) for every non-empty NDJSON line"""
+    for row_number, line in enumerate(iter_lines(stream), 1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield row_number, None, 'Invalid JSON'
+            continue
+        if not isinstance(data, dict):
+            yield row_number, None, 'Each line must be a JSON object'
+            continue
+        yield row_number, data, None
+
+
+class ImportReport:
+    """Accumulates per-row results of a bulk import"""
+
+    def __init__(self):
+        self.received = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, row, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row, 'message': message})
+
+    def to_dict(self):
+        return {
+            'received': self.received,
+            'inserted': self.inserted,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors)
+        }
+
+
+def _flush(collection, batch, report, on_inserted=None):
+    """Insert one batch unordered and map write errors back to their rows"""
+    if not batch:
+        return
+    rows = [row for row, _ in batch]
+    docs = [doc for _, doc in batch]
+    failed = set()
+    try:
+        result = collection.insert_many(docs, ordered=False)
+        report.inserted += len(result.inserted_ids)
+    except BulkWriteError as e:
+        details = e.details
+        report.inserted += details.get('nInserted', 0)
+        for error in details.get('writeErrors', []):
+            failed.add(error['index'])
+            if error.get('code') == 11000:
+                key = ', '.join(f'{k}={v}' for k, v in (error.get('keyValue') or {}).items())
+                message = f'Student already exists ({key})' if key else 'Student already exists'
+            else:
+                message = error.get('errmsg', 'Write failed')
+            report.add_error(rows[error['index']], message)
+    if on_inserted is not None:
+        on_inserted([doc for index, doc in enumerate(docs) if index not in failed])
+
+
+def import_students(collection, rows, created_by, batch_size=1000, on_inserted=None):
+    """Validate and insert rows in unordered batches.
+
+    ``rows`` is an iterator of (row_number, data, error) as produced by
+    iter_csv_rows/iter_ndjson_rows, so the upload is never held in memory.
+    Duplicates are left to the unique email/student_id indexes and reported
+    per row. ``on_inserted`` is called with the documents each batch stored.
+    """
+    report = ImportReport()
+    batch = []
+    now = datetime.utcnow()
+    for row_number, data, error in rows:
+        report.received += 1
+        if error:
+            report.add_error(row_number, error)
+            continue
+        missing = missing_student_field(data)
+        if missing:
+            report.add_error(row_number, f'{missing} is required')
+            continue
+        student = {k: data[k] for k in REQUIRED_STUDENT_FIELDS + OPTIONAL_STUDENT_FIELDS if k in data}
+        batch.append((row_number, build_student_document(student, created_by, now)))
+        if len(batch) >= batch_size:
+            _flush(collection, batch, report, on_inserted)
+            batch = []
+            now = datetime.utcnow()
+    _flush(collection, batch, report, on_inserted)
+    return report
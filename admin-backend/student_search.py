@@ -0,0 +1,128 @@
+import re
+
+from pymongo import UpdateOne
+
+# Fields the admin search box matches against
+SEARCH_FIELDS = ('full_name', 'email', 'student_id')
+
+# Upper bound on how deep a ranked search can be paged
+MAX_SEARCH_RESULTS = 1000
+
+
+def normalize(value):
+    """Lowercase and collapse whitespace so stored and typed values compare equal"""
+    return ' '.join(str(value).split()).lower()
+
+
+def search_fields(doc):
+    """Return the normalized search fields derived from a (partial) student document.
+
+    Only fields present in ``doc`` are returned, so this can be merged into
+    both inserts and ``$set`` updates.
+    """
+    fields = {}
+    for field in SEARCH_FIELDS:
+        if doc.get(field) is not None:
+            fields[f'{field}_lower'] = normalize(doc[field])
+    if doc.get('full_name') is not None:
+        fields['name_tokens'] = normalize(doc['full_name']).split()
+    return fields
+
+
+def _text_terms(term):
+    """User input as a $search string that requires every word.
+
+    Each word is quoted (MongoDB ANDs phrases) so "jane doe" does not match
+    every Jane, and stripped to \w+ so $text never sees negations. Input that
+    looks like an email or student id gets no $text tier at all: its pieces
+    ("com", "2024") match unrelated students; the exact and prefix tiers
+    find it.
+    """
+    if _looks_like_identifier(term):
+        return ''
+    return ' '.join(f'"{word}"' for word in re.findall(r'\w+', term))
+
+
+def _looks_like_identifier(term):
+    return '@' in term or any(char.isdigit() for char in term)
+
+
+def _prefix_query(term):
+    prefix = {'$regex': '^' + re.escape(term)}
+    return {'$or': [
+        {'student_id_lower': prefix},
+        {'email_lower': prefix},
+        {'full_name_lower': prefix},
+        {'name_tokens': prefix}
+    ]}
+
+
+def search_query(term):
+    """Filter matching every student the ranked search can return"""
+    term = normalize(term)
+    clauses = _prefix_query(term)['$or']
+    words = _text_terms(term)
+    if words:
+        clauses.append({'$text': {'$search': words}})
+    return {'$or': clauses}
+
+
+def search_students(collection, term, skip=0, limit=10, projection=None):
+    """Return ranked students matching ``term``.
+
+    Results come from index-backed tiers, in order: exact student id or
+    email, prefix of student id, email, full name or any name word, then
+    $text matches of every word, ranked by score. Each tier only reads
+    ``skip + limit`` documents and later tiers are skipped once enough
+    results have been collected.
+    """
+    term = normalize(term)
+    wanted = min(skip + limit, MAX_SEARCH_RESULTS)
+    if not term or wanted <= skip:
+        return []
+
+    results = []
+    seen = set()
+
+    def collect(cursor):
+        for doc in cursor:
+            if doc['_id'] not in seen:
+                seen.add(doc['_id'])
+                results.append(doc)
+
+    exact = {'$or': [{'student_id_lower': term}, {'email_lower': term}]}
+    collect(collection.find(exact, projection).limit(wanted))
+
+    # One unsorted query per prefix field: each is a single index range scan
+    # that stops after ``wanted`` keys, so short prefixes never trigger a
+    # blocking sort over thousands of matches
+    for clause in _prefix_query(term)['$or']:
+        if len(results) >= wanted:
+            break
+        collect(collection.find(clause, projection).limit(wanted))
+
+    words = _text_terms(term)
+    if words and len(results) < wanted:
+        collect(collection.find({'$text': {'$search': words}}, projection)
+                .sort([('score', {'$meta': 'textScore'})])
+                .limit(wanted))
+
+    return results[skip:wanted]
+
+
+def backfill_search_fields(collection, batch_size=1000):
+    """Populate normalized search fields on students created before they existed"""
+    updated = 0
+    batch = []
+    cursor = collection.find(
+        {'full_name_lower': {'$exists': False}},
+        {field: 1 for field in SEARCH_FIELDS}
+    ).batch_size(batch_size)
+    for doc in cursor:
+        batch.append(UpdateOne({'_id': doc['_id']}, {'$set': search_fields(doc)}))
+        if len(batch) >= batch_size:
+            updated += collection.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        updated += collection.bulk_write(batch, ordered=False).modified_count
+    return updated
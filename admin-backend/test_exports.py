@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming export endpoints
+Run this after starting the Flask server
+"""
+
+import json
+import requests
+
+def test_exports():
+    """Download each export in both formats and check the columns"""
+
+    base_url = "http://127.0.0.1:5000/api"
+
+    print("🧪 Testing exports...")
+
+    # 1. Login as admin
+    print("\n1. Logging in as admin...")
+    login_data = {"username": "admin", "password": "admin123"}
+
+    try:
+        response = requests.post(f"{base_url}/admin/login", json=login_data)
+        if response.status_code == 200:
+            token = response.json()['token']
+            print("✅ Login successful")
+        else:
+            print(f"❌ Login failed: {response.status_code}")
+            return
+    except Exception as e:
+        print(f"❌ Login error: {e}")
+        return
+
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # 2. CSV exports with a column projection
+    print("\n2. Exporting CSV...")
+    for resource, fields in [("students", "student_id,full_name,email"),
+                             ("teachers", "name,email"),
+                             ("courses", "code,name,fee")]:
+        try:
+            with requests.get(f"{base_url}/{resource}/export",
+                              params={"format": "csv", "fields": fields},
+                              headers=headers, stream=True) as response:
+                if response.status_code != 200:
+                    print(f"❌ {resource} CSV export failed: {response.status_code}")
+                    continue
+                lines = [line for line in response.iter_lines(decode_unicode=True) if line]
+                if lines and lines[0] == fields:
+                    print(f"✅ {resource}: {len(lines) - 1} rows with columns {fields}")
+                else:
+                    print(f"❌ {resource}: unexpected header {lines[:1]}")
+        except Exception as e:
+            print(f"❌ Error exporting {resource}: {e}")
+
+    # 3. NDJSON export
+    print("\n3. Exporting students as NDJSON...")
+    try:
+        with requests.get(f"{base_url}/students/export",
+                          params={"format": "ndjson", "fields": "_id,email"},
+                          headers=headers, stream=True) as response:
+            rows = [json.loads(line) for line in response.iter_lines() if line]
+            if all(set(row) == {"_id", "email"} for row in rows):
+                print(f"✅ {len(rows)} NDJSON rows with projected fields only")
+            else:
+                print("❌ NDJSON rows contain unexpected fields")
+    except Exception as e:
+        print(f"❌ Error exporting NDJSON: {e}")
+
+    # 4. Unknown columns are rejected
+    print("\n4. Requesting an unknown column...")
+    try:
+        response = requests.get(f"{base_url}/students/export", params={"fields": "password"}, headers=headers)
+        if response.status_code == 400:
+            print("✅ Unknown column rejected")
+        else:
+            print(f"❌ Expected 400, got {response.status_code}")
+    except Exception as e:
+        print(f"❌ Error requesting unknown column: {e}")
+
+    print("\n🎉 Export test completed!")
+
+if __name__ == "__main__":
+    test_exports()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for on-demand request profiling (X-Profile and /api/admin/profiler)
+Run this after starting the Flask server
+"""
+
+import requests
+
+def test_request_profiler():
+    """Profile single requests via X-Profile and read the summary back"""
+
+    server_url = "http://127.0.0.1:5000"
+    base_url = f"{server_url}/api"
+
+    print("🧪 Testing request profiler...")
+
+    # 1. Login as admin
+    print("\n1. Logging in as admin...")
+    login_data = {"username": "admin", "password": "admin123"}
+
+    try:
+        response = requests.post(f"{base_url}/admin/login", json=login_data)
+        if response.status_code == 200:
+            token = response.json()['token']
+            print("✅ Login successful")
+        else:
+            print(f"❌ Login failed: {response.status_code}")
+            return
+    except Exception as e:
+        print(f"❌ Login error: {e}")
+        return
+
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def health_profiles():
+        response = requests.get(f"{base_url}/admin/profiler", headers=headers)
+        return response.json()['endpoints'].get('system.health_check', 0)
+
+    # 2. Start from an empty profile directory
+    print("\n2. Clearing kept profiles...")
+    try:
+        response = requests.delete(f"{base_url}/admin/profiler", headers=headers)
+        if response.status_code == 200 and health_profiles() == 0:
+            print(f"✅ {response.json()['message']}")
+        else:
+            print(f"❌ Clear failed: {response.status_code}")
+    except Exception as e:
+        print(f"❌ Error clearing profiles: {e}")
+
+    # 3. X-Profile without a token is ignored
+    print("\n3. Sending X-Profile without a token...")
+    try:
+        response = requests.get(f"{server_url}/health", headers={"X-Profile": "1"})
+        if response.status_code == 200 and health_profiles() == 0:
+            print("✅ Request served and not profiled")
+        else:
+            print(f"❌ Unexpected result: status {response.status_code}, {health_profiles()} profiles")
+    except Exception as e:
+        print(f"❌ Error sending X-Profile without a token: {e}")
+
+    # 4. X-Profile with an admin token writes one profile
+    print("\n4. Sending X-Profile with an admin token...")
+    try:
+        response = requests.get(f"{server_url}/health", headers={**headers, "X-Profile": "1"})
+        count = health_profiles()
+        if response.status_code == 200 and count == 1:
+            print("✅ One profile kept for system.health_check")
+        else:
+            print(f"❌ Expected 1 profile, found {count}")
+    except Exception as e:
+        print(f"❌ Error sending X-Profile with a token: {e}")
+
+    # 5. Summary of the hottest functions
+    print("\n5. Reading the summary...")
+    try:
+        response = requests.get(f"{base_url}/admin/profiler",
+                                params={"endpoint": "system.health_check", "limit": 5, "sort": "cumtime"},
+                                headers=headers)
+        summary = response.json()['summary']
+        if response.status_code == 200 and summary['profiles'] == 1 and summary['functions']:
+            print(f"✅ Hottest function: {summary['functions'][0]['function']}")
+        else:
+            print(f"❌ Unexpected summary: {summary}")
+    except Exception as e:
+        print(f"❌ Error reading the summary: {e}")
+
+    # 6. Bad sort orders and endpoint names are rejected
+    print("\n6. Requesting an invalid sort and endpoint...")
+    for params in ({"sort": "bogus"}, {"endpoint": ".."}):
+        try:
+            response = requests.get(f"{base_url}/admin/profiler", params=params, headers=headers)
+            if response.status_code == 400:
+                print(f"✅ {params} rejected")
+            else:
+                print(f"❌ Expected 400 for {params}, got {response.status_code}")
+        except Exception as e:
+            print(f"❌ Error requesting {params}: {e}")
+
+    # 7. Clearing one endpoint removes its profiles
+    print("\n7. Clearing system.health_check profiles...")
+    try:
+        response = requests.delete(f"{base_url}/admin/profiler",
+                                   params={"endpoint": "system.health_check"}, headers=headers)
+        if response.status_code == 200 and health_profiles() == 0:
+            print(f"✅ {response.json()['message']}")
+        else:
+            print(f"❌ Clear failed: {response.status_code}")
+    except Exception as e:
+        print(f"❌ Error clearing profiles: {e}")
+
+    print("\n🎉 Request profiler test completed!")
+
+if __name__ == "__main__":
+    test_request_profiler()
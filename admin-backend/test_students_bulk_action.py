@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for POST /api/students/bulk-action
+Run this after starting the Flask server
+"""
+
+import requests
+import time
+
+def test_students_bulk_action():
+    """Create a few students, change them in bulk, then delete them in bulk"""
+
+    base_url = "http://127.0.0.1:5000/api"
+    run = int(time.time())
+
+    print("🧪 Testing student bulk actions...")
+
+    # 1. Login as admin
+    print("\n1. Logging in as admin...")
+    login_data = {"username": "admin", "password": "admin123"}
+
+    try:
+        response = requests.post(f"{base_url}/admin/login", json=login_data)
+        if response.status_code == 200:
+            token = response.json()['token']
+            print("✅ Login successful")
+        else:
+            print(f"❌ Login failed: {response.status_code}")
+            return
+    except Exception as e:
+        print(f"❌ Login error: {e}")
+        return
+
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # 2. Create students to work on
+    print("\n2. Creating students...")
+    student_ids = []
+    course = f"Bulk Course {run}"
+    for i in range(3):
+        student = {
+            "full_name": f"Bulk Action {i}",
+            "email": f"bulk.action{i}.{run}@example.com",
+            "student_id": f"BA{run}{i}",
+            "course": course,
+            "phone": "555"
+        }
+        response = requests.post(f"{base_url}/students", json=student, headers=headers)
+        if response.status_code == 201:
+            student_ids.append(response.json()['student_id'])
+    print(f"✅ Created {len(student_ids)} students")
+
+    # 3. Change status by id list
+    print("\n3. Setting status by id...")
+    try:
+        response = requests.post(f"{base_url}/students/bulk-action", json={
+            "action": "set_status",
+            "status": "completed",
+            "student_ids": student_ids
+        }, headers=headers)
+        data = response.json()
+        if response.status_code == 200 and data['modified_count'] == len(student_ids):
+            print(f"✅ Updated {data['modified_count']} students")
+        else:
+            print(f"❌ Unexpected response: {response.status_code} - {data}")
+    except Exception as e:
+        print(f"❌ Error setting status: {e}")
+
+    # 4. Delete by filter
+    print("\n4. Deleting by filter...")
+    try:
+        response = requests.post(f"{base_url}/students/bulk-action", json={
+            "action": "delete",
+            "filter": {"course": course}
+        }, headers=headers)
+        data = response.json()
+        if response.status_code == 202:
+            print(f"   Running as background job {data['job_id']}")
+            while True:
+                job = requests.get(f"http://127.0.0.1:5000{data['status_url']}", headers=headers).json()['job']
+                if job['status'] in ('completed', 'failed'):
+                    break
+                time.sleep(0.5)
+            print(f"✅ Job {job['status']}: deleted {job['deleted']} of {job['total']}")
+        elif response.status_code == 200 and data['modified_count'] == len(student_ids):
+            print(f"✅ Deleted {data['modified_count']} students")
+        else:
+            print(f"❌ Unexpected response: {response.status_code} - {data}")
+    except Exception as e:
+        print(f"❌ Error deleting by filter: {e}")
+
+    # 5. Empty filters are refused
+    print("\n5. Sending an empty filter...")
+    try:
+        response = requests.post(f"{base_url}/students/bulk-action",
+                                 json={"action": "delete", "filter": {}}, headers=headers)
+        if response.status_code == 400:
+            print("✅ Empty filter rejected")
+        else:
+            print(f"❌ Expected 400, got {response.status_code}")
+    except Exception as e:
+        print(f"❌ Error sending empty filter: {e}")
+
+    print("\n🎉 Student bulk action test completed!")
+
+if __name__ == "__main__":
+    test_students_bulk_action()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for POST /api/students/import
+Run this after starting the Flask server
+"""
+
+import requests
+import time
+
+def test_students_import():
+    """Import CSV and NDJSON uploads and check the per-row report"""
+
+    base_url = "http://127.0.0.1:5000/api"
+    run = int(time.time())
+
+    print("🧪 Testing student bulk import...")
+
+    # 1. Login as admin
+    print("\n1. Logging in as admin...")
+    login_data = {"username": "admin", "password": "admin123"}
+
+    try:
+        response = requests.post(f"{base_url}/admin/login", json=login_data)
+        if response.status_code == 200:
+            token = response.json()['token']
+            print("✅ Login successful")
+        else:
+            print(f"❌ Login failed: {response.status_code}")
+            return
+    except Exception as e:
+        print(f"❌ Login error: {e}")
+        return
+
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # 2. CSV upload with one missing field and one duplicate
+    print("\n2. Importing CSV...")
+    csv_body = "full_name,email,student_id,course,phone\n"
+    csv_body += f"Import One,import1.{run}@example.com,IMP{run}1,Computer Science,111\n"
+    csv_body += f"Import Two,import2.{run}@example.com,IMP{run}2,Computer Science,\n"
+    csv_body += f"Import Three,import1.{run}@example.com,IMP{run}3,Computer Science,333\n"
+
+    try:
+        response = requests.post(f"{base_url}/students/import",
+                                 files={"file": ("students.csv", csv_body, "text/csv")},
+                                 headers=headers)
+        if response.status_code == 200:
+            report = response.json()['report']
+            print(f"   Received: {report['received']}, inserted: {report['inserted']}, failed: {report['failed']}")
+            for error in report['errors']:
+                print(f"   Row {error['row']}: {error['message']}")
+            if report['inserted'] == 1 and report['failed'] == 2:
+                print("✅ CSV import reported missing and duplicate rows")
+            else:
+                print("❌ Unexpected CSV import report")
+        else:
+            print(f"❌ CSV import failed: {response.status_code} - {response.text}")
+    except Exception as e:
+        print(f"❌ Error importing CSV: {e}")
+
+    # 3. Raw NDJSON body
+    print("\n3. Importing NDJSON...")
+    ndjson_body = (
+        f'{{"full_name": "Import Four", "email": "import4.{run}@example.com", '
+        f'"student_id": "IMP{run}4", "course": "Engineering", "phone": "444"}}\n'
+        'this is not json\n'
+    )
+
+    try:
+        response = requests.post(f"{base_url}/students/import",
+                                 params={"format": "ndjson"},
+                                 data=ndjson_body.encode('utf-8'),
+                                 headers={**headers, "Content-Type": "application/x-ndjson"})
+        if response.status_code == 200:
+            report = response.json()['report']
+            if report['inserted'] == 1 and report['failed'] == 1:
+                print("✅ NDJSON import reported the invalid line")
+            else:
+                print(f"❌ Unexpected NDJSON import report: {report}")
+        else:
+            print(f"❌ NDJSON import failed: {response.status_code} - {response.text}")
+    except Exception as e:
+        print(f"❌ Error importing NDJSON: {e}")
+
+    # 4. Throughput on a larger upload
+    print("\n4. Importing 10,000 generated rows...")
+    rows = ["full_name,email,student_id,course,phone"]
+    rows += [f"Bulk Student {i},bulk{i}.{run}@example.com,BULK{run}{i},Engineering,555"
+             for i in range(10000)]
+
+    try:
+        started = time.time()
+        response = requests.post(f"{base_url}/students/import",
+                                 params={"format": "csv"},
+                                 data="\n".join(rows).encode('utf-8'),
+                                 headers={**headers, "Content-Type": "text/csv"})
+        elapsed = time.time() - started
+        if response.status_code == 200:
+            report = response.json()['report']
+            print(f"✅ Inserted {report['inserted']} rows in {elapsed:.2f}s")
+        else:
+            print(f"❌ Large import failed: {response.status_code} - {response.text}")
+    except Exception as e:
+        print(f"❌ Error in large import: {e}")
+
+    print("\n🎉 Student import test completed!")
+
+if __name__ == "__main__":
+    test_students_import()
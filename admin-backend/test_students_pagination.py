@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for cursor pagination on GET /api/students
+Run this after starting the Flask server
+"""
+
+import requests
+from pymongo import MongoClient
+
+from config import Config
+
+def test_students_pagination():
+    """Walk the student list with cursors and compare against offset mode"""
+
+    base_url = "http://127.0.0.1:5000/api"
+
+    print("🧪 Testing student pagination...")
+
+    # 1. Login as admin
+    print("\n1. Logging in as admin...")
+    login_data = {"username": "admin", "password": "admin123"}
+
+    try:
+        response = requests.post(f"{base_url}/admin/login", json=login_data)
+        if response.status_code == 200:
+            token = response.json()['token']
+            print("✅ Login successful")
+        else:
+            print(f"❌ Login failed: {response.status_code}")
+            return
+    except Exception as e:
+        print(f"❌ Login error: {e}")
+        return
+
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # 2. Walk every page with cursors
+    print("\n2. Walking students with cursors...")
+    cursor_ids = []
+    try:
+        cursor = ''
+        pages = 0
+        while True:
+            response = requests.get(f"{base_url}/students",
+                                    params={"cursor": cursor, "limit": 5},
+                                    headers=headers)
+            if response.status_code != 200:
+                print(f"❌ Cursor page failed: {response.status_code} - {response.text}")
+                return
+            data = response.json()
+            cursor_ids.extend(s['_id'] for s in data['students'])
+            pages += 1
+            if not data['has_more']:
+                break
+            cursor = data['next_cursor']
+
+        if len(cursor_ids) == len(set(cursor_ids)):
+            print(f"✅ Walked {len(cursor_ids)} students over {pages} pages without duplicates")
+        else:
+            print("❌ Cursor pages returned duplicate students")
+    except Exception as e:
+        print(f"❌ Error walking cursors: {e}")
+        return
+
+    # 3. Offset mode should return the same order
+    print("\n3. Comparing with offset mode...")
+    try:
+        response = requests.get(f"{base_url}/students",
+                                params={"page": 1, "limit": len(cursor_ids) or 1},
+                                headers=headers)
+        data = response.json()
+        offset_ids = [s['_id'] for s in data['students']]
+        if offset_ids == cursor_ids and data['total'] == len(cursor_ids):
+            print("✅ Offset and cursor modes agree")
+        else:
+            print("❌ Offset and cursor modes returned different students")
+    except Exception as e:
+        print(f"❌ Error in offset mode: {e}")
+
+    # 4. A tampered cursor is rejected
+    print("\n4. Sending an invalid cursor...")
+    try:
+        response = requests.get(f"{base_url}/students", params={"cursor": "not-a-cursor"}, headers=headers)
+        if response.status_code == 400:
+            print("✅ Invalid cursor rejected")
+        else:
+            print(f"❌ Expected 400, got {response.status_code}")
+    except Exception as e:
+        print(f"❌ Error sending invalid cursor: {e}")
+
+    # 5. A legacy student without created_at does not break cursor pages
+    print("\n5. Walking cursors with a legacy student (no created_at)...")
+    client = MongoClient(Config.MONGODB_URI)
+    students = client[Config.DATABASE_NAME].students
+    legacy_id = students.insert_one({"full_name": "Legacy Student", "status": "active"}).inserted_id
+    try:
+        cursor = ''
+        seen = []
+        while True:
+            response = requests.get(f"{base_url}/students",
+                                    params={"cursor": cursor, "limit": 5},
+                                    headers=headers)
+            if response.status_code != 200:
+                print(f"❌ Cursor page failed: {response.status_code} - {response.text}")
+                break
+            data = response.json()
+            seen.extend(s['_id'] for s in data['students'])
+            if not data['has_more']:
+                if str(legacy_id) not in seen and len(seen) == len(cursor_ids):
+                    print("✅ Cursor pages skip the undated student")
+                else:
+                    print("❌ Undated student changed the cursor walk")
+                break
+            cursor = data['next_cursor']
+    except Exception as e:
+        print(f"❌ Error walking cursors: {e}")
+    finally:
+        students.delete_one({"_id": legacy_id})
+        client.close()
+
+    print("\n🎉 Student pagination test completed!")
+
+if __name__ == "__main__":
+    test_students_pagination()